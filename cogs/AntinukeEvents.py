@@ -165,9 +165,8 @@ class AntinukeEvents(commands.Cog):
             await asyncio.sleep(0.15)
             action_type = discord.AuditLogAction.member_role_update
             
-            async for entry in after.guild.audit_logs(limit=3, action=action_type):
-                if entry.target.id != after.id:
-                    continue
+            entry = await self.client.audit_context.find(after.guild, action_type, after.id, max_age=30, event="member_update")
+            if entry:
                 executor = entry.user
                 if executor.id == self.client.user.id:
                     return
@@ -189,7 +188,6 @@ class AntinukeEvents(commands.Cog):
                     except:
                         pass
                     await self.take_action_against_high_role(after.guild, executor, f"role assignment", after)
-                break
         except:
             pass
     
@@ -197,18 +195,17 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_member_ban(self, guild: discord.Guild, user: Union[discord.User, discord.Member]):
         try:
-            async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.ban):
-                if entry.target.id == user.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(guild, executor, "anti_ban"):
-                        try:
-                            await guild.unban(user, reason="Antinuke: Reversing")
-                        except:
-                            pass
-                        await self.take_action_against_high_role(guild, executor, "ban", user)
-                    break
+            entry = await self.client.audit_context.find(guild, discord.AuditLogAction.ban, user.id, max_age=30, event="member_ban")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(guild, executor, "anti_ban"):
+                    try:
+                        await guild.unban(user, reason="Antinuke: Reversing")
+                    except:
+                        pass
+                    await self.take_action_against_high_role(guild, executor, "ban", user)
         except:
             pass
     
@@ -216,14 +213,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member):
         try:
-            async for entry in member.guild.audit_logs(limit=1, action=discord.AuditLogAction.kick):
-                if entry.target.id == member.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(member.guild, executor, "anti_kick"):
-                        await self.take_action_against_high_role(member.guild, executor, "kick", member)
-                    break
+            entry = await self.client.audit_context.find(member.guild, discord.AuditLogAction.kick, member.id, max_age=30, event="member_remove")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(member.guild, executor, "anti_kick"):
+                    await self.take_action_against_high_role(member.guild, executor, "kick", member)
         except:
             pass
     
@@ -233,18 +229,17 @@ class AntinukeEvents(commands.Cog):
         if not member.bot:
             return
         try:
-            async for entry in member.guild.audit_logs(limit=1, action=discord.AuditLogAction.bot_add):
-                if entry.target.id == member.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(member.guild, executor, "anti_bot"):
-                        try:
-                            await member.kick(reason="Antinuke: Unauthorized bot")
-                        except:
-                            pass
-                        await self.take_action_against_high_role(member.guild, executor, "bot addition", member)
-                    break
+            entry = await self.client.audit_context.find(member.guild, discord.AuditLogAction.bot_add, member.id, event="member_join")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(member.guild, executor, "anti_bot"):
+                    try:
+                        await member.kick(reason="Antinuke: Unauthorized bot")
+                    except:
+                        pass
+                    await self.take_action_against_high_role(member.guild, executor, "bot addition", member)
         except:
             pass
     
@@ -252,18 +247,17 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_create):
-                if entry.target.id == channel.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(channel.guild, executor, "anti_channel_create"):
-                        try:
-                            await channel.delete(reason="Antinuke: Unauthorized")
-                        except:
-                            pass
-                        await self.take_action_against_high_role(channel.guild, executor, "channel creation", channel)
-                    break
+            entry = await self.client.audit_context.find(channel.guild, discord.AuditLogAction.channel_create, channel.id, event="guild_channel_create")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(channel.guild, executor, "anti_channel_create"):
+                    try:
+                        await channel.delete(reason="Antinuke: Unauthorized")
+                    except:
+                        pass
+                    await self.take_action_against_high_role(channel.guild, executor, "channel creation", channel)
         except:
             pass
     
@@ -271,14 +265,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_delete):
-                if entry.target.id == channel.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(channel.guild, executor, "anti_channel_delete"):
-                        await self.take_action_against_high_role(channel.guild, executor, "channel deletion", channel)
-                    break
+            entry = await self.client.audit_context.find(channel.guild, discord.AuditLogAction.channel_delete, channel.id, event="guild_channel_delete")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(channel.guild, executor, "anti_channel_delete"):
+                    await self.take_action_against_high_role(channel.guild, executor, "channel deletion", channel)
         except:
             pass
     
@@ -286,14 +279,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
         try:
-            async for entry in after.guild.audit_logs(limit=1, action=discord.AuditLogAction.channel_update):
-                if entry.target.id == after.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(after.guild, executor, "anti_channel_update"):
-                        await self.take_action_against_high_role(after.guild, executor, "channel update", after)
-                    break
+            entry = await self.client.audit_context.find(after.guild, discord.AuditLogAction.channel_update, after.id, max_age=30, event="guild_channel_update")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(after.guild, executor, "anti_channel_update"):
+                    await self.take_action_against_high_role(after.guild, executor, "channel update", after)
         except:
             pass
     
@@ -301,18 +293,17 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_role_create(self, role: discord.Role):
         try:
-            async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_create):
-                if entry.target.id == role.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(role.guild, executor, "anti_role_create"):
-                        try:
-                            await role.delete(reason="Antinuke: Unauthorized")
-                        except:
-                            pass
-                        await self.take_action_against_high_role(role.guild, executor, "role creation", role)
-                    break
+            entry = await self.client.audit_context.find(role.guild, discord.AuditLogAction.role_create, role.id, event="guild_role_create")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(role.guild, executor, "anti_role_create"):
+                    try:
+                        await role.delete(reason="Antinuke: Unauthorized")
+                    except:
+                        pass
+                    await self.take_action_against_high_role(role.guild, executor, "role creation", role)
         except:
             pass
     
@@ -320,14 +311,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_role_delete(self, role: discord.Role):
         try:
-            async for entry in role.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_delete):
-                if entry.target.id == role.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(role.guild, executor, "anti_role_delete"):
-                        await self.take_action_against_high_role(role.guild, executor, "role deletion", role)
-                    break
+            entry = await self.client.audit_context.find(role.guild, discord.AuditLogAction.role_delete, role.id, event="guild_role_delete")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(role.guild, executor, "anti_role_delete"):
+                    await self.take_action_against_high_role(role.guild, executor, "role deletion", role)
         except:
             pass
     
@@ -335,21 +325,20 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
         try:
-            async for entry in after.guild.audit_logs(limit=1, action=discord.AuditLogAction.role_update):
-                if entry.target.id == after.id:
-                    executor = entry.user
-                    if executor.id == self.client.user.id:
-                        return
-                    if await self.is_protected(after.guild, executor, "anti_role_update"):
-                        try:
-                            if before.name != after.name:
-                                await after.edit(name=before.name, reason="Antinuke: Reverting")
-                            if before.permissions != after.permissions:
-                                await after.edit(permissions=before.permissions, reason="Antinuke: Reverting")
-                        except:
-                            pass
-                        await self.take_action_against_high_role(after.guild, executor, "role update", after)
-                    break
+            entry = await self.client.audit_context.find(after.guild, discord.AuditLogAction.role_update, after.id, max_age=30, event="guild_role_update")
+            if entry:
+                executor = entry.user
+                if executor.id == self.client.user.id:
+                    return
+                if await self.is_protected(after.guild, executor, "anti_role_update"):
+                    try:
+                        if before.name != after.name:
+                            await after.edit(name=before.name, reason="Antinuke: Reverting")
+                        if before.permissions != after.permissions:
+                            await after.edit(permissions=before.permissions, reason="Antinuke: Reverting")
+                    except:
+                        pass
+                    await self.take_action_against_high_role(after.guild, executor, "role update", after)
         except:
             pass
     
@@ -357,7 +346,8 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_webhooks_update(self, channel: discord.TextChannel):
         try:
-            async for entry in channel.guild.audit_logs(limit=1, action=discord.AuditLogAction.webhook_create):
+            entry = await self.client.audit_context.find(channel.guild, discord.AuditLogAction.webhook_create, event="webhooks_update")
+            if entry:
                 executor = entry.user
                 if executor.id == self.client.user.id:
                     return
@@ -368,7 +358,6 @@ class AntinukeEvents(commands.Cog):
                     except:
                         pass
                     await self.take_action_against_high_role(channel.guild, executor, "webhook creation", None)
-                break
         except:
             pass
     
@@ -378,13 +367,13 @@ class AntinukeEvents(commands.Cog):
         if len(before) <= len(after):
             return
         try:
-            async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.emoji_delete):
+            entry = await self.client.audit_context.find(guild, discord.AuditLogAction.emoji_delete, event="guild_emojis_update")
+            if entry:
                 executor = entry.user
                 if executor.id == self.client.user.id:
                     return
                 if await self.is_protected(guild, executor, "anti_emoji_delete"):
                     await self.take_action_against_high_role(guild, executor, "emoji deletion", None)
-                break
         except:
             pass
     
@@ -392,13 +381,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_guild_update(self, before: discord.Guild, after: discord.Guild):
         try:
-            async for entry in after.audit_logs(limit=1, action=discord.AuditLogAction.guild_update):
+            entry = await self.client.audit_context.find(after, discord.AuditLogAction.guild_update, event="guild_update")
+            if entry:
                 executor = entry.user
                 if executor.id == self.client.user.id:
                     return
                 if await self.is_protected(after, executor, "anti_guild_update"):
                     await self.take_action_against_high_role(after, executor, "server update", None)
-                break
         except:
             pass
     
@@ -406,13 +395,13 @@ class AntinukeEvents(commands.Cog):
     @commands.Cog.listener()
     async def on_member_prune(self, guild: discord.Guild, pruned: int):
         try:
-            async for entry in guild.audit_logs(limit=1, action=discord.AuditLogAction.member_prune):
+            entry = await self.client.audit_context.find(guild, discord.AuditLogAction.member_prune, event="member_prune")
+            if entry:
                 executor = entry.user
                 if executor.id == self.client.user.id:
                     return
                 if await self.is_protected(guild, executor, "anti_prune"):
                     await self.take_action_against_high_role(guild, executor, "member prune", None)
-                break
         except:
             pass
 
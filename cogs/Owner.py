@@ -216,6 +216,101 @@ class owner(commands.Cog):
                 continue
         await ctx.send("Couldn't create an invite for this server.")
 
+    @commands.command(name="msgstats", aliases=["pipeline"])
+    @commands.is_owner()
+    async def msgstats(self, ctx, action: str = None):
+        """Show per-stage timing of the message pipeline"""
+        pipeline = self.client.pipeline
+        if action == "reset":
+            pipeline.reset_stats()
+            return await ctx.reply("Message pipeline stats reset.", mention_author=False)
+
+        lines = []
+        for stage in pipeline.stages:
+            avg = stage.total_time / stage.calls * 1000 if stage.calls else 0.0
+            lines.append(
+                f"`{stage.name}` • runs: {stage.calls} | skipped: {stage.skipped} | errors: {stage.errors}\n"
+                f"avg: {avg:.3f}ms | max: {stage.max_time * 1000:.1f}ms | total: {stage.total_time:.2f}s"
+            )
+
+        embed = discord.Embed(
+            title="Message Pipeline",
+            description=f"**Messages dispatched:** {pipeline.messages}\n\n" + "\n\n".join(lines),
+            color=self.color
+        )
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(name="logqueue", aliases=["logstats"])
+    @commands.is_owner()
+    async def logqueue(self, ctx):
+        """Show delivery stats of the log dispatcher"""
+        logging_cog = self.client.get_cog("Logging")
+        if not logging_cog:
+            return await ctx.reply("Logging cog is not loaded.", mention_author=False)
+
+        dispatcher = logging_cog.dispatcher
+        busiest = sorted(dispatcher.queues.items(), key=lambda item: len(item[1]), reverse=True)[:5]
+        lines = [f"<#{channel_id}> • {len(queue)} queued" for channel_id, queue in busiest if queue]
+
+        embed = discord.Embed(
+            title="Log Dispatcher",
+            description=(
+                f"**Queued:** {dispatcher.depth} across {len(dispatcher.queues)} channels\n"
+                f"**Sent:** {dispatcher.sent} entries in {dispatcher.batches} messages\n"
+                f"**Dropped:** {dispatcher.dropped}\n"
+                f"**Webhooks cached:** {len(dispatcher.webhooks)} ({len(dispatcher.no_webhook)} channels using channel.send)"
+            ),
+            color=self.color
+        )
+        if lines:
+            embed.add_field(name="Busiest channels", value="\n".join(lines), inline=False)
+        await ctx.reply(embed=embed, mention_author=False)
+
+    @commands.command(name="maintenance", aliases=["dbmaint"])
+    @commands.is_owner()
+    async def maintenance(self, ctx, action: str = None, option: str = None):
+        """Show the last database maintenance report, or `maintenance run [--convert]` to run it now (`--convert` rewrites files not yet on incremental vacuum)"""
+        maintenance_cog = self.client.get_cog("Maintenance")
+        if not maintenance_cog:
+            return await ctx.reply("Maintenance cog is not loaded.", mention_author=False)
+
+        if action == "run":
+            if option not in (None, "--convert"):
+                return await ctx.reply("Usage: `maintenance run [--convert]`", mention_author=False)
+            if maintenance_cog.lock.locked():
+                return await ctx.reply("Maintenance is already running.", mention_author=False)
+            async with ctx.typing():
+                await maintenance_cog.run_maintenance(convert=option == "--convert")
+
+        if not maintenance_cog.last_run:
+            return await ctx.reply("Maintenance has not run yet. Use `maintenance run` to start it.", mention_author=False)
+
+        lines = []
+        for entry in maintenance_cog.last_report:
+            line = f"`{entry['path']}` • {entry['reclaimed'] / 1024:.1f} KB reclaimed in {entry['seconds']:.2f}s"
+            if entry['deleted']:
+                line += f" • {entry['deleted']} events deleted"
+            if entry['needs_convert']:
+                line += " • needs `maintenance run --convert`"
+            if entry['error']:
+                line += f" • error: {entry['error']}"
+            lines.append(line)
+
+        embed = discord.Embed(
+            title="Database Maintenance",
+            description=(
+                f"**Last run:** {discord.utils.format_dt(maintenance_cog.last_run, 'R')}\n"
+                f"**Reclaimed:** {sum(entry['reclaimed'] for entry in maintenance_cog.last_report) / 1024:.1f} KB\n"
+                f"**Run time:** {maintenance_cog.last_duration:.2f}s"
+            ),
+            color=self.color
+        )
+        if lines:
+            embed.add_field(name="Databases", value="\n".join(lines), inline=False)
+        if maintenance_cog.last_error:
+            embed.add_field(name="Last error", value=maintenance_cog.last_error[:1000], inline=False)
+        await ctx.reply(embed=embed, mention_author=False)
+
 class Owner(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
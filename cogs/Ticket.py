@@ -1,12 +1,238 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord.ui import View, Select, Button
 import asyncio
 import aiosqlite
+import bisect
 import datetime
+import gzip
+import heapq
+import html
+import json
+import tempfile
+import time
+import zlib
+
+
+def to_timestamp(value):
+    """Stored UTC ISO time -> epoch seconds"""
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def from_timestamp(value):
+    """Epoch seconds -> UTC ISO time in the format the tables already use"""
+    return datetime.datetime.fromtimestamp(value, datetime.timezone.utc).replace(tzinfo=None).isoformat()
+
+
+DEFAULT_ARCHIVE_DAYS = 7
+
+# Upper bounds (seconds) of the time-to-close histogram buckets; one overflow bucket follows
+RESOLUTION_BUCKETS = (300, 900, 1800, 3600, 7200, 14400, 28800, 43200, 86400, 172800, 259200, 604800, 1209600)
+RESOLUTION_SQL = "(julianday(closed_at) - julianday(created_at)) * 86400"
+RESOLUTION_BUCKET_SQL = "CASE {} ELSE {} END".format(
+    " ".join(f"WHEN {RESOLUTION_SQL} < {bound} THEN {index}" for index, bound in enumerate(RESOLUTION_BUCKETS)),
+    len(RESOLUTION_BUCKETS)
+)
+
+# Queries on the tables that grow with history. Each one is also listed in
+# TicketDatabase.audited_queries, where the tests check its plan.
+OPEN_TICKET_BY_CHANNEL_SQL = "SELECT ticket_id, owner_id, owner_name, guild_id, created_at FROM tickets WHERE channel_id = ? AND status = 'open'"
+OPEN_TICKETS_SQL = "SELECT ticket_id, guild_id, channel_id, owner_id, owner_name, control_message_id, last_activity FROM tickets WHERE status = 'open'"
+TRANSCRIPT_SQL = "SELECT author_name, content, timestamp FROM ticket_messages WHERE ticket_id = ? ORDER BY timestamp ASC"
+MESSAGE_COUNT_SQL = "SELECT COUNT(*) FROM ticket_messages WHERE ticket_id = ?"
+ARCHIVE_BY_TICKET_SQL = "SELECT data FROM ticket_archives WHERE ticket_id = ?"
+DAILY_STATS_SQL = "SELECT day, created, closed FROM ticket_daily_stats WHERE guild_id = ? AND day >= ?"
+# The first bound uses the shortest archive age of any guild, so the partial
+# index on unarchived closed tickets can be searched; the second is per guild.
+ARCHIVE_CANDIDATES_SQL = """
+    SELECT tickets.ticket_id, tickets.guild_id, tickets.closed_at FROM tickets
+    LEFT JOIN guild_configs ON guild_configs.guild_id = tickets.guild_id
+    WHERE tickets.status = 'closed' AND tickets.archived_at IS NULL
+    AND tickets.closed_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', '-' || ? || ' days')
+    AND tickets.closed_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', '-' || COALESCE(guild_configs.archive_after_days, ?) || ' days')
+    LIMIT ?
+"""
+
+
+def iter_archived_rows(blob, batch_size=500, chunk_size=64 * 1024):
+    """Decode an archived transcript in batches without inflating the whole blob"""
+    decompressor = zlib.decompressobj()
+    
+    def lines():
+        pending = b""
+        for start in range(0, len(blob), chunk_size):
+            *complete, pending = (pending + decompressor.decompress(blob[start:start + chunk_size])).split(b"\n")
+            yield from complete
+        # Always flush, whatever the blob length; it returns anything zlib still buffers
+        yield from (pending + decompressor.flush()).split(b"\n")
+    
+    batch = []
+    for line in lines():
+        if not line:
+            continue
+        batch.append(tuple(json.loads(line)))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def median_resolution(histogram):
+    """Estimate the median time-to-close from histogram bucket counts.
+
+    Interpolates inside the bucket holding the middle ticket; returns the
+    bucket's lower bound when the median falls in the overflow bucket.
+    """
+    total = sum(histogram.values())
+    if not total:
+        return None
+    middle = total / 2
+    seen = 0
+    for bucket in range(len(RESOLUTION_BUCKETS) + 1):
+        count = histogram.get(bucket, 0)
+        if count and seen + count >= middle:
+            low = RESOLUTION_BUCKETS[bucket - 1] if bucket else 0
+            if bucket == len(RESOLUTION_BUCKETS):
+                return low
+            return low + (RESOLUTION_BUCKETS[bucket] - low) * (middle - seen) / count
+        seen += count
+    return None
+
+
+def format_duration(seconds):
+    minutes = int(seconds // 60)
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h"
 
 
 class TicketDatabase:
+    # Schema migrations, applied in order. PRAGMA user_version stores how
+    # many have run, so append new steps and never edit old ones.
+    migrations = [
+        [
+            "CREATE INDEX IF NOT EXISTS idx_tickets_channel_status ON tickets (channel_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_owner_status ON tickets (guild_id, owner_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_tickets_guild_status ON tickets (guild_id, status)",
+            "CREATE INDEX IF NOT EXISTS idx_ticket_messages_ticket_time ON ticket_messages (ticket_id, timestamp)",
+        ],
+        [
+            "ALTER TABLE tickets ADD COLUMN control_message_id INTEGER",
+        ],
+        [
+            # Keep only the newest open ticket per user before enforcing uniqueness
+            """
+            UPDATE tickets SET status = 'closed', closed_at = COALESCE(closed_at, created_at)
+            WHERE status = 'open' AND ticket_id NOT IN (
+                SELECT MAX(ticket_id) FROM tickets WHERE status = 'open' GROUP BY guild_id, owner_id
+            )
+            """,
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_tickets_one_open ON tickets (guild_id, owner_id) WHERE status = 'open'",
+        ],
+        [
+            "ALTER TABLE tickets ADD COLUMN last_activity TEXT",
+            "ALTER TABLE guild_configs ADD COLUMN auto_close_hours INTEGER",
+            """
+            UPDATE tickets SET last_activity = COALESCE(
+                (SELECT MAX(timestamp) FROM ticket_messages WHERE ticket_messages.ticket_id = tickets.ticket_id),
+                created_at
+            )
+            WHERE status = 'open'
+            """,
+        ],
+        [
+            """
+            CREATE TABLE IF NOT EXISTS ticket_archives (
+                ticket_id INTEGER PRIMARY KEY,
+                guild_id INTEGER,
+                message_count INTEGER,
+                closed_at TEXT,
+                archived_at TEXT,
+                data BLOB
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_ticket_archives_guild_closed ON ticket_archives (guild_id, closed_at)",
+            "ALTER TABLE guild_configs ADD COLUMN archive_after_days INTEGER",
+            "ALTER TABLE guild_configs ADD COLUMN retention_days INTEGER",
+        ],
+        [
+            """
+            CREATE TABLE IF NOT EXISTS ticket_stats (
+                guild_id INTEGER PRIMARY KEY,
+                open_count INTEGER DEFAULT 0,
+                closed_count INTEGER DEFAULT 0,
+                resolution_total REAL DEFAULT 0
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS ticket_daily_stats (
+                guild_id INTEGER,
+                day TEXT,
+                created INTEGER DEFAULT 0,
+                closed INTEGER DEFAULT 0,
+                PRIMARY KEY (guild_id, day)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS ticket_resolution_histogram (
+                guild_id INTEGER,
+                bucket INTEGER,
+                count INTEGER DEFAULT 0,
+                PRIMARY KEY (guild_id, bucket)
+            )
+            """,
+            f"""
+            INSERT INTO ticket_stats (guild_id, open_count, closed_count, resolution_total)
+            SELECT guild_id, SUM(status = 'open'), SUM(status = 'closed'),
+                   COALESCE(SUM(CASE WHEN status = 'closed' THEN {RESOLUTION_SQL} END), 0)
+            FROM tickets GROUP BY guild_id
+            """,
+            """
+            INSERT INTO ticket_daily_stats (guild_id, day, created)
+            SELECT guild_id, substr(created_at, 1, 10), COUNT(*) FROM tickets GROUP BY 1, 2
+            """,
+            """
+            INSERT INTO ticket_daily_stats (guild_id, day, closed)
+            SELECT guild_id, substr(closed_at, 1, 10), COUNT(*) FROM tickets WHERE status = 'closed' GROUP BY 1, 2
+            ON CONFLICT (guild_id, day) DO UPDATE SET closed = excluded.closed
+            """,
+            f"""
+            INSERT INTO ticket_resolution_histogram (guild_id, bucket, count)
+            SELECT guild_id, {RESOLUTION_BUCKET_SQL}, COUNT(*) FROM tickets WHERE status = 'closed' GROUP BY 1, 2
+            """,
+        ],
+        [
+            "ALTER TABLE tickets ADD COLUMN archived_at TEXT",
+            """
+            UPDATE tickets SET archived_at = (
+                SELECT a.archived_at FROM ticket_archives a WHERE a.ticket_id = tickets.ticket_id
+            )
+            WHERE ticket_id IN (SELECT ticket_id FROM ticket_archives)
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tickets_unarchived ON tickets (closed_at) WHERE status = 'closed' AND archived_at IS NULL",
+        ],
+    ]
+    
+    # Queries that must be served by an index, with sample parameters; see audit_query_plans
+    audited_queries = {
+        'open_ticket_by_channel': (OPEN_TICKET_BY_CHANNEL_SQL, (0,)),
+        'open_tickets': (OPEN_TICKETS_SQL, ()),
+        'transcript': (TRANSCRIPT_SQL, (0,)),
+        'message_count': (MESSAGE_COUNT_SQL, (0,)),
+        'archive_by_ticket': (ARCHIVE_BY_TICKET_SQL, (0,)),
+        'daily_stats': (DAILY_STATS_SQL, (0, "")),
+        'archive_candidates': (ARCHIVE_CANDIDATES_SQL, (DEFAULT_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS, 50)),
+    }
+    # Tables that grow with ticket history and must never be scanned
+    large_tables = ('tickets', 'ticket_messages', 'ticket_archives')
+    # Partial indexes that only hold rows the query returns, so walking them is fine
+    bounded_indexes = ('idx_tickets_one_open',)
+    
     def __init__(self, db_path="tickets.db"):
         self.db_path = db_path
     
@@ -60,11 +286,45 @@ class TicketDatabase:
             """)
             
             await db.commit()
+            await self.migrate(db)
+    
+    async def migrate(self, db):
+        async with db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        
+        for number, statements in enumerate(self.migrations[version:], start=version + 1):
+            # sqlite3 autocommits DDL outside a transaction; a step must apply fully or not at all
+            await db.execute("BEGIN")
+            try:
+                for statement in statements:
+                    await db.execute(statement)
+                await db.execute(f"PRAGMA user_version = {number}")
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+            print(f"✅ tickets.db migrated to schema version {number}")
+    
+    async def audit_query_plans(self):
+        """Return (query name, plan step) for every audited query that scans a large table or sorts"""
+        problems = []
+        async with aiosqlite.connect(self.db_path) as db:
+            for name, (query, params) in self.audited_queries.items():
+                async with db.execute(f"EXPLAIN QUERY PLAN {query}", params) as cursor:
+                    for row in await cursor.fetchall():
+                        detail = row[-1]
+                        words = detail.split()
+                        if words[0] == "SCAN" and words[1] in self.large_tables:
+                            if not detail.endswith(self.bounded_indexes):
+                                problems.append((name, detail))
+                        elif "TEMP B-TREE" in detail:
+                            problems.append((name, detail))
+        return problems
     
     async def get_guild_config(self, guild_id):
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT panel_channel, panel_message_id, ticket_category, support_role, transcript_channel FROM guild_configs WHERE guild_id = ?",
+                "SELECT panel_channel, panel_message_id, ticket_category, support_role, transcript_channel, auto_close_hours, archive_after_days, retention_days FROM guild_configs WHERE guild_id = ?",
                 (guild_id,)
             ) as cursor:
                 row = await cursor.fetchone()
@@ -74,14 +334,17 @@ class TicketDatabase:
                         'panel_message_id': row[1],
                         'ticket_category': row[2],
                         'support_role': row[3],
-                        'transcript_channel': row[4]
+                        'transcript_channel': row[4],
+                        'auto_close_hours': row[5],
+                        'archive_after_days': row[6],
+                        'retention_days': row[7]
                     }
                 return {}
     
     async def get_all_guild_configs(self):
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT guild_id, panel_channel, panel_message_id, ticket_category, support_role, transcript_channel FROM guild_configs"
+                "SELECT guild_id, panel_channel, panel_message_id, ticket_category, support_role, transcript_channel, auto_close_hours, archive_after_days, retention_days FROM guild_configs"
             ) as cursor:
                 rows = await cursor.fetchall()
                 return [
@@ -91,7 +354,10 @@ class TicketDatabase:
                         'panel_message_id': row[2],
                         'ticket_category': row[3],
                         'support_role': row[4],
-                        'transcript_channel': row[5]
+                        'transcript_channel': row[5],
+                        'auto_close_hours': row[6],
+                        'archive_after_days': row[7],
+                        'retention_days': row[8]
                     }
                     for row in rows
                 ]
@@ -103,15 +369,19 @@ class TicketDatabase:
             
             await db.execute("""
                 INSERT OR REPLACE INTO guild_configs 
-                (guild_id, panel_channel, panel_message_id, ticket_category, support_role, transcript_channel)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (guild_id, panel_channel, panel_message_id, ticket_category, support_role, transcript_channel,
+                 auto_close_hours, archive_after_days, retention_days)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 guild_id,
                 config.get('panel_channel'),
                 config.get('panel_message_id'),
                 config.get('ticket_category'),
                 config.get('support_role'),
-                config.get('transcript_channel')
+                config.get('transcript_channel'),
+                config.get('auto_close_hours'),
+                config.get('archive_after_days'),
+                config.get('retention_days')
             ))
             await db.commit()
     
@@ -121,36 +391,78 @@ class TicketDatabase:
             await db.commit()
     
     async def create_ticket(self, guild_id, channel_id, owner_id, owner_name):
+        now = datetime.datetime.utcnow().isoformat()
         async with aiosqlite.connect(self.db_path) as db:
             cursor = await db.execute("""
-                INSERT INTO tickets (guild_id, channel_id, owner_id, owner_name, created_at, status)
-                VALUES (?, ?, ?, ?, ?, 'open')
-            """, (guild_id, channel_id, owner_id, owner_name, datetime.datetime.utcnow().isoformat()))
+                INSERT INTO tickets (guild_id, channel_id, owner_id, owner_name, created_at, last_activity, status)
+                VALUES (?, ?, ?, ?, ?, ?, 'open')
+            """, (guild_id, channel_id, owner_id, owner_name, now, now))
+            await db.execute("""
+                INSERT INTO ticket_stats (guild_id, open_count) VALUES (?, 1)
+                ON CONFLICT (guild_id) DO UPDATE SET open_count = open_count + 1
+            """, (guild_id,))
+            await db.execute("""
+                INSERT INTO ticket_daily_stats (guild_id, day, created) VALUES (?, ?, 1)
+                ON CONFLICT (guild_id, day) DO UPDATE SET created = created + 1
+            """, (guild_id, now[:10]))
             await db.commit()
             return cursor.lastrowid
     
+    async def set_control_message(self, ticket_id, message_id):
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(
+                "UPDATE tickets SET control_message_id = ? WHERE ticket_id = ?",
+                (message_id, ticket_id)
+            )
+            await db.commit()
+    
+    async def update_last_activity(self, rows):
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany("UPDATE tickets SET last_activity = ? WHERE ticket_id = ?", rows)
+            await db.commit()
+    
     async def close_ticket(self, channel_id, closed_by):
+        now = datetime.datetime.utcnow()
         async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(OPEN_TICKET_BY_CHANNEL_SQL, (channel_id,)) as cursor:
+                ticket = await cursor.fetchone()
+            if not ticket:
+                return
+            ticket_id, _, _, guild_id, created_at = ticket
+            
             await db.execute("""
                 UPDATE tickets 
                 SET closed_at = ?, closed_by = ?, status = 'closed'
-                WHERE channel_id = ? AND status = 'open'
-            """, (datetime.datetime.utcnow().isoformat(), closed_by, channel_id))
+                WHERE ticket_id = ?
+            """, (now.isoformat(), closed_by, ticket_id))
+            
+            # Keep the precomputed statistics in step
+            resolution = (now - datetime.datetime.fromisoformat(created_at)).total_seconds()
+            await db.execute("""
+                UPDATE ticket_stats
+                SET open_count = open_count - 1, closed_count = closed_count + 1,
+                    resolution_total = resolution_total + ?
+                WHERE guild_id = ?
+            """, (resolution, guild_id))
+            await db.execute("""
+                INSERT INTO ticket_daily_stats (guild_id, day, closed) VALUES (?, ?, 1)
+                ON CONFLICT (guild_id, day) DO UPDATE SET closed = closed + 1
+            """, (guild_id, now.date().isoformat()))
+            await db.execute("""
+                INSERT INTO ticket_resolution_histogram (guild_id, bucket, count) VALUES (?, ?, 1)
+                ON CONFLICT (guild_id, bucket) DO UPDATE SET count = count + 1
+            """, (guild_id, bisect.bisect_right(RESOLUTION_BUCKETS, resolution)))
             await db.commit()
     
     async def get_ticket_by_channel(self, channel_id):
         async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT ticket_id, owner_id, owner_name FROM tickets WHERE channel_id = ? AND status = 'open'",
-                (channel_id,)
-            ) as cursor:
-                return await cursor.fetchone()
+            async with db.execute(OPEN_TICKET_BY_CHANNEL_SQL, (channel_id,)) as cursor:
+                row = await cursor.fetchone()
+                return row[:3] if row else None
     
     async def get_all_open_tickets(self):
         async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                "SELECT ticket_id, guild_id, channel_id, owner_id, owner_name FROM tickets WHERE status = 'open'"
-            ) as cursor:
+            async with db.execute(OPEN_TICKETS_SQL) as cursor:
                 rows = await cursor.fetchall()
                 return [
                     {
@@ -158,51 +470,271 @@ class TicketDatabase:
                         'guild_id': row[1],
                         'channel_id': row[2],
                         'owner_id': row[3],
-                        'owner_name': row[4]
+                        'owner_name': row[4],
+                        'control_message_id': row[5],
+                        'last_activity': row[6]
                     }
                     for row in rows
                 ]
     
-    async def has_open_ticket(self, guild_id, user_id):
+    async def iter_ticket_transcript(self, ticket_id, batch_size=500):
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute(ARCHIVE_BY_TICKET_SQL, (ticket_id,)) as cursor:
+                archived = await cursor.fetchone()
+            if archived:
+                # Archived tickets have no live rows; a NULL blob was purged by retention
+                if archived[0]:
+                    for rows in iter_archived_rows(archived[0], batch_size):
+                        yield rows
+                return
+            
+            async with db.execute(TRANSCRIPT_SQL, (ticket_id,)) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+    
+    async def count_ticket_messages(self, ticket_id):
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT channel_id FROM tickets WHERE guild_id = ? AND owner_id = ? AND status = 'open'",
-                (guild_id, user_id)
+                "SELECT message_count, data IS NOT NULL FROM ticket_archives WHERE ticket_id = ?",
+                (ticket_id,)
             ) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row else None
+                archived = await cursor.fetchone()
+            if archived:
+                return archived[0] if archived[1] else 0
+            
+            async with db.execute(MESSAGE_COUNT_SQL, (ticket_id,)) as cursor:
+                return (await cursor.fetchone())[0]
+    
+    async def archive_closed_tickets(self, limit=50):
+        """Move messages of closed tickets older than their guild's archive age into ticket_archives.
+
+        Each ticket becomes one zlib blob of newline-separated JSON rows. Returns
+        the number of tickets archived; call again while it equals ``limit``.
+        """
+        async with aiosqlite.connect(self.db_path) as db:
+            async with db.execute("SELECT MIN(archive_after_days) FROM guild_configs") as cursor:
+                shortest = (await cursor.fetchone())[0]
+            shortest = min(shortest or DEFAULT_ARCHIVE_DAYS, DEFAULT_ARCHIVE_DAYS)
+            async with db.execute(ARCHIVE_CANDIDATES_SQL, (shortest, DEFAULT_ARCHIVE_DAYS, limit)) as cursor:
+                tickets = await cursor.fetchall()
+            
+            for ticket_id, guild_id, closed_at in tickets:
+                compressor = zlib.compressobj(9)
+                chunks = []
+                count = 0
+                async with db.execute(TRANSCRIPT_SQL, (ticket_id,)) as cursor:
+                    while True:
+                        rows = await cursor.fetchmany(500)
+                        if not rows:
+                            break
+                        encoded = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+                        chunks.append(compressor.compress(encoded.encode()))
+                        count += len(rows)
+                chunks.append(compressor.flush())
+                archived_at = datetime.datetime.utcnow().isoformat()
+                
+                await db.execute("""
+                    INSERT INTO ticket_archives (ticket_id, guild_id, message_count, closed_at, archived_at, data)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (ticket_id, guild_id, count, closed_at, archived_at, b"".join(chunks)))
+                await db.execute("UPDATE tickets SET archived_at = ? WHERE ticket_id = ?", (archived_at, ticket_id))
+                await db.execute("DELETE FROM ticket_messages WHERE ticket_id = ?", (ticket_id,))
+                await db.commit()
+            return len(tickets)
+    
+    async def purge_expired_archives(self):
+        """Drop archived transcripts past their guild's retention; the summary row is kept"""
+        async with aiosqlite.connect(self.db_path) as db:
+            cursor = await db.execute("""
+                UPDATE ticket_archives SET data = NULL
+                WHERE data IS NOT NULL AND closed_at < strftime('%Y-%m-%dT%H:%M:%S', 'now', '-' || (
+                    SELECT g.retention_days FROM guild_configs g WHERE g.guild_id = ticket_archives.guild_id
+                ) || ' days')
+            """)
+            await db.commit()
+            return cursor.rowcount
     
-    async def get_ticket_transcript(self, ticket_id):
+    async def get_ticket(self, ticket_id):
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT author_name, content, timestamp FROM ticket_messages WHERE ticket_id = ? ORDER BY timestamp ASC",
+                "SELECT guild_id, channel_id, owner_id, owner_name, status FROM tickets WHERE ticket_id = ?",
                 (ticket_id,)
             ) as cursor:
-                return await cursor.fetchall()
+                row = await cursor.fetchone()
+                if row:
+                    return {
+                        'guild_id': row[0],
+                        'channel_id': row[1],
+                        'owner_id': row[2],
+                        'owner_name': row[3],
+                        'status': row[4]
+                    }
+                return None
     
-    async def log_message(self, ticket_id, author_id, author_name, content):
+    async def log_messages(self, rows):
         async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
+            await db.executemany("""
                 INSERT INTO ticket_messages (ticket_id, author_id, author_name, content, timestamp)
                 VALUES (?, ?, ?, ?, ?)
-            """, (ticket_id, author_id, author_name, content, datetime.datetime.utcnow().isoformat()))
+            """, rows)
             await db.commit()
     
-    async def get_ticket_stats(self, guild_id):
+    async def get_ticket_stats(self, guild_id, days=14):
+        """Read the precomputed counters; cost does not depend on ticket history"""
         async with aiosqlite.connect(self.db_path) as db:
             async with db.execute(
-                "SELECT COUNT(*) FROM tickets WHERE guild_id = ? AND status = 'open'",
+                "SELECT open_count, closed_count, resolution_total FROM ticket_stats WHERE guild_id = ?",
                 (guild_id,)
             ) as cursor:
-                open_count = (await cursor.fetchone())[0]
+                row = await cursor.fetchone()
+            open_count, closed_count, resolution_total = row or (0, 0, 0)
+            
+            since = (datetime.datetime.utcnow().date() - datetime.timedelta(days=days - 1)).isoformat()
+            async with db.execute(DAILY_STATS_SQL, (guild_id, since)) as cursor:
+                daily = {day: (created, closed) for day, created, closed in await cursor.fetchall()}
             
             async with db.execute(
-                "SELECT COUNT(*) FROM tickets WHERE guild_id = ? AND status = 'closed'",
+                "SELECT bucket, count FROM ticket_resolution_histogram WHERE guild_id = ?",
                 (guild_id,)
             ) as cursor:
-                closed_count = (await cursor.fetchone())[0]
+                histogram = dict(await cursor.fetchall())
             
-            return {'open': open_count, 'closed': closed_count, 'total': open_count + closed_count}
+            return {
+                'open': open_count,
+                'closed': closed_count,
+                'total': open_count + closed_count,
+                'average_resolution': resolution_total / closed_count if closed_count else None,
+                'median_resolution': median_resolution(histogram),
+                'daily': daily
+            }
+
+
+class TranscriptBuffer:
+    """Collects ticket messages in memory and writes them in batches.
+
+    Rows are flushed in one transaction once ``max_rows`` are waiting or
+    ``max_delay`` seconds after the first buffered row, whichever is first.
+    """
+
+    def __init__(self, db, max_rows=50, max_delay=2.0):
+        self.db = db
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.rows = []
+        self.lock = asyncio.Lock()
+        self.timer = None
+
+    async def add(self, ticket_id, author_id, author_name, content):
+        self.rows.append((ticket_id, author_id, author_name, content, datetime.datetime.utcnow().isoformat()))
+        if len(self.rows) >= self.max_rows:
+            await self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.create_task(self.flush_later())
+
+    async def flush_later(self):
+        await asyncio.sleep(self.max_delay)
+        self.timer = None
+        await self.flush()
+
+    async def flush(self):
+        async with self.lock:
+            if not self.rows:
+                return
+            rows, self.rows = self.rows, []
+            try:
+                await self.db.log_messages(rows)
+            except Exception as e:
+                # Keep the rows so the next flush retries them
+                self.rows[:0] = rows
+                print(f"Error writing ticket transcript rows: {e}")
+
+    async def close(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        await self.flush()
+
+
+class TranscriptExporter:
+    """Streams a ticket transcript from the database into a file.
+
+    Rows are read from a cursor in batches and written out as they arrive,
+    so memory use does not depend on the ticket length. Output is kept in
+    memory up to ``spool_size`` bytes and spills to a temp file after that.
+    """
+
+    formats = {'txt': 'txt', 'gz': 'txt.gz', 'html': 'html'}
+
+    def __init__(self, db, batch_size=500, spool_size=1024 * 1024):
+        self.db = db
+        self.batch_size = batch_size
+        self.spool_size = spool_size
+
+    async def export(self, ticket_id, header, fmt='txt'):
+        """Write the transcript and return ``(file, size, filename)``.
+
+        ``header`` is a list of ``(label, value)`` pairs shown above the
+        messages. The returned file is positioned at the start and must be
+        closed by the caller.
+        """
+        total = await self.db.count_ticket_messages(ticket_id)
+        header = header + [("Total Messages", total)]
+        as_html = fmt == 'html'
+
+        spool = tempfile.SpooledTemporaryFile(max_size=self.spool_size)
+        out = gzip.GzipFile(fileobj=spool, mode='wb') if fmt == 'gz' else spool
+        try:
+            out.write(self.render_header(ticket_id, header, as_html).encode())
+            render = self.render_html_row if as_html else self.render_text_row
+            async for rows in self.db.iter_ticket_transcript(ticket_id, self.batch_size):
+                out.write("".join(render(*row) for row in rows).encode())
+            if as_html:
+                out.write(b"</div>\n</body>\n</html>\n")
+            if out is not spool:
+                out.close()
+        except Exception:
+            spool.close()
+            raise
+
+        size = spool.tell()
+        spool.seek(0)
+        return spool, size, f"transcript_{ticket_id}.{self.formats[fmt]}"
+
+    @staticmethod
+    def format_time(timestamp):
+        return datetime.datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    def render_header(self, ticket_id, header, as_html):
+        if as_html:
+            fields = "".join(
+                f"<li><b>{html.escape(str(label))}:</b> {html.escape(str(value))}</li>"
+                for label, value in header
+            )
+            return (
+                "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                f"<title>Ticket Transcript #{ticket_id}</title>\n"
+                "<style>body{font-family:sans-serif;background:#313338;color:#dbdee1}"
+                ".time{color:#949ba4}.author{font-weight:bold;color:#f2f3f5}"
+                ".content{white-space:pre-wrap}</style>\n</head>\n<body>\n"
+                f"<h2>Ticket Transcript #{ticket_id}</h2>\n<ul>{fields}</ul>\n<hr>\n<div>\n"
+            )
+        text = "**Ticket Transcript**\n"
+        for label, value in header:
+            text += f"**{label}:** {value}\n"
+        return text + f"\n{'='*50}\n\n"
+
+    def render_text_row(self, author_name, content, timestamp):
+        return f"[{self.format_time(timestamp)}] {author_name}: {content}\n"
+
+    def render_html_row(self, author_name, content, timestamp):
+        return (
+            f'<p><span class="time">[{self.format_time(timestamp)}]</span> '
+            f'<span class="author">{html.escape(author_name)}</span>: '
+            f'<span class="content">{html.escape(content)}</span></p>\n'
+        )
 
 
 class ChannelSelect(Select):
@@ -323,10 +855,26 @@ class TicketPanelView(View):
     @discord.ui.button(label="Create ticket", style=discord.ButtonStyle.primary, custom_id="ticket_create_persistent")
     async def create_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True)
+        
+        # One creation at a time per user, so repeated clicks cannot race
+        key = (interaction.guild.id, interaction.user.id)
+        waiters = self.cog.create_locks.setdefault(key, [asyncio.Lock(), 0])
+        waiters[1] += 1
+        try:
+            async with waiters[0]:
+                await self.open_ticket(interaction, key)
+        finally:
+            # Only drop the lock once no click is holding or waiting for it
+            waiters[1] -= 1
+            if not waiters[1]:
+                self.cog.create_locks.pop(key, None)
+
+
+    async def open_ticket(self, interaction: discord.Interaction, key):
         guild = interaction.guild
         
         # Check if user already has an open ticket
-        existing_channel_id = await self.cog.db.has_open_ticket(guild.id, interaction.user.id)
+        existing_channel_id = self.cog.open_owners.get(key)
         if existing_channel_id:
             existing_channel = guild.get_channel(existing_channel_id)
             if existing_channel:
@@ -335,6 +883,9 @@ class TicketPanelView(View):
                     ephemeral=True
                 )
                 return
+            # The channel was deleted without closing the ticket
+            await self.cog.db.close_ticket(existing_channel_id, self.cog.bot.user.id)
+            self.cog.forget_ticket(existing_channel_id, key)
         
         config = await self.cog.db.get_guild_config(guild.id)
         
@@ -360,12 +911,21 @@ class TicketPanelView(View):
         )
         
         # Save ticket to database
-        ticket_id = await self.cog.db.create_ticket(
-            guild.id, 
-            ticket_channel.id, 
-            interaction.user.id, 
-            str(interaction.user)
-        )
+        try:
+            ticket_id = await self.cog.db.create_ticket(
+                guild.id, 
+                ticket_channel.id, 
+                interaction.user.id, 
+                str(interaction.user)
+            )
+        except aiosqlite.IntegrityError:
+            await ticket_channel.delete()
+            await interaction.followup.send("You already have an open ticket.", ephemeral=True)
+            return
+        self.cog.open_channels[ticket_channel.id] = ticket_id
+        self.cog.open_owners[key] = ticket_channel.id
+        self.cog.last_activity[ticket_id] = time.time()
+        self.cog.schedule_auto_close(ticket_id, guild.id, ticket_channel.id, interaction.user.id)
         
         embed = discord.Embed(
             title="Support will be with you shortly.",
@@ -373,7 +933,7 @@ class TicketPanelView(View):
             color=discord.Color.green()
         )
         embed.set_footer(text=f"Ticket ID: {ticket_id}")
-        view = TicketActionView(self.cog, ticket_channel.id, interaction.user.id, ticket_id, guild.id)
+        view = TicketActionView(ticket_id)
         
         content = f"Welcome {interaction.user.mention}"
         allowed_mentions = discord.AllowedMentions(users=[interaction.user], roles=[])
@@ -383,69 +943,56 @@ class TicketPanelView(View):
             allowed_mentions = discord.AllowedMentions(users=[interaction.user], roles=[support_role])
 
 
-        await ticket_channel.send(
+        control_message = await ticket_channel.send(
             content=content, 
             embed=embed, 
             view=view,
             allowed_mentions=allowed_mentions
         )
+        await self.cog.db.set_control_message(ticket_id, control_message.id)
         await interaction.followup.send(f"Ticket created: {ticket_channel.mention}", ephemeral=True)
 
 
-class TicketActionView(View):
-    def __init__(self, cog, channel_id, owner_id, ticket_id, guild_id):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.channel_id = channel_id
-        self.owner_id = owner_id
+class TicketCloseButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:close:(?P<ticket_id>[0-9]+)"):
+    """Close button whose custom id carries the ticket id, so one registration serves every ticket"""
+
+    def __init__(self, ticket_id):
+        super().__init__(
+            discord.ui.Button(
+                label="Close",
+                style=discord.ButtonStyle.danger,
+                custom_id=f"ticket:close:{ticket_id}",
+                row=0
+            )
+        )
         self.ticket_id = ticket_id
-        self.guild_id = guild_id
 
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["ticket_id"]))
 
-    @discord.ui.button(label="Close", style=discord.ButtonStyle.danger, custom_id="ticket_close_persistent", row=0)
-    async def close_ticket_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Check for moderator permissions
-        if not (interaction.user.guild_permissions.administrator or 
-                interaction.user.guild_permissions.manage_messages or 
-                interaction.guild.owner_id == interaction.user.id):
-            await interaction.response.send_message("Only moderators can close tickets.", ephemeral=True)
-            return
-        
-        # Show close options
-        view = TicketCloseOptionsView(self.cog, self.channel_id, self.owner_id, self.ticket_id, self.guild_id)
-        await interaction.response.send_message(
-            "**Choose an action:**",
-            view=view,
-            ephemeral=True
-        )
+    async def callback(self, interaction: discord.Interaction):
+        cog = interaction.client.get_cog("Ticket")
+        await cog.show_close_options(interaction, self.ticket_id)
+
+
+class TicketActionView(View):
+    def __init__(self, ticket_id):
+        super().__init__(timeout=None)
+        self.add_item(TicketCloseButton(ticket_id))
 
 
 class TicketCloseView(View):
-    def __init__(self, cog, channel_id, owner_id, ticket_id, guild_id):
+    """Handles close buttons sent before the ticket id was part of the custom id"""
+
+    def __init__(self, cog):
         super().__init__(timeout=None)
         self.cog = cog
-        self.channel_id = channel_id
-        self.owner_id = owner_id
-        self.ticket_id = ticket_id
-        self.guild_id = guild_id
 
 
     @discord.ui.button(label="Close", style=discord.ButtonStyle.danger, custom_id="ticket_close_persistent")
     async def close_ticket_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Check for moderator permissions
-        if not (interaction.user.guild_permissions.administrator or 
-                interaction.user.guild_permissions.manage_messages or 
-                interaction.guild.owner_id == interaction.user.id):
-            await interaction.response.send_message("Only moderators can close tickets.", ephemeral=True)
-            return
-        
-        # Show close options
-        view = TicketCloseOptionsView(self.cog, self.channel_id, self.owner_id, self.ticket_id, self.guild_id)
-        await interaction.response.send_message(
-            "**Choose an action:**",
-            view=view,
-            ephemeral=True
-        )
+        await self.cog.show_close_options(interaction, self.cog.open_channels.get(interaction.channel_id))
 
 
 class TicketCloseOptionsView(View):
@@ -462,33 +1009,12 @@ class TicketCloseOptionsView(View):
     async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer()
         
-        # Get owner and channel
-        owner = interaction.guild.get_member(self.owner_id)
         channel = interaction.guild.get_channel(self.channel_id)
-        
         if not channel:
             await interaction.followup.send("Channel not found.", ephemeral=True)
             return
         
-        # Close ticket in database
-        await self.cog.db.close_ticket(self.channel_id, interaction.user.id)
-        
-        # Send proper mention
-        if owner:
-            await channel.send(
-                f"{owner.mention}, your ticket will be deleted in 2 minutes.",
-                allowed_mentions=discord.AllowedMentions(users=True)
-            )
-        else:
-            await channel.send(
-                f"<@{self.owner_id}>, your ticket will be deleted in 2 minutes."
-            )
-        
-        await asyncio.sleep(120)
-        try:
-            await channel.delete()
-        except:
-            pass
+        await self.cog.close_ticket(channel, self.owner_id, interaction.user.id)
 
 
     @discord.ui.button(label="Send Transcript", style=discord.ButtonStyle.secondary)
@@ -514,47 +1040,37 @@ class TicketCloseOptionsView(View):
             await interaction.followup.send("Ticket data not found.", ephemeral=True)
             return
         
-        # Get transcript messages
-        messages = await self.cog.db.get_ticket_transcript(self.ticket_id)
-        
-        # Build transcript text
+        # Stream transcript messages into a file
+        await self.cog.transcripts.flush()
         owner = interaction.guild.get_member(self.owner_id)
         owner_name = str(owner) if owner else f"User ID: {self.owner_id}"
-        
-        transcript_text = f"**Ticket Transcript**\n"
-        transcript_text += f"**Ticket ID:** {self.ticket_id}\n"
-        transcript_text += f"**Owner:** {owner_name}\n"
-        transcript_text += f"**Channel:** <#{self.channel_id}>\n"
-        transcript_text += f"**Sent by:** {interaction.user.mention}\n"
-        transcript_text += f"**Total Messages:** {len(messages)}\n"
-        transcript_text += f"\n{'='*50}\n\n"
-        
-        for msg in messages:
-            author_name, content, timestamp = msg
-            # Format timestamp
-            dt = datetime.datetime.fromisoformat(timestamp)
-            formatted_time = dt.strftime("%Y-%m-%d %H:%M:%S UTC")
-            transcript_text += f"[{formatted_time}] {author_name}: {content}\n"
+        header = [
+            ("Ticket ID", self.ticket_id),
+            ("Owner", owner_name),
+            ("Channel", f"<#{self.channel_id}>"),
+            ("Sent by", interaction.user.mention),
+        ]
+        transcript, size, filename = await self.cog.exporter.export(self.ticket_id, header)
         
         # Send as file if too long, otherwise as embed
-        if len(transcript_text) > 4000:
-            import io
-            file = discord.File(io.BytesIO(transcript_text.encode()), filename=f"transcript_{self.ticket_id}.txt")
-            embed = discord.Embed(
-                title=f"Ticket Transcript #{self.ticket_id}",
-                description=f"**Owner:** {owner_name}\n**Sent by:** {interaction.user.mention}",
-                color=discord.Color.blue(),
-                timestamp=datetime.datetime.utcnow()
-            )
-            await transcript_channel.send(embed=embed, file=file)
-        else:
-            embed = discord.Embed(
-                title=f"Ticket Transcript #{self.ticket_id}",
-                description=transcript_text,
-                color=discord.Color.blue(),
-                timestamp=datetime.datetime.utcnow()
-            )
-            await transcript_channel.send(embed=embed)
+        with transcript:
+            if size > 4000:
+                file = discord.File(transcript, filename=filename)
+                embed = discord.Embed(
+                    title=f"Ticket Transcript #{self.ticket_id}",
+                    description=f"**Owner:** {owner_name}\n**Sent by:** {interaction.user.mention}",
+                    color=discord.Color.blue(),
+                    timestamp=datetime.datetime.utcnow()
+                )
+                await transcript_channel.send(embed=embed, file=file)
+            else:
+                embed = discord.Embed(
+                    title=f"Ticket Transcript #{self.ticket_id}",
+                    description=transcript.read().decode(),
+                    color=discord.Color.blue(),
+                    timestamp=datetime.datetime.utcnow()
+                )
+                await transcript_channel.send(embed=embed)
         
         await interaction.followup.send(f"Transcript sent to {transcript_channel.mention}", ephemeral=True)
 
@@ -563,13 +1079,69 @@ class Ticket(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = TicketDatabase()
+        self.transcripts = TranscriptBuffer(self.db)
+        self.exporter = TranscriptExporter(self.db)
         self.views_registered = False
+        self.refresh_concurrency = 5
+        # channel_id -> ticket_id for every open ticket
+        self.open_channels = {}
+        # (guild_id, owner_id) -> channel_id for every open ticket
+        self.open_owners = {}
+        # (guild_id, user_id) -> [lock, clicks holding or waiting for it]
+        self.create_locks = {}
+        # Auto-close: guild_id -> idle hours, ticket_id -> last activity (epoch seconds),
+        # and a heap of (due, ticket_id, guild_id, channel_id, owner_id). Heap entries
+        # whose due time no longer matches self.close_due are stale and skipped.
+        self.auto_close_hours = {}
+        self.last_activity = {}
+        self.dirty_activity = set()
+        self.close_heap = []
+        self.close_due = {}
+        self.schedule_changed = asyncio.Event()
+        self.scheduler_task = None
+        self.refresh_task = None
+        # Auto-close runs in the background; keep a reference until each one finishes
+        self.close_tasks = set()
 
 
     async def cog_load(self):
         """Called when cog is loaded - setup database and register persistent views"""
         await self.db.init_db()
+        open_tickets = await self.db.get_all_open_tickets()
+        self.open_channels = {ticket['channel_id']: ticket['ticket_id'] for ticket in open_tickets}
+        self.open_owners = {(ticket['guild_id'], ticket['owner_id']): ticket['channel_id'] for ticket in open_tickets}
+        self.auto_close_hours = {
+            config['guild_id']: config['auto_close_hours']
+            for config in await self.db.get_all_guild_configs() if config['auto_close_hours']
+        }
+        for ticket in open_tickets:
+            if ticket['last_activity']:
+                self.last_activity[ticket['ticket_id']] = to_timestamp(ticket['last_activity'])
+            self.schedule_auto_close(ticket['ticket_id'], ticket['guild_id'], ticket['channel_id'], ticket['owner_id'])
+        self.scheduler_task = asyncio.create_task(self.auto_close_scheduler())
+        self.flush_activity.start()
+        self.archive_tickets.start()
+        self.bot.pipeline.provide('is_ticket_channel', lambda msg: msg.channel_id in self.open_channels)
+        self.bot.pipeline.register(
+            'ticket_transcript', self.log_ticket_message,
+            check=lambda msg: msg.fact('is_ticket_channel'), priority=40
+        )
         await self.register_persistent_views()
+        self.refresh_task = asyncio.create_task(self.refresh_ticket_views())
+
+
+    async def cog_unload(self):
+        self.bot.remove_dynamic_items(TicketCloseButton)
+        self.bot.pipeline.unregister('ticket_transcript')
+        self.bot.pipeline.remove_provider('is_ticket_channel')
+        if self.scheduler_task:
+            self.scheduler_task.cancel()
+        if self.refresh_task:
+            self.refresh_task.cancel()
+        self.flush_activity.cancel()
+        self.archive_tickets.cancel()
+        await self.transcripts.close()
+        await self.write_activity()
 
 
     async def register_persistent_views(self):
@@ -577,60 +1149,233 @@ class Ticket(commands.Cog):
         if self.views_registered:
             return
         
-        # Register ticket panel view
-        panel_view = TicketPanelView(self)
-        self.bot.add_view(panel_view)
+        # Register ticket panel view and the close buttons shared by every ticket
+        self.bot.add_view(TicketPanelView(self))
+        self.bot.add_view(TicketCloseView(self))
+        self.bot.add_dynamic_items(TicketCloseButton)
         
-        # Register close views for all open tickets
+        self.views_registered = True
+        print("✅ Registered persistent views: panel view + dynamic ticket close button")
+
+
+    async def refresh_ticket_views(self):
+        """Update existing ticket messages with the current view once channels are cached"""
+        await self.bot.wait_until_ready()
         open_tickets = await self.db.get_all_open_tickets()
-        for ticket in open_tickets:
-            action_view = TicketActionView(self, ticket['channel_id'], ticket['owner_id'], ticket['ticket_id'], ticket['guild_id'])
-            self.bot.add_view(action_view)
-            close_view = TicketCloseView(self, ticket['channel_id'], ticket['owner_id'], ticket['ticket_id'], ticket['guild_id'])
-            self.bot.add_view(close_view)
+        semaphore = asyncio.Semaphore(self.refresh_concurrency)
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.refresh_ticket_view(ticket, semaphore) for ticket in open_tickets))
+        print(
+            f"✅ Refreshed {sum(results)}/{len(open_tickets)} ticket views "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+
+    async def refresh_ticket_view(self, ticket, semaphore):
+        channel = self.bot.get_channel(ticket['channel_id'])
+        if not channel:
+            return False
         
-        self.views_registered = True
-        print(f"✅ Registered persistent views: 1 panel view + {len(open_tickets)} ticket action views")
+        async with semaphore:
+            try:
+                if ticket['control_message_id']:
+                    message = channel.get_partial_message(ticket['control_message_id'])
+                    await message.edit(view=TicketActionView(ticket['ticket_id']))
+                    return True
+                
+                # Tickets created before the control message id was stored
+                async for message in channel.history(limit=10):
+                    if message.author == self.bot.user and message.embeds:
+                        embed = message.embeds[0]
+                        if embed.footer and "Ticket ID:" in str(embed.footer.text):
+                            await message.edit(view=TicketActionView(ticket['ticket_id']))
+                            await self.db.set_control_message(ticket['ticket_id'], message.id)
+                            return True
+            except Exception as e:
+                print(f"Could not update ticket {ticket['ticket_id']}: {e}")
+        return False
+
+
+    def forget_ticket(self, channel_id, owner_key):
+        ticket_id = self.open_channels.pop(channel_id, None)
+        self.open_owners.pop(owner_key, None)
+        self.last_activity.pop(ticket_id, None)
+        self.dirty_activity.discard(ticket_id)
+        self.close_due.pop(ticket_id, None)
+
+
+    async def close_ticket(self, channel, owner_id, closed_by, reason=None):
+        # Close ticket in database
+        await self.transcripts.flush()
+        await self.db.close_ticket(channel.id, closed_by)
+        self.forget_ticket(channel.id, (channel.guild.id, owner_id))
         
-        # Update existing ticket messages with new view if button is missing
-        for ticket in open_tickets:
+        # Send proper mention
+        notice = "your ticket will be deleted in 2 minutes."
+        if reason:
+            notice = f"{reason} {notice}"
+        owner = channel.guild.get_member(owner_id)
+        if owner:
+            await channel.send(
+                f"{owner.mention}, {notice}",
+                allowed_mentions=discord.AllowedMentions(users=True)
+            )
+        else:
+            await channel.send(
+                f"<@{owner_id}>, {notice}"
+            )
+        
+        await asyncio.sleep(120)
+        try:
+            await channel.delete()
+        except:
+            pass
+
+
+    def schedule_auto_close(self, ticket_id, guild_id, channel_id, owner_id):
+        hours = self.auto_close_hours.get(guild_id)
+        last_activity = self.last_activity.get(ticket_id)
+        if not hours or last_activity is None:
+            self.close_due.pop(ticket_id, None)
+            return
+        
+        due = last_activity + hours * 3600
+        if self.close_due.get(ticket_id) == due:
+            return
+        self.close_due[ticket_id] = due
+        heapq.heappush(self.close_heap, (due, ticket_id, guild_id, channel_id, owner_id))
+        if self.close_heap[0][1] == ticket_id:
+            self.schedule_changed.set()
+
+
+    async def auto_close_scheduler(self):
+        """Close idle tickets, sleeping until the earliest deadline in the heap.
+
+        Activity only bumps ``last_activity``; an entry is re-checked when it
+        comes due and pushed back if the ticket has been active since.
+        """
+        await self.bot.wait_until_ready()
+        while True:
+            self.schedule_changed.clear()
+            delay = self.close_heap[0][0] - time.time() if self.close_heap else None
+            if delay is None or delay > 0:
+                try:
+                    await asyncio.wait_for(self.schedule_changed.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            due, ticket_id, guild_id, channel_id, owner_id = heapq.heappop(self.close_heap)
+            if self.close_due.get(ticket_id) != due:
+                continue
+            del self.close_due[ticket_id]
+            
+            hours = self.auto_close_hours.get(guild_id)
+            last_activity = self.last_activity.get(ticket_id)
+            if not hours or last_activity is None:
+                continue
+            if last_activity + hours * 3600 > time.time():
+                # Active since this entry was pushed
+                self.schedule_auto_close(ticket_id, guild_id, channel_id, owner_id)
+                continue
+            
+            channel = self.bot.get_channel(channel_id)
             try:
-                channel = self.bot.get_channel(ticket['channel_id'])
                 if channel:
-                    # Try to find the ticket embed message and update its view
-                    async for message in channel.history(limit=10):
-                        if message.author == self.bot.user and message.embeds:
-                            embed = message.embeds[0]
-                            if embed.footer and "Ticket ID:" in str(embed.footer.text):
-                                action_view = TicketActionView(
-                                    self, 
-                                    ticket['channel_id'], 
-                                    ticket['owner_id'], 
-                                    ticket['ticket_id'], 
-                                    ticket['guild_id']
-                                )
-                                await message.edit(view=action_view)
-                                break
+                    reason = f"this ticket was closed after {hours}h of inactivity and"
+                    task = asyncio.create_task(
+                        self.close_ticket(channel, owner_id, self.bot.user.id, reason),
+                        name=f"auto-close ticket {ticket_id}"
+                    )
+                    self.close_tasks.add(task)
+                    task.add_done_callback(self.auto_close_done)
+                else:
+                    await self.db.close_ticket(channel_id, self.bot.user.id)
+                    self.forget_ticket(channel_id, (guild_id, owner_id))
             except Exception as e:
-                print(f"Could not update ticket {ticket['ticket_id']}: {e}")
+                print(f"Error auto-closing ticket {ticket_id}: {e}")
 
 
-    @commands.Cog.listener()
-    async def on_ready(self):
-        """Ensure views are registered when bot is ready"""
-        await self.register_persistent_views()
+    def auto_close_done(self, task):
+        self.close_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error in {task.get_name()}: {task.exception()}")
 
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        # Log messages in ticket channels
-        if message.author.bot:
+    def reschedule_guild(self, guild_id):
+        for (owner_guild_id, owner_id), channel_id in self.open_owners.items():
+            if owner_guild_id == guild_id:
+                ticket_id = self.open_channels.get(channel_id)
+                self.schedule_auto_close(ticket_id, guild_id, channel_id, owner_id)
+        # Wake the scheduler so shortened deadlines are noticed
+        self.schedule_changed.set()
+
+
+    @tasks.loop(hours=1)
+    async def archive_tickets(self):
+        try:
+            limit = 50
+            archived = batch = await self.db.archive_closed_tickets(limit)
+            while batch == limit:
+                batch = await self.db.archive_closed_tickets(limit)
+                archived += batch
+            purged = await self.db.purge_expired_archives()
+            if archived or purged:
+                print(f"✅ Archived {archived} closed tickets, purged {purged} expired transcripts")
+        except Exception as e:
+            print(f"Error archiving tickets: {e}")
+
+
+    @tasks.loop(minutes=1)
+    async def flush_activity(self):
+        await self.write_activity()
+
+
+    async def write_activity(self):
+        if not self.dirty_activity:
+            return
+        rows = [
+            (from_timestamp(self.last_activity[ticket_id]), ticket_id)
+            for ticket_id in self.dirty_activity if ticket_id in self.last_activity
+        ]
+        self.dirty_activity = set()
+        try:
+            await self.db.update_last_activity(rows)
+        except Exception as e:
+            self.dirty_activity.update(ticket_id for _, ticket_id in rows)
+            print(f"Error saving ticket activity: {e}")
+
+
+    async def show_close_options(self, interaction, ticket_id):
+        # Check for moderator permissions
+        if not (interaction.user.guild_permissions.administrator or 
+                interaction.user.guild_permissions.manage_messages or 
+                interaction.guild.owner_id == interaction.user.id):
+            await interaction.response.send_message("Only moderators can close tickets.", ephemeral=True)
+            return
+        
+        ticket = await self.db.get_ticket(ticket_id) if ticket_id else None
+        if not ticket or ticket['status'] != 'open':
+            await interaction.response.send_message("This ticket is already closed.", ephemeral=True)
             return
         
-        ticket_data = await self.db.get_ticket_by_channel(message.channel.id)
-        if ticket_data:
-            ticket_id = ticket_data[0]
-            await self.db.log_message(
+        # Show close options
+        view = TicketCloseOptionsView(self, ticket['channel_id'], ticket['owner_id'], ticket_id, ticket['guild_id'])
+        await interaction.response.send_message(
+            "**Choose an action:**",
+            view=view,
+            ephemeral=True
+        )
+
+
+    async def log_ticket_message(self, msg):
+        # Log messages in ticket channels
+        message = msg.message
+        ticket_id = self.open_channels.get(msg.channel_id)
+        if ticket_id:
+            self.last_activity[ticket_id] = time.time()
+            self.dirty_activity.add(ticket_id)
+            await self.transcripts.add(
                 ticket_id,
                 message.author.id,
                 str(message.author),
@@ -641,7 +1386,7 @@ class Ticket(commands.Cog):
     @commands.group()
     async def ticketsetup(self, ctx):
         if ctx.invoked_subcommand is None:
-            await ctx.send("Usage: `ticketsetup enable|disable|config|stats`")
+            await ctx.send("Usage: `ticketsetup enable|disable|config|stats|transcript|autoclose|retention`")
 
 
     @ticketsetup.command()
@@ -668,6 +1413,8 @@ class Ticket(commands.Cog):
                 pass
         
         await self.db.clear_guild_config(ctx.guild.id)
+        if self.auto_close_hours.pop(ctx.guild.id, None):
+            self.reschedule_guild(ctx.guild.id)
         await ctx.send("Ticket setup disabled and reset.")
 
 
@@ -687,6 +1434,16 @@ class Ticket(commands.Cog):
         embed.add_field(name="Support Role", value=support_role.mention if support_role else "Not set", inline=False)
         embed.add_field(name="Transcript Channel", value=transcript_ch.mention if transcript_ch else "Not set", inline=False)
         embed.add_field(name="Panel Message ID", value=config.get('panel_message_id', 'Not set'), inline=False)
+        auto_close = config.get('auto_close_hours')
+        embed.add_field(name="Auto Close", value=f"After {auto_close}h of inactivity" if auto_close else "Disabled", inline=False)
+        archive_days = config.get('archive_after_days') or DEFAULT_ARCHIVE_DAYS
+        retention_days = config.get('retention_days')
+        embed.add_field(
+            name="Transcript Retention",
+            value=f"Archived {archive_days}d after close, "
+                  + (f"deleted after {retention_days}d" if retention_days else "kept forever"),
+            inline=False
+        )
         
         await ctx.send(embed=embed)
     
@@ -699,7 +1456,101 @@ class Ticket(commands.Cog):
         embed.add_field(name="🔴 Closed Tickets", value=stats['closed'], inline=True)
         embed.add_field(name="📊 Total Tickets", value=stats['total'], inline=True)
         
+        average = stats['average_resolution']
+        median = stats['median_resolution']
+        embed.add_field(name="⏱️ Average Time to Close", value=format_duration(average) if average is not None else "N/A", inline=True)
+        embed.add_field(name="⏱️ Median Time to Close", value=f"~{format_duration(median)}" if median is not None else "N/A", inline=True)
+        
+        # Last 7 days against the 7 before
+        today = datetime.datetime.utcnow().date()
+        days = [(today - datetime.timedelta(days=offset)).isoformat() for offset in range(14)]
+        created = [stats['daily'].get(day, (0, 0))[0] for day in days]
+        closed = [stats['daily'].get(day, (0, 0))[1] for day in days]
+        
+        def trend(values):
+            current, previous = sum(values[:7]), sum(values[7:])
+            if current == previous:
+                return f"{current} (➖ same as previous week)"
+            arrow = "📈" if current > previous else "📉"
+            return f"{current} ({arrow} {current - previous:+d} vs previous week)"
+        
+        embed.add_field(name="🆕 Created (7d)", value=trend(created), inline=False)
+        embed.add_field(name="✅ Closed (7d)", value=trend(closed), inline=False)
+        embed.add_field(name="📅 Today", value=f"{created[0]} created, {closed[0]} closed", inline=False)
+        
         await ctx.send(embed=embed)
+    
+    @ticketsetup.command()
+    @commands.has_permissions(administrator=True)
+    async def autoclose(self, ctx, hours: int):
+        if hours < 0 or hours > 24 * 30:
+            await ctx.send("Hours must be between 0 and 720. Use 0 to disable auto close.")
+            return
+        if not await self.db.get_guild_config(ctx.guild.id):
+            await ctx.send("Ticket system is not set up in this server. Use `ticketsetup enable` first.")
+            return
+        
+        await self.db.update_guild_config(ctx.guild.id, auto_close_hours=hours or None)
+        if hours:
+            self.auto_close_hours[ctx.guild.id] = hours
+        else:
+            self.auto_close_hours.pop(ctx.guild.id, None)
+        self.reschedule_guild(ctx.guild.id)
+        
+        if hours:
+            await ctx.send(f"Tickets will now be closed after {hours}h without messages.")
+        else:
+            await ctx.send("Ticket auto close disabled.")
+    
+    @ticketsetup.command()
+    @commands.has_permissions(administrator=True)
+    async def retention(self, ctx, archive_days: int, delete_days: int = 0):
+        if archive_days < 1 or delete_days < 0:
+            await ctx.send("Archive days must be at least 1. Use 0 delete days to keep transcripts forever.")
+            return
+        if delete_days and delete_days < archive_days:
+            await ctx.send("Transcripts cannot be deleted before they are archived.")
+            return
+        if not await self.db.get_guild_config(ctx.guild.id):
+            await ctx.send("Ticket system is not set up in this server. Use `ticketsetup enable` first.")
+            return
+        
+        await self.db.update_guild_config(
+            ctx.guild.id,
+            archive_after_days=archive_days,
+            retention_days=delete_days or None
+        )
+        message = f"Closed ticket transcripts will be archived after {archive_days}d"
+        message += f" and deleted after {delete_days}d." if delete_days else " and kept forever."
+        await ctx.send(message)
+    
+    @ticketsetup.command()
+    @commands.has_permissions(manage_messages=True)
+    async def transcript(self, ctx, ticket_id: int, fmt: str = "txt"):
+        fmt = fmt.lower()
+        if fmt not in TranscriptExporter.formats:
+            await ctx.send(f"Format must be one of: {', '.join(TranscriptExporter.formats)}")
+            return
+        
+        ticket = await self.db.get_ticket(ticket_id)
+        if not ticket or ticket['guild_id'] != ctx.guild.id:
+            await ctx.send("Ticket not found.")
+            return
+        
+        await self.transcripts.flush()
+        header = [
+            ("Ticket ID", ticket_id),
+            ("Owner", ticket['owner_name']),
+            ("Channel", f"<#{ticket['channel_id']}>"),
+            ("Status", ticket['status']),
+            ("Exported by", str(ctx.author)),
+        ]
+        transcript, size, filename = await self.exporter.export(ticket_id, header, fmt)
+        with transcript:
+            if size > ctx.guild.filesize_limit:
+                await ctx.send(f"Transcript is too large to upload ({size // 1024} KB). Try the `gz` format.")
+                return
+            await ctx.send(file=discord.File(transcript, filename=filename))
 
 
 async def setup(bot):
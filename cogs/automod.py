@@ -1,11 +1,244 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import aiosqlite
 import os
 import re
+import math
+import regex
+import time
 import asyncio
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
+from tools.counters import SlidingCounter
+
+
+# Common character substitutions used to dodge word filters
+LEET_DIGITS = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '6': 'g', '7': 't', '8': 'b', '9': 'g',
+})
+# Symbols that stand in for a letter when they touch a word ("a$$", "@ss")
+LEET_SYMBOLS = {'@': 'a', '$': 's', '€': 'e', '£': 'l'}
+# Symbols that are only letters in the middle of a word ("sh!t" but not "stop!")
+LEET_INWORD = {'!': 'i', '|': 'l', '+': 't'}
+
+
+def normalize_text(text):
+    """Fold text to lowercase ascii letters/digits separated by single spaces"""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).translate(LEET_DIGITS)
+    out = []
+    space = True
+    last = len(text) - 1
+    for i, ch in enumerate(text):
+        if not ch.isalnum():
+            following = i < last and text[i + 1].isalnum()
+            if ch in LEET_SYMBOLS and (following or not space):
+                ch = LEET_SYMBOLS[ch]
+            elif ch in LEET_INWORD and following and not space:
+                ch = LEET_INWORD[ch]
+        if ch.isalnum():
+            out.append(ch)
+            space = False
+        elif not space:
+            out.append(' ')
+            space = True
+    return ''.join(out).strip()
+
+
+class WordFilter:
+    """Aho-Corasick automaton over normalized banned words and phrases.
+
+    Built once per word list; a scan is a single pass over the message
+    no matter how many patterns the guild has.
+    """
+
+    def __init__(self, words):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+
+        for word in words:
+            pattern = normalize_text(word)
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = nxt
+            self.output[state] = self.output[state] + ((pattern, len(pattern)),)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(ch, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def __len__(self):
+        return len(self.goto)
+
+    def find(self, content):
+        """Return the first banned word found as a whole word in content, or None"""
+        text = normalize_text(content)
+        goto, fail, output = self.goto, self.fail, self.output
+        end = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if output[state] and (i + 1 == end or text[i + 1] == ' '):
+                for pattern, length in output[state]:
+                    start = i - length + 1
+                    if start == 0 or text[start - 1] == ' ':
+                        return pattern
+        return None
+
+
+class RegexRule:
+    """A guild's custom regex rule along with its runtime statistics"""
+
+    def __init__(self, rule_id, pattern, enabled=True):
+        self.rule_id = rule_id
+        self.pattern = pattern
+        self.compiled = regex.compile(pattern, regex.IGNORECASE)
+        self.enabled = enabled
+        self.strikes = 0
+        self.runs = 0
+        self.timeouts = 0
+        self.cpu_time = 0.0
+        self.max_cpu_time = 0.0
+
+
+def run_regex_rules(rules, content, timeout, deadline):
+    """Run rules against content in a worker thread.
+
+    Stops once ``deadline`` (``time.monotonic``) passes, which includes
+    the time spent waiting in the pool queue. Returns the matching rule (or
+    None) and a list of (rule, cpu_seconds, timed_out) for every rule that
+    was executed; a rule cut short by the deadline rather than its own
+    timeout is not counted as timed out.
+    """
+    results = []
+    for rule in rules:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        limit = min(timeout, remaining)
+        start = time.thread_time()
+        try:
+            matched = rule.compiled.search(content, timeout=limit) is not None
+            timed_out = False
+        except TimeoutError:
+            matched = False
+            timed_out = limit == timeout
+        results.append((rule, time.thread_time() - start, timed_out))
+        if matched:
+            return rule, results
+    return None, results
+
+
+# Adaptive slowmode delays (seconds) and the message rate (msgs/sec) needed
+# to step up from each level. Stepping down requires the rate to fall well
+# below the threshold that raised it, and changes are spaced out, so the
+# channel is only edited when traffic really changes.
+SLOWMODE_STEPS = (0, 2, 5, 10, 15, 30)
+SLOWMODE_RAISE = (1.0, 1.5, 2.0, 2.5, 3.0)
+SLOWMODE_LOWER_RATIO = 0.4
+SLOWMODE_HALF_LIFE = 20.0
+SLOWMODE_MIN_INTERVAL = 60.0
+
+
+class ChannelRate:
+    """Exponentially weighted message rate of a channel"""
+
+    __slots__ = ('rate', 'updated', 'level', 'applied', 'changed', 'manual', 'pending')
+
+    def __init__(self, now, current_delay, last_applied=None):
+        self.rate = 0.0
+        self.updated = now
+        # A delay still matching what the bot last applied (even before a restart) is its own
+        owned = current_delay == last_applied and current_delay in SLOWMODE_STEPS
+        self.level = SLOWMODE_STEPS.index(current_delay) if owned else 0
+        self.applied = current_delay
+        self.changed = 0.0
+        # Channels with a slowmode set by a moderator are left alone
+        self.manual = current_delay != 0 and not owned
+        self.pending = False
+
+    def decay(self, now):
+        self.rate *= math.exp((self.updated - now) * math.log(2) / SLOWMODE_HALF_LIFE)
+        self.updated = now
+
+    def hit(self, now):
+        self.decay(now)
+        self.rate += math.log(2) / SLOWMODE_HALF_LIFE
+
+    def target_level(self, max_level):
+        level = self.level
+        if level < max_level and self.rate > SLOWMODE_RAISE[level]:
+            while level < max_level and self.rate > SLOWMODE_RAISE[level]:
+                level += 1
+        elif level > 0 and self.rate < SLOWMODE_RAISE[level - 1] * SLOWMODE_LOWER_RATIO:
+            level -= 1
+        return level
+
+
+# Raid detection: guild-wide counts over RAID_WINDOW seconds that switch a
+# guild into raid mode, and the per-message mention limit.
+RAID_WINDOW = 10
+RAID_MENTION_LIMIT = 40
+RAID_NEW_ACCOUNT_LIMIT = 15
+RAID_JOIN_LIMIT = 10
+MASS_MENTION_LIMIT = 8
+NEW_ACCOUNT_AGE = timedelta(days=7)
+RAID_DURATION = 600
+RAID_BATCH_SIZE = 10
+
+
+class RaidState:
+    """Sliding counters and raid-mode bookkeeping for one guild"""
+
+    __slots__ = ('mentions', 'new_account_messages', 'joins', 'raid_until', 'reason',
+                 'locked_permissions', 'pending_timeouts', 'pending_kicks', 'actioned')
+
+    def __init__(self):
+        self.mentions = SlidingCounter(RAID_WINDOW)
+        self.new_account_messages = SlidingCounter(RAID_WINDOW)
+        self.joins = SlidingCounter(RAID_WINDOW)
+        self.raid_until = 0.0
+        self.reason = None
+        self.locked_permissions = None
+        self.pending_timeouts = {}
+        self.pending_kicks = {}
+        self.actioned = 0
+
+    def in_raid(self, now):
+        return now < self.raid_until
+
+    def check_burst(self, now):
+        """Return why the guild looks raided right now, or None"""
+        if self.joins.total(now) >= RAID_JOIN_LIMIT:
+            return "join burst"
+        if self.mentions.total(now) >= RAID_MENTION_LIMIT:
+            return "mention burst"
+        if self.new_account_messages.total(now) >= RAID_NEW_ACCOUNT_LIMIT:
+            return "new account spam"
+        return None
+
 
 class Automod(commands.Cog):
     def __init__(self, client):
@@ -14,6 +247,32 @@ class Automod(commands.Cog):
         self.user_messages = defaultdict(lambda: deque(maxlen=10))
         self.spam_threshold = 5
         self.spam_time_window = 10
+        self.settings = {}
+        self.bypass_users = defaultdict(set)
+        self.bypass_channels = defaultdict(set)
+        self.max_banned_words = 10000
+        self.banned_words = defaultdict(set)
+        self.word_filters = {}
+        self.regex_rules = defaultdict(dict)
+        self.max_regex_rules = 25
+        self.max_regex_length = 300
+        self.regex_timeout = 0.05
+        # Regex time a single message may use in total, and how many messages may wait for the pool
+        self.regex_budget = 0.1
+        self.regex_max_queued = 20
+        self.regex_queued = 0
+        self.regex_shed = 0
+        self.regex_max_strikes = 3
+        self.regex_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="automod-regex")
+        self.adaptive_slowmode = {}
+        self.channel_rates = {}
+        # channel_id -> slowmode delay the bot last applied, persisted across restarts
+        self.slowmode_applied = {}
+        # Slowmode edits, raid lockdowns and enforcement (deletes, timeouts, warnings) run
+        # outside the message pipeline; keep a reference until each one finishes
+        self.background_tasks = set()
+        self.raid_guilds = set()
+        self.raid_states = defaultdict(RaidState)
 
         # Fixed URL pattern - removed unnecessary escaping
         self.url_pattern = re.compile(
@@ -22,9 +281,6 @@ class Automod(commands.Cog):
             re.IGNORECASE
         )
 
-        # Use asyncio.create_task properly
-        asyncio.create_task(self.init_db())
-
     async def init_db(self):
         """Initialize the automod database"""
         try:
@@ -54,52 +310,136 @@ class Automod(commands.Cog):
                         PRIMARY KEY (guild_id, channel_id)
                     )
                 ''')
+
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS banned_words (
+                        guild_id INTEGER,
+                        word TEXT,
+                        PRIMARY KEY (guild_id, word)
+                    )
+                ''')
+
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS raid_settings (
+                        guild_id INTEGER PRIMARY KEY
+                    )
+                ''')
+
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS slowmode_settings (
+                        guild_id INTEGER PRIMARY KEY,
+                        max_delay INTEGER DEFAULT 30
+                    )
+                ''')
+
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS slowmode_channels (
+                        channel_id INTEGER PRIMARY KEY,
+                        guild_id INTEGER,
+                        delay INTEGER
+                    )
+                ''')
+
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS regex_rules (
+                        rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        guild_id INTEGER,
+                        pattern TEXT,
+                        enabled INTEGER DEFAULT 1
+                    )
+                ''')
                 
                 await db.commit()
+
+                cursor = await db.execute('SELECT guild_id, antilink_enabled, antispam_enabled FROM automod_settings')
+                for guild_id, antilink, antispam in await cursor.fetchall():
+                    self.settings[guild_id] = {'antilink': bool(antilink), 'antispam': bool(antispam)}
+
+                cursor = await db.execute('SELECT guild_id, user_id FROM bypass_users')
+                for guild_id, user_id in await cursor.fetchall():
+                    self.bypass_users[guild_id].add(user_id)
+
+                cursor = await db.execute('SELECT guild_id, channel_id FROM bypass_channels')
+                for guild_id, channel_id in await cursor.fetchall():
+                    self.bypass_channels[guild_id].add(channel_id)
+
+                cursor = await db.execute('SELECT guild_id, word FROM banned_words')
+                for guild_id, word in await cursor.fetchall():
+                    self.banned_words[guild_id].add(word)
+
+                cursor = await db.execute('SELECT rule_id, guild_id, pattern, enabled FROM regex_rules')
+                for rule_id, guild_id, pattern, enabled in await cursor.fetchall():
+                    try:
+                        self.regex_rules[guild_id][rule_id] = RegexRule(rule_id, pattern, bool(enabled))
+                    except regex.error as e:
+                        print(f"Skipping invalid regex rule {rule_id}: {e}")
+
+                cursor = await db.execute('SELECT guild_id, max_delay FROM slowmode_settings')
+                for guild_id, max_delay in await cursor.fetchall():
+                    self.adaptive_slowmode[guild_id] = max_delay
+
+                cursor = await db.execute('SELECT channel_id, delay FROM slowmode_channels')
+                self.slowmode_applied = dict(await cursor.fetchall())
+
+                cursor = await db.execute('SELECT guild_id FROM raid_settings')
+                self.raid_guilds.update(guild_id for (guild_id,) in await cursor.fetchall())
         except Exception as e:
             print(f"Database initialization error: {e}")
 
     async def get_automod_settings(self, guild_id):
         """Get automod settings for a guild"""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    'SELECT antilink_enabled, antispam_enabled FROM automod_settings WHERE guild_id = ?',
-                    (guild_id,)
-                )
-                result = await cursor.fetchone()
-                if result:
-                    return {'antilink': bool(result[0]), 'antispam': bool(result[1])}
-                return {'antilink': False, 'antispam': False}
-        except Exception as e:
-            print(f"Error getting automod settings: {e}")
-            return {'antilink': False, 'antispam': False}
+        return dict(self.settings.get(guild_id, {'antilink': False, 'antispam': False}))
 
-    async def is_bypass_user(self, guild_id, user_id):
+    def set_automod_setting(self, guild_id, feature, enabled):
+        settings = self.settings.setdefault(guild_id, {'antilink': False, 'antispam': False})
+        settings[feature] = enabled
+
+    def is_bypass_user(self, guild_id, user_id):
         """Check if user is in bypass list"""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    'SELECT 1 FROM bypass_users WHERE guild_id = ? AND user_id = ?',
-                    (guild_id, user_id)
-                )
-                return await cursor.fetchone() is not None
-        except Exception as e:
-            print(f"Error checking bypass user: {e}")
-            return False
+        return user_id in self.bypass_users.get(guild_id, ())
 
-    async def is_bypass_channel(self, guild_id, channel_id):
+    def is_bypass_channel(self, guild_id, channel_id):
         """Check if channel is in bypass list"""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute(
-                    'SELECT 1 FROM bypass_channels WHERE guild_id = ? AND channel_id = ?',
-                    (guild_id, channel_id)
-                )
-                return await cursor.fetchone() is not None
-        except Exception as e:
-            print(f"Error checking bypass channel: {e}")
-            return False
+        return channel_id in self.bypass_channels.get(guild_id, ())
+
+    def automod_flags(self, msg):
+        """Message pipeline fact: the guild's automod settings, or None if nothing applies"""
+        guild_id = msg.guild_id
+        settings = self.settings.get(guild_id)
+        active = (
+            (settings and (settings['antilink'] or settings['antispam']))
+            or self.banned_words.get(guild_id)
+            or self.regex_rules.get(guild_id)
+            or guild_id in self.adaptive_slowmode
+            or guild_id in self.raid_guilds
+        )
+        if not active or self.is_bypass_channel(guild_id, msg.channel_id):
+            return None
+        return settings or {'antilink': False, 'antispam': False}
+
+    async def cog_load(self):
+        await self.init_db()
+        self.client.pipeline.provide('automod', self.automod_flags)
+        self.client.pipeline.register('automod', self.check_message, check=lambda msg: msg.fact('automod'), priority=10)
+        self.slowmode_decay.start()
+        self.raid_worker.start()
+
+    def cog_unload(self):
+        self.client.pipeline.unregister('automod')
+        self.client.pipeline.remove_provider('automod')
+        self.slowmode_decay.cancel()
+        self.raid_worker.cancel()
+        for task in self.background_tasks:
+            task.cancel()
+        self.regex_executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_word_filter(self, guild_id):
+        """Get the compiled word filter for a guild, building it on first use"""
+        word_filter = self.word_filters.get(guild_id)
+        if word_filter is None and self.banned_words.get(guild_id):
+            word_filter = WordFilter(self.banned_words[guild_id])
+            self.word_filters[guild_id] = word_filter
+        return word_filter
 
     async def can_timeout_user(self, guild, user, bot_member):
         """Check if bot can timeout the user"""
@@ -113,39 +453,377 @@ class Automod(commands.Cog):
             return False
         return True
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Main automod message listener"""
-        # Skip bots and DMs
-        if message.author.bot or not message.guild:
-            return
+    async def check_message(self, msg):
+        """Automod message pipeline stage; returns True if the message will be removed
 
-        guild_id = message.guild.id
-        user_id = message.author.id
-        channel_id = message.channel.id
+        Commands wait for this stage, so it only decides. Deleting, timing out
+        and warning run as background tasks.
+        """
+        message = msg.message
+        settings = msg.fact('automod')
+        guild_id = msg.guild_id
 
-        # Check if channel is bypassed
-        if await self.is_bypass_channel(guild_id, channel_id):
-            return
+        # Track channel message rate for adaptive slowmode
+        if guild_id in self.adaptive_slowmode:
+            self.track_channel_rate(message.channel, self.adaptive_slowmode[guild_id])
+
+        # Update guild-wide raid counters
+        raid_state = None
+        if guild_id in self.raid_guilds:
+            raid_state = self.track_raid_message(message)
 
         # Check if user is bypassed
-        if await self.is_bypass_user(guild_id, user_id):
-            return
+        if self.is_bypass_user(guild_id, msg.author_id):
+            return False
 
-        # Get settings and bot member
-        settings = await self.get_automod_settings(guild_id)
-        bot_member = message.guild.get_member(self.client.user.id)
-        
+        if raid_state and self.handle_raid_message(message, raid_state):
+            return True
+
+        bot_member = message.guild.me
         if not bot_member:
-            return
+            return False
 
         # Check for links if antilink is enabled
         if settings['antilink'] and self.url_pattern.search(message.content):
-            await self.handle_link_violation(message, bot_member)
+            self.run_background(self.handle_link_violation(message, bot_member))
+            return True
 
         # Check for spam if antispam is enabled
-        if settings['antispam']:
-            await self.handle_spam_check(message, bot_member)
+        if settings['antispam'] and self.is_spam(message):
+            self.run_background(self.handle_spam_violation(message, bot_member))
+            return True
+
+        # Check banned words and phrases
+        word_filter = self.get_word_filter(guild_id)
+        if word_filter and message.content and word_filter.find(message.content):
+            self.run_background(self.handle_word_violation(message))
+            return True
+
+        # Run custom regex rules off the event loop
+        rules = [rule for rule in self.regex_rules.get(guild_id, {}).values() if rule.enabled]
+        if rules and message.content:
+            rule = await self.check_regex_rules(guild_id, rules, message.content)
+            if rule:
+                self.run_background(self.handle_word_violation(message, "Blocked Content"))
+                return True
+
+        return False
+
+    def track_channel_rate(self, channel, max_delay):
+        """Update a channel's message rate and step its slowmode if needed"""
+        now = time.monotonic()
+        state = self.channel_rates.get(channel.id)
+        if state is None:
+            state = self.channel_rates[channel.id] = ChannelRate(
+                now, getattr(channel, 'slowmode_delay', 0), self.slowmode_applied.get(channel.id)
+            )
+        state.hit(now)
+        self.maybe_step_slowmode(channel, state, max_delay, now)
+
+    def maybe_step_slowmode(self, channel, state, max_delay, now):
+        if state.pending or now - state.changed < SLOWMODE_MIN_INTERVAL:
+            return
+
+        current = getattr(channel, 'slowmode_delay', 0)
+        if state.manual or current != state.applied:
+            # A moderator changed the slowmode; resume only once it is cleared
+            state.manual = current != 0
+            state.level = 0
+            state.applied = current
+            if channel.id in self.slowmode_applied:
+                self.run_background(self.save_slowmode_state(channel, 0))
+            return
+
+        max_level = max(i for i, delay in enumerate(SLOWMODE_STEPS) if delay <= max_delay)
+        level = state.target_level(max_level)
+        if level != state.level:
+            state.pending = True
+            self.run_background(self.apply_slowmode(channel, state, level))
+
+    def run_background(self, coro):
+        task = asyncio.create_task(coro)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_done)
+        return task
+
+    def background_done(self, task):
+        self.background_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            print(f"Error in automod background task: {task.exception()}")
+
+    async def apply_slowmode(self, channel, state, level):
+        delay = SLOWMODE_STEPS[level]
+        try:
+            await channel.edit(slowmode_delay=delay, reason=f"Adaptive slowmode ({state.rate:.1f} msgs/s)")
+            state.level = level
+            state.applied = delay
+            await self.save_slowmode_state(channel, delay)
+        except discord.Forbidden:
+            pass
+        except Exception as e:
+            print(f"Error applying adaptive slowmode: {e}")
+        finally:
+            state.changed = time.monotonic()
+            state.pending = False
+
+    async def save_slowmode_state(self, channel, delay):
+        """Remember the delay the bot applied to a channel; 0 forgets it"""
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                if delay:
+                    self.slowmode_applied[channel.id] = delay
+                    await db.execute(
+                        'INSERT OR REPLACE INTO slowmode_channels (channel_id, guild_id, delay) VALUES (?, ?, ?)',
+                        (channel.id, channel.guild.id, delay)
+                    )
+                else:
+                    self.slowmode_applied.pop(channel.id, None)
+                    await db.execute('DELETE FROM slowmode_channels WHERE channel_id = ?', (channel.id,))
+                await db.commit()
+        except Exception as e:
+            print(f"Error saving adaptive slowmode state: {e}")
+
+    @tasks.loop(seconds=30)
+    async def slowmode_decay(self):
+        """Step slowmode back down in channels that went quiet"""
+        now = time.monotonic()
+        # Channels throttled before a restart step down even if nobody writes in them
+        for channel_id, delay in list(self.slowmode_applied.items()):
+            channel = self.client.get_channel(channel_id)
+            if channel_id not in self.channel_rates and channel is not None and channel.guild.id in self.adaptive_slowmode:
+                self.channel_rates[channel_id] = ChannelRate(now, getattr(channel, 'slowmode_delay', 0), delay)
+        for channel_id, state in list(self.channel_rates.items()):
+            channel = self.client.get_channel(channel_id)
+            max_delay = self.adaptive_slowmode.get(getattr(getattr(channel, 'guild', None), 'id', None))
+            if channel is None or max_delay is None:
+                del self.channel_rates[channel_id]
+                continue
+
+            state.decay(now)
+            if state.level:
+                self.maybe_step_slowmode(channel, state, max_delay, now)
+            elif state.rate < 0.01 and not state.pending:
+                # Idle and unthrottled: nothing worth remembering
+                del self.channel_rates[channel_id]
+
+    @slowmode_decay.before_loop
+    async def before_slowmode_decay(self):
+        await self.client.wait_until_ready()
+
+    def track_raid_message(self, message):
+        """Count mentions and new-account messages for the guild"""
+        now = time.monotonic()
+        state = self.raid_states[message.guild.id]
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions)
+        if message.mention_everyone:
+            # @everyone pings weigh as much as a large mention spam
+            mentions += MASS_MENTION_LIMIT
+        if mentions:
+            state.mentions.add(now, mentions)
+        if discord.utils.utcnow() - message.author.created_at < NEW_ACCOUNT_AGE:
+            state.new_account_messages.add(now)
+
+        if not state.in_raid(now):
+            reason = state.check_burst(now)
+            if reason:
+                state.raid_until = now + RAID_DURATION
+                self.run_background(self.start_raid(message.guild, reason, message.channel))
+        return state
+
+    def handle_raid_message(self, message, state):
+        """Punish mass mentions and new-account spam; returns True if the message will be removed"""
+        mentions = len(set(message.raw_mentions)) + len(set(message.raw_role_mentions))
+        mass_mention = mentions >= MASS_MENTION_LIMIT or (message.mention_everyone and mentions >= MASS_MENTION_LIMIT // 2)
+        raid_spam = state.in_raid(time.monotonic()) and discord.utils.utcnow() - message.author.created_at < NEW_ACCOUNT_AGE
+        if not (mass_mention or raid_spam):
+            return False
+
+        state.pending_timeouts[message.author.id] = message.author
+        self.run_background(self.delete_raid_message(message))
+        return True
+
+    async def delete_raid_message(self, message):
+        try:
+            await message.delete()
+        except (discord.NotFound, discord.Forbidden):
+            pass
+        except Exception as e:
+            print(f"Error deleting raid message: {e}")
+
+    async def start_raid(self, guild, reason, channel=None):
+        """Switch a guild into raid mode and lock @everyone out of sending"""
+        state = self.raid_states[guild.id]
+        state.raid_until = time.monotonic() + RAID_DURATION
+        state.reason = reason
+        state.actioned = 0
+
+        everyone = guild.default_role
+        if state.locked_permissions is None and everyone.permissions.send_messages:
+            # One role edit locks every channel that relies on @everyone
+            permissions = discord.Permissions(everyone.permissions.value)
+            permissions.update(send_messages=False, send_messages_in_threads=False)
+            try:
+                await everyone.edit(permissions=permissions, reason=f"Raid mode: {reason}")
+                state.locked_permissions = (everyone.permissions.value, permissions.value)
+            except discord.HTTPException as e:
+                print(f"Error locking guild {guild.id} for raid: {e}")
+
+        channel = channel or guild.system_channel
+        if channel:
+            embed = discord.Embed(
+                title="<:ByteStrik_Warning:1384843852577247254> Raid Mode Enabled",
+                description=f"Raid detected (**{reason}**). Members without a role that allows sending are locked, "
+                            f"new accounts are being removed and offenders timed out.\n"
+                            f"Raid mode ends automatically after {RAID_DURATION // 60} quiet minutes, or use `automod raid end`.",
+                color=0xff0000
+            )
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+
+    async def end_raid(self, guild, state):
+        """Leave raid mode and restore @everyone permissions"""
+        state.raid_until = 0.0
+        state.pending_timeouts.clear()
+        state.pending_kicks.clear()
+        if state.locked_permissions is not None:
+            original, locked = state.locked_permissions
+            state.locked_permissions = None
+            everyone = guild.default_role
+            # Only restore if nobody changed the role while we were locked
+            if everyone.permissions.value == locked:
+                try:
+                    await everyone.edit(permissions=discord.Permissions(original), reason="Raid mode ended")
+                except discord.HTTPException as e:
+                    print(f"Error unlocking guild {guild.id} after raid: {e}")
+
+    async def apply_raid_actions(self, guild, state):
+        """Apply queued timeouts and kicks in small concurrent batches"""
+        bot_member = guild.me
+        timeout_until = discord.utils.utcnow() + timedelta(seconds=RAID_DURATION)
+
+        async def timeout(member):
+            if await self.can_timeout_user(guild, member, bot_member):
+                await member.timeout(timeout_until, reason=f"Raid mode: {state.reason}")
+
+        async def kick(member):
+            await member.kick(reason=f"Raid mode: new account joined during {state.reason}")
+
+        batch = []
+        for pending, action in ((state.pending_kicks, kick), (state.pending_timeouts, timeout)):
+            while pending and len(batch) < RAID_BATCH_SIZE:
+                _, member = pending.popitem()
+                batch.append(action(member))
+
+        results = await asyncio.gather(*batch, return_exceptions=True)
+        state.actioned += sum(1 for result in results if not isinstance(result, Exception))
+
+    @tasks.loop(seconds=2)
+    async def raid_worker(self):
+        """Flush batched raid actions and end raids that have calmed down"""
+        now = time.monotonic()
+        for guild_id, state in list(self.raid_states.items()):
+            guild = self.client.get_guild(guild_id)
+            if guild is None or guild_id not in self.raid_guilds:
+                if guild is not None and state.locked_permissions is not None:
+                    await self.end_raid(guild, state)
+                del self.raid_states[guild_id]
+                continue
+
+            if state.pending_timeouts or state.pending_kicks:
+                await self.apply_raid_actions(guild, state)
+
+            if state.in_raid(now):
+                # Keep the raid going while bursts continue
+                if state.check_burst(now):
+                    state.raid_until = now + RAID_DURATION
+            elif state.raid_until:
+                await self.end_raid(guild, state)
+
+    @raid_worker.before_loop
+    async def before_raid_worker(self):
+        await self.client.wait_until_ready()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        """Count joins and gate new accounts during a raid"""
+        if member.guild.id not in self.raid_guilds:
+            return
+
+        now = time.monotonic()
+        state = self.raid_states[member.guild.id]
+        state.joins.add(now)
+
+        if not state.in_raid(now):
+            reason = state.check_burst(now)
+            if not reason:
+                return
+            state.raid_until = now + RAID_DURATION
+            self.run_background(self.start_raid(member.guild, reason))
+
+        if not member.bot and discord.utils.utcnow() - member.created_at < NEW_ACCOUNT_AGE:
+            state.pending_kicks[member.id] = member
+
+    async def check_regex_rules(self, guild_id, rules, content):
+        """Run regex rules in the worker pool and record per-rule CPU time"""
+        if self.regex_queued >= self.regex_max_queued:
+            # The pool is backed up; skip regex rules rather than fall further behind
+            self.regex_shed += 1
+            return None
+
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + self.regex_budget
+        self.regex_queued += 1
+        try:
+            matched, results = await loop.run_in_executor(
+                self.regex_executor, run_regex_rules, rules, content, self.regex_timeout, deadline
+            )
+        finally:
+            self.regex_queued -= 1
+
+        for rule, cpu_time, timed_out in results:
+            rule.runs += 1
+            rule.cpu_time += cpu_time
+            rule.max_cpu_time = max(rule.max_cpu_time, cpu_time)
+            if not timed_out:
+                rule.strikes = 0
+                continue
+
+            rule.timeouts += 1
+            rule.strikes += 1
+            if rule.enabled and rule.strikes >= self.regex_max_strikes:
+                rule.enabled = False
+                print(f"Disabled regex rule {rule.rule_id} in guild {guild_id} after {rule.strikes} timeouts")
+                try:
+                    async with aiosqlite.connect(self.db_path) as db:
+                        await db.execute('UPDATE regex_rules SET enabled = 0 WHERE rule_id = ?', (rule.rule_id,))
+                        await db.commit()
+                except Exception as e:
+                    print(f"Error disabling regex rule: {e}")
+
+        return matched
+
+    async def handle_word_violation(self, message, title="Blocked Word"):
+        """Handle banned word or regex rule violation"""
+        try:
+            await message.delete()
+
+            embed = discord.Embed(
+                title=f"<:ByteStrik_Warning:1384843852577247254> {title}",
+                description=f"{message.author.mention}, your message contained content that is not allowed in this server.",
+                color=0x010505
+            )
+            await message.channel.send(embed=embed, delete_after=10)
+
+        except discord.NotFound:
+            # Message was already deleted
+            pass
+        except discord.Forbidden:
+            # Bot lacks permissions to delete message
+            pass
+        except Exception as e:
+            print(f"Error handling word violation: {e}")
 
     async def handle_link_violation(self, message, bot_member):
         """Handle link violation"""
@@ -196,8 +874,8 @@ class Automod(commands.Cog):
         except Exception as e:
             print(f"Error handling link violation: {e}")
 
-    async def handle_spam_check(self, message, bot_member):
-        """Handle spam detection"""
+    def is_spam(self, message):
+        """Record the message and return True if the user was caught spamming"""
         user_id = message.author.id
         current_time = datetime.now()
         
@@ -209,58 +887,60 @@ class Automod(commands.Cog):
             msg_time for msg_time in self.user_messages[user_id]
             if (current_time - msg_time).total_seconds() <= self.spam_time_window
         ]
-        
-        # If spam threshold exceeded
-        if len(recent_messages) >= self.spam_threshold:
-            try:
-                # Delete the triggering message
-                await message.delete()
-                
-                # Check if we can timeout the user
-                if await self.can_timeout_user(message.guild, message.author, bot_member):
-                    timeout_until = discord.utils.utcnow() + timedelta(minutes=10)
-                    try:
-                        await message.author.timeout(timeout_until, reason="Anti-spam violation")
-                        
-                        embed = discord.Embed(
-                            title="<:ByteStrik_Warning:1384843852577247254> Spam Detected",
-                            description=f"{message.author.mention} has been timed out for spamming.",
-                            color=0x010505
-                        )
-                    except discord.Forbidden:
-                        embed = discord.Embed(
-                            title="<:ByteStrik_Warning:1384843852577247254> Spam Warning",
-                            description=f"{message.author.mention}, please slow down your messages. (Unable to timeout - insufficient permissions)",
-                            color=0x010505
-                        )
-                else:
+        if len(recent_messages) < self.spam_threshold:
+            return False
+        # Start counting again, so messages sent while this one is punished do not trigger again
+        self.user_messages[user_id].clear()
+        return True
+
+    async def handle_spam_violation(self, message, bot_member):
+        """Delete the triggering message and time out or warn the spammer"""
+        try:
+            # Delete the triggering message
+            await message.delete()
+            
+            # Check if we can timeout the user
+            if await self.can_timeout_user(message.guild, message.author, bot_member):
+                timeout_until = discord.utils.utcnow() + timedelta(minutes=10)
+                try:
+                    await message.author.timeout(timeout_until, reason="Anti-spam violation")
+                    
                     embed = discord.Embed(
-                        title="<:ByteStrik_Warning:1384843852577247254> Spam Warning",
-                        description=f"{message.author.mention}, please slow down your messages.",
+                        title="<:ByteStrik_Warning:1384843852577247254> Spam Detected",
+                        description=f"{message.author.mention} has been timed out for spamming.",
                         color=0x010505
                     )
-                
-                await message.channel.send(embed=embed, delete_after=10)
-                # Clear user's message history after spam detection
-                self.user_messages[user_id].clear()
-                
-            except discord.NotFound:
-                # Message was already deleted
-                pass
-            except discord.Forbidden:
-                # Bot lacks permissions to delete message
-                try:
+                except discord.Forbidden:
                     embed = discord.Embed(
                         title="<:ByteStrik_Warning:1384843852577247254> Spam Warning",
-                        description=f"{message.author.mention}, please slow down your messages. (Unable to delete - insufficient permissions)",
+                        description=f"{message.author.mention}, please slow down your messages. (Unable to timeout - insufficient permissions)",
                         color=0x010505
                     )
-                    await message.channel.send(embed=embed, delete_after=10)
-                    self.user_messages[user_id].clear()
-                except:
-                    pass
-            except Exception as e:
-                print(f"Error handling spam check: {e}")
+            else:
+                embed = discord.Embed(
+                    title="<:ByteStrik_Warning:1384843852577247254> Spam Warning",
+                    description=f"{message.author.mention}, please slow down your messages.",
+                    color=0x010505
+                )
+            
+            await message.channel.send(embed=embed, delete_after=10)
+            
+        except discord.NotFound:
+            # Message was already deleted
+            pass
+        except discord.Forbidden:
+            # Bot lacks permissions to delete message
+            try:
+                embed = discord.Embed(
+                    title="<:ByteStrik_Warning:1384843852577247254> Spam Warning",
+                    description=f"{message.author.mention}, please slow down your messages. (Unable to delete - insufficient permissions)",
+                    color=0x010505
+                )
+                await message.channel.send(embed=embed, delete_after=10)
+            except:
+                pass
+        except Exception as e:
+            print(f"Error handling spam check: {e}")
 
     @commands.group(name='antilink', invoke_without_command=True)
     @commands.has_permissions(manage_guild=True)
@@ -292,6 +972,8 @@ class Automod(commands.Cog):
                     VALUES (?, 1, COALESCE((SELECT antispam_enabled FROM automod_settings WHERE guild_id = ?), 0))
                 ''', (ctx.guild.id, ctx.guild.id))
                 await db.commit()
+
+            self.set_automod_setting(ctx.guild.id, 'antilink', True)
             
             embed = discord.Embed(
                 title="<a:flingo_tick:1385161850668449843> Anti-Link Enabled",
@@ -319,6 +1001,8 @@ class Automod(commands.Cog):
                     VALUES (?, 0, COALESCE((SELECT antispam_enabled FROM automod_settings WHERE guild_id = ?), 0))
                 ''', (ctx.guild.id, ctx.guild.id))
                 await db.commit()
+
+            self.set_automod_setting(ctx.guild.id, 'antilink', False)
             
             embed = discord.Embed(
                 title="<a:flingo_cross:1385161874437312594> Anti-Link Disabled",
@@ -370,6 +1054,8 @@ class Automod(commands.Cog):
                     VALUES (?, COALESCE((SELECT antilink_enabled FROM automod_settings WHERE guild_id = ?), 0), 1)
                 ''', (ctx.guild.id, ctx.guild.id))
                 await db.commit()
+
+            self.set_automod_setting(ctx.guild.id, 'antispam', True)
             
             embed = discord.Embed(
                 title="<a:flingo_tick:1385161850668449843> Anti-Spam Enabled",
@@ -397,6 +1083,8 @@ class Automod(commands.Cog):
                     VALUES (?, COALESCE((SELECT antilink_enabled FROM automod_settings WHERE guild_id = ?), 0), 0)
                 ''', (ctx.guild.id, ctx.guild.id))
                 await db.commit()
+
+            self.set_automod_setting(ctx.guild.id, 'antispam', False)
             
             embed = discord.Embed(
                 title="<a:flingo_cross:1385161874437312594> Anti-Spam Disabled",
@@ -475,6 +1163,7 @@ class Automod(commands.Cog):
                         (ctx.guild.id, user.id)
                     )
                     await db.commit()
+                    self.bypass_users[ctx.guild.id].add(user.id)
                     
                     embed = discord.Embed(
                         title="<a:flingo_tick:1385161850668449843> User Added to Bypass",
@@ -509,6 +1198,7 @@ class Automod(commands.Cog):
                     (ctx.guild.id, user.id)
                 )
                 await db.commit()
+                self.bypass_users[ctx.guild.id].discard(user.id)
                 
                 if cursor.rowcount > 0:
                     embed = discord.Embed(
@@ -596,6 +1286,7 @@ class Automod(commands.Cog):
                         (ctx.guild.id, channel.id)
                     )
                     await db.commit()
+                    self.bypass_channels[ctx.guild.id].add(channel.id)
                     
                     embed = discord.Embed(
                         title="<a:flingo_tick:1385161850668449843> Channel Added to Bypass",
@@ -633,6 +1324,7 @@ class Automod(commands.Cog):
                     (ctx.guild.id, channel.id)
                 )
                 await db.commit()
+                self.bypass_channels[ctx.guild.id].discard(channel.id)
                 
                 if cursor.rowcount > 0:
                     embed = discord.Embed(
@@ -657,7 +1349,7 @@ class Automod(commands.Cog):
             await ctx.send(embed=embed)
             print(f"Error removing bypass channel: {e}")
 
-    @commands.command(name='automod')
+    @commands.group(name='automod', invoke_without_command=True)
     @commands.has_permissions(manage_guild=True)
     async def automod_dashboard(self, ctx):
         """Main automod dashboard showing all settings and features"""
@@ -723,28 +1415,593 @@ class Automod(commands.Cog):
             )
             
             embed.add_field(
-                name="<:system:1384849012993032273> Quick Actions",
-                value="• `antilink enable/disable`\n• `antispam enable/disable`\n• `automodbypassuser add/remove`\n• `automodbypasschannel add/remove`",
+                name="<:Notepad:1384842987330211850> Word Filter",
+                value=f"**Words:** {len(self.banned_words.get(ctx.guild.id, ()))}\n**Command:** `automod words`",
                 inline=True
             )
 
-            embed.set_footer(
-                text="💡 Tip: Use individual commands for detailed management | Requires Manage Server permission"
+            embed.add_field(
+                name="<:Notepad:1384842987330211850> Regex Rules",
+                value=f"**Rules:** {len(self.regex_rules.get(ctx.guild.id, ()))}\n**Command:** `automod regex`",
+                inline=True
             )
 
-            if ctx.guild.icon:
-                embed.set_thumbnail(url=ctx.guild.icon.url)
-            
-            await ctx.send(embed=embed)
-        except Exception as e:
-            embed = discord.Embed(
-                title="<a:flingo_cross:1385161874437312594> Error",
-                description="Failed to load automod dashboard. Please try again.",
-                color=0xff0000
-            )
-            await ctx.send(embed=embed)
+            slowmode_max = self.adaptive_slowmode.get(ctx.guild.id)
+            slowmode_status = f"<a:flingo_tick:1385161850668449843> Enabled (max {slowmode_max}s)" if slowmode_max else "<a:flingo_cross:1385161874437312594> Disabled"
+            raid_state = self.raid_states.get(ctx.guild.id)
+            if ctx.guild.id not in self.raid_guilds:
+                raid_status = "<a:flingo_cross:1385161874437312594> Disabled"
+            elif raid_state and raid_state.in_raid(time.monotonic()):
+                raid_status = "<:ByteStrik_Warning:1384843852577247254> Raid mode active"
+            else:
+                raid_status = "<a:flingo_tick:1385161850668449843> Enabled"
+            embed.add_field(
+                name="<:Antinuke:1381499536949907488> Raid Protection",
+                value=f"**Status:** {raid_status}\n**Command:** `automod raid`",
+                inline=True
+            )
+
+            embed.add_field(
+                name="<:GettoClock:1384851204772986890> Adaptive Slowmode",
+                value=f"**Status:** {slowmode_status}\n**Command:** `automod slowmode`",
+                inline=True
+            )
+
+            embed.add_field(
+                name="<:system:1384849012993032273> Quick Actions",
+                value="• `antilink enable/disable`\n• `antispam enable/disable`\n• `automodbypassuser add/remove`\n• `automodbypasschannel add/remove`\n• `automod words add/remove/list`\n• `automod regex add/remove/list`\n• `automod slowmode enable/disable`\n• `automod raid enable/disable`",
+                inline=True
+            )
+
+            embed.set_footer(
+                text="💡 Tip: Use individual commands for detailed management | Requires Manage Server permission"
+            )
+
+            if ctx.guild.icon:
+                embed.set_thumbnail(url=ctx.guild.icon.url)
+            
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to load automod dashboard. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
             print(f"Error loading automod dashboard: {e}")
 
+    @automod_dashboard.group(name='words', invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_words(self, ctx):
+        """Manage banned words and phrases"""
+        embed = discord.Embed(
+            title="Automod Word Filter",
+            description=f"**Banned words:** {len(self.banned_words.get(ctx.guild.id, ()))}/{self.max_banned_words}",
+            color=0x010505
+        )
+        embed.add_field(
+            name="Commands",
+            value="`automod words add <word or phrase>` - Ban a word or phrase\n`automod words remove <word or phrase>` - Unban a word or phrase\n`automod words list` - Show banned words",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @automod_words.command(name='add')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_words_add(self, ctx, *, phrase: str):
+        """Add a word or phrase to the word filter"""
+        word = normalize_text(phrase)
+        if not word:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Invalid Word",
+                description="The word must contain at least one letter or number.",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        words = self.banned_words[ctx.guild.id]
+        if word in words:
+            embed = discord.Embed(
+                title="<:ByteStrik_Warning:1384843852577247254> Word Already Banned",
+                description=f"`{word}` is already in the word filter.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        if len(words) >= self.max_banned_words:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Word Limit Reached",
+                description=f"This server already has {self.max_banned_words} banned words.",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute(
+                    'INSERT OR IGNORE INTO banned_words (guild_id, word) VALUES (?, ?)',
+                    (ctx.guild.id, word)
+                )
+                await db.commit()
+
+            words.add(word)
+            self.word_filters.pop(ctx.guild.id, None)
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Word Added",
+                description=f"`{word}` has been added to the word filter.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to add word to the filter. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error adding banned word: {e}")
+
+    @automod_words.command(name='remove')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_words_remove(self, ctx, *, phrase: str):
+        """Remove a word or phrase from the word filter"""
+        word = normalize_text(phrase)
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                cursor = await db.execute(
+                    'DELETE FROM banned_words WHERE guild_id = ? AND word = ?',
+                    (ctx.guild.id, word)
+                )
+                await db.commit()
+
+            if cursor.rowcount > 0:
+                self.banned_words[ctx.guild.id].discard(word)
+                self.word_filters.pop(ctx.guild.id, None)
+                embed = discord.Embed(
+                    title="<a:flingo_tick:1385161850668449843> Word Removed",
+                    description=f"`{word}` has been removed from the word filter.",
+                    color=0x010505
+                )
+            else:
+                embed = discord.Embed(
+                    title="<:ByteStrik_Warning:1384843852577247254> Word Not Banned",
+                    description=f"`{word}` was not in the word filter.",
+                    color=0x010505
+                )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to remove word from the filter. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error removing banned word: {e}")
+
+    @automod_words.command(name='list')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_words_list(self, ctx):
+        """List banned words and phrases"""
+        words = sorted(self.banned_words.get(ctx.guild.id, ()))
+        if not words:
+            embed = discord.Embed(
+                title="Automod Word Filter",
+                description="No words are currently banned.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        lines = []
+        length = 0
+        for word in words:
+            line = f"• `{word}`"
+            if length + len(line) > 3900:
+                lines.append(f"...and {len(words) - len(lines)} more")
+                break
+            lines.append(line)
+            length += len(line) + 1
+
+        embed = discord.Embed(
+            title=f"Automod Word Filter ({len(words)} words)",
+            description="\n".join(lines),
+            color=0x010505
+        )
+        await ctx.send(embed=embed)
+
+    @automod_dashboard.group(name='regex', invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_regex(self, ctx):
+        """Manage custom regex rules"""
+        embed = discord.Embed(
+            title="Automod Regex Rules",
+            description=f"**Rules:** {len(self.regex_rules.get(ctx.guild.id, ()))}/{self.max_regex_rules}\n"
+                        f"Rules taking longer than {int(self.regex_timeout * 1000)}ms are stopped, and rules that time out "
+                        f"{self.regex_max_strikes} times in a row are disabled automatically. Each message gets at most "
+                        f"{int(self.regex_budget * 1000)}ms of rule time in total, and messages skip regex rules while "
+                        f"the checks are backed up (**{self.regex_shed}** skipped so far).",
+            color=0x010505
+        )
+        embed.add_field(
+            name="Commands",
+            value="`automod regex add <pattern>` - Add a regex rule\n`automod regex remove <id>` - Remove a regex rule\n`automod regex enable <id>` - Re-enable a disabled rule\n`automod regex list` - Show rules and their cost",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @automod_regex.command(name='add')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_regex_add(self, ctx, *, pattern: str):
+        """Add a custom regex rule"""
+        rules = self.regex_rules[ctx.guild.id]
+        if len(rules) >= self.max_regex_rules:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Rule Limit Reached",
+                description=f"This server already has {self.max_regex_rules} regex rules.",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        if len(pattern) > self.max_regex_length:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Pattern Too Long",
+                description=f"Regex patterns can be at most {self.max_regex_length} characters.",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            regex.compile(pattern)
+        except regex.error as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Invalid Pattern",
+                description=f"`{e}`",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                cursor = await db.execute(
+                    'INSERT INTO regex_rules (guild_id, pattern, enabled) VALUES (?, ?, 1)',
+                    (ctx.guild.id, pattern)
+                )
+                await db.commit()
+                rule_id = cursor.lastrowid
+
+            rules[rule_id] = RegexRule(rule_id, pattern)
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Regex Rule Added",
+                description=f"Rule `#{rule_id}` has been added: `{pattern}`",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to add regex rule. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error adding regex rule: {e}")
+
+    @automod_regex.command(name='remove')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_regex_remove(self, ctx, rule_id: int):
+        """Remove a custom regex rule"""
+        if rule_id not in self.regex_rules.get(ctx.guild.id, {}):
+            embed = discord.Embed(
+                title="<:ByteStrik_Warning:1384843852577247254> Rule Not Found",
+                description=f"There is no regex rule `#{rule_id}` in this server.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute(
+                    'DELETE FROM regex_rules WHERE guild_id = ? AND rule_id = ?',
+                    (ctx.guild.id, rule_id)
+                )
+                await db.commit()
+
+            del self.regex_rules[ctx.guild.id][rule_id]
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Regex Rule Removed",
+                description=f"Rule `#{rule_id}` has been removed.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to remove regex rule. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error removing regex rule: {e}")
+
+    @automod_regex.command(name='enable')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_regex_enable(self, ctx, rule_id: int):
+        """Re-enable a regex rule that was disabled"""
+        rule = self.regex_rules.get(ctx.guild.id, {}).get(rule_id)
+        if rule is None:
+            embed = discord.Embed(
+                title="<:ByteStrik_Warning:1384843852577247254> Rule Not Found",
+                description=f"There is no regex rule `#{rule_id}` in this server.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute('UPDATE regex_rules SET enabled = 1 WHERE rule_id = ?', (rule_id,))
+                await db.commit()
+
+            rule.enabled = True
+            rule.strikes = 0
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Regex Rule Enabled",
+                description=f"Rule `#{rule_id}` is active again.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to enable regex rule. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error enabling regex rule: {e}")
+
+    @automod_regex.command(name='list')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_regex_list(self, ctx):
+        """List regex rules with their CPU cost"""
+        rules = self.regex_rules.get(ctx.guild.id, {})
+        if not rules:
+            embed = discord.Embed(
+                title="Automod Regex Rules",
+                description="No regex rules are configured.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        embed = discord.Embed(title=f"Automod Regex Rules ({len(rules)})", color=0x010505)
+        # Most expensive rules first
+        for rule in sorted(rules.values(), key=lambda r: r.cpu_time, reverse=True):
+            status = "<a:flingo_tick:1385161850668449843> Enabled" if rule.enabled else "<a:flingo_cross:1385161874437312594> Disabled"
+            avg_ms = rule.cpu_time / rule.runs * 1000 if rule.runs else 0.0
+            embed.add_field(
+                name=f"#{rule.rule_id} • {status}",
+                value=f"`{rule.pattern[:200]}`\n**Runs:** {rule.runs} | **Avg CPU:** {avg_ms:.2f}ms | "
+                      f"**Max CPU:** {rule.max_cpu_time * 1000:.2f}ms | **Timeouts:** {rule.timeouts}",
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
+    @automod_dashboard.group(name='slowmode', invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_slowmode(self, ctx):
+        """Show adaptive slowmode status"""
+        max_delay = self.adaptive_slowmode.get(ctx.guild.id)
+        status = f"<a:flingo_tick:1385161850668449843> Enabled (max {max_delay}s)" if max_delay else "<a:flingo_cross:1385161874437312594> Disabled"
+
+        embed = discord.Embed(
+            title="Adaptive Slowmode",
+            description=f"Current status: {status}\n\nSlowmode is raised step by step ({', '.join(f'{d}s' for d in SLOWMODE_STEPS[1:])}) "
+                        f"when a channel gets busy and lowered again once it calms down.",
+            color=0x010505 if max_delay else 0xff0000
+        )
+
+        active = []
+        for channel in ctx.guild.text_channels:
+            state = self.channel_rates.get(channel.id)
+            if state and state.level:
+                active.append(f"• {channel.mention} - {SLOWMODE_STEPS[state.level]}s ({state.rate * 60:.0f} msgs/min)")
+        if active:
+            embed.add_field(name="Active Channels", value="\n".join(active[:15]), inline=False)
+
+        embed.add_field(
+            name="Commands",
+            value="`automod slowmode enable [max seconds]` - Enable adaptive slowmode\n`automod slowmode disable` - Disable adaptive slowmode",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @automod_slowmode.command(name='enable')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_slowmode_enable(self, ctx, max_delay: int = 30):
+        """Enable adaptive slowmode"""
+        if max_delay not in SLOWMODE_STEPS[1:]:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Invalid Delay",
+                description=f"Max delay must be one of: {', '.join(str(d) for d in SLOWMODE_STEPS[1:])} seconds.",
+                color=0xff0000
+            )
+            return await ctx.send(embed=embed)
+
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute(
+                    'INSERT OR REPLACE INTO slowmode_settings (guild_id, max_delay) VALUES (?, ?)',
+                    (ctx.guild.id, max_delay)
+                )
+                await db.commit()
+
+            self.adaptive_slowmode[ctx.guild.id] = max_delay
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Adaptive Slowmode Enabled",
+                description=f"Busy channels will get up to {max_delay}s slowmode automatically.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to enable adaptive slowmode. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error enabling adaptive slowmode: {e}")
+
+    @automod_slowmode.command(name='disable')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_slowmode_disable(self, ctx):
+        """Disable adaptive slowmode and clear slowmodes it applied"""
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute('DELETE FROM slowmode_settings WHERE guild_id = ?', (ctx.guild.id,))
+                await db.execute('DELETE FROM slowmode_channels WHERE guild_id = ?', (ctx.guild.id,))
+                await db.commit()
+
+            self.adaptive_slowmode.pop(ctx.guild.id, None)
+            for channel in ctx.guild.text_channels:
+                state = self.channel_rates.pop(channel.id, None)
+                applied = self.slowmode_applied.pop(channel.id, None)
+                if (state and state.level and channel.slowmode_delay == state.applied) or (applied and channel.slowmode_delay == applied):
+                    try:
+                        await channel.edit(slowmode_delay=0, reason="Adaptive slowmode disabled")
+                    except discord.HTTPException:
+                        pass
+
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Adaptive Slowmode Disabled",
+                description="Channel slowmode will no longer be adjusted automatically.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to disable adaptive slowmode. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error disabling adaptive slowmode: {e}")
+
+    @automod_dashboard.group(name='raid', invoke_without_command=True)
+    @commands.has_permissions(manage_guild=True)
+    async def automod_raid(self, ctx):
+        """Show raid protection status"""
+        enabled = ctx.guild.id in self.raid_guilds
+        now = time.monotonic()
+        state = self.raid_states.get(ctx.guild.id)
+
+        if not enabled:
+            status = "<a:flingo_cross:1385161874437312594> Disabled"
+        elif state and state.in_raid(now):
+            status = f"<:ByteStrik_Warning:1384843852577247254> Raid mode active ({state.reason}, {int(state.raid_until - now)}s left)"
+        else:
+            status = "<a:flingo_tick:1385161850668449843> Enabled"
+
+        embed = discord.Embed(
+            title="Raid Protection",
+            description=f"Current status: {status}",
+            color=0x010505 if enabled else 0xff0000
+        )
+        embed.add_field(
+            name="Triggers",
+            value=f"**Joins:** {RAID_JOIN_LIMIT}/{RAID_WINDOW}s\n**Mentions:** {RAID_MENTION_LIMIT}/{RAID_WINDOW}s\n"
+                  f"**New account messages:** {RAID_NEW_ACCOUNT_LIMIT}/{RAID_WINDOW}s\n**Mentions per message:** {MASS_MENTION_LIMIT}",
+            inline=True
+        )
+        if state:
+            embed.add_field(
+                name=f"Last {RAID_WINDOW}s",
+                value=f"**Joins:** {state.joins.total(now)}\n**Mentions:** {state.mentions.total(now)}\n"
+                      f"**New account messages:** {state.new_account_messages.total(now)}\n**Members actioned:** {state.actioned}",
+                inline=True
+            )
+        embed.add_field(
+            name="Commands",
+            value="`automod raid enable` - Enable raid protection\n`automod raid disable` - Disable raid protection\n`automod raid end` - End raid mode now",
+            inline=False
+        )
+        await ctx.send(embed=embed)
+
+    @automod_raid.command(name='enable')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_raid_enable(self, ctx):
+        """Enable raid protection"""
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute('INSERT OR IGNORE INTO raid_settings (guild_id) VALUES (?)', (ctx.guild.id,))
+                await db.commit()
+
+            self.raid_guilds.add(ctx.guild.id)
+
+            embed = discord.Embed(
+                title="<a:flingo_tick:1385161850668449843> Raid Protection Enabled",
+                description="Mass mentions will be removed, and join or spam bursts will switch the server into raid mode.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to enable raid protection. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error enabling raid protection: {e}")
+
+    @automod_raid.command(name='disable')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_raid_disable(self, ctx):
+        """Disable raid protection"""
+        try:
+            async with aiosqlite.connect(self.db_path) as db:
+                await db.execute('DELETE FROM raid_settings WHERE guild_id = ?', (ctx.guild.id,))
+                await db.commit()
+
+            self.raid_guilds.discard(ctx.guild.id)
+            state = self.raid_states.pop(ctx.guild.id, None)
+            if state:
+                await self.end_raid(ctx.guild, state)
+
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Raid Protection Disabled",
+                description="Raid detection has been disabled.",
+                color=0x010505
+            )
+            await ctx.send(embed=embed)
+        except Exception as e:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Failed to disable raid protection. Please try again.",
+                color=0xff0000
+            )
+            await ctx.send(embed=embed)
+            print(f"Error disabling raid protection: {e}")
+
+    @automod_raid.command(name='end')
+    @commands.has_permissions(manage_guild=True)
+    async def automod_raid_end(self, ctx):
+        """End raid mode and unlock the server"""
+        state = self.raid_states.get(ctx.guild.id)
+        if not state or not state.raid_until:
+            embed = discord.Embed(
+                title="<:ByteStrik_Warning:1384843852577247254> No Active Raid",
+                description="This server is not in raid mode.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+
+        await self.end_raid(ctx.guild, state)
+        embed = discord.Embed(
+            title="<a:flingo_tick:1385161850668449843> Raid Mode Ended",
+            description="The server has been unlocked.",
+            color=0x010505
+        )
+        await ctx.send(embed=embed)
+
     # Error handlers for all command groups
     @antilink.error
     async def antilink_error(self, ctx, error):
@@ -1,16 +1,260 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 import sqlite3
 import asyncio
 import datetime
+import io
 import json
+import re
+import time
+from collections import Counter, OrderedDict
+from typing import Optional
+from tools.counters import SlidingCounter
+from tools.log_dispatcher import LogDispatcher
+from tools.message_store import MessageStore, StoredMessage
 
 COOLDOWN_TIME = 2
+BULK_DELETE_MEMORY = 5000
+# Stored events older than this are deleted by the maintenance cog unless a guild sets its own window
+DEFAULT_LOG_RETENTION_DAYS = 30
+# Voice moves closer together than this are merged into one log entry,
+# and no merged entry spans more than VOICE_MAX_SESSION seconds
+VOICE_QUIET_SECONDS = 15
+VOICE_MAX_SESSION = 60
+# Member logging switches to digests while a guild gets at least JOIN_BURST_RATE
+# joins per second over JOIN_BURST_WINDOW seconds, and back below JOIN_CALM_RATE
+JOIN_BURST_WINDOW = 10
+JOIN_BURST_RATE = 1.0
+JOIN_CALM_RATE = 0.3
+DIGEST_LIST_LIMIT = 30
+# Channel API calls in flight at once while provisioning or resetting logging channels
+PROVISION_CONCURRENCY = 3
+LOG_CHANNELS = {
+    'message_logs': 'message-logs',
+    'member_join_leave': 'member-logs',
+    'channel_changes': 'channel-logs',
+    'role_changes': 'role-logs',
+    'voice_state': 'voice-logs',
+    'emoji_changes': 'emoji-logs',
+    'member_update': 'member-updates',
+    'guild_updates': 'guild-updates',
+    'moderation_actions': 'moderation-logs'
+}
+SEARCH_PAGE_SIZE = 10
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+class EventStore:
+    """Write-behind store for logged events in the ``logs`` table.
+
+    Events are buffered in memory and inserted with a single executemany,
+    either once ``max_rows`` are waiting or on the cog's periodic flush.
+    Searches flush first so they always see recent events. The database is
+    only touched from worker threads, so a locked file never blocks the
+    event loop; rows that fail to write are kept for the next flush.
+    """
+
+    def __init__(self, db_path='logging.db', max_rows=200):
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self.rows = []
+        self.fts = False
+        self.lock = asyncio.Lock()
+        self.flush_task = None
+
+    def add(self, guild_id, log_type, user_id=None, channel_id=None, content=None, additional_data=None):
+        self.rows.append((
+            guild_id,
+            log_type,
+            datetime.datetime.utcnow().isoformat(),
+            user_id,
+            channel_id,
+            content,
+            json.dumps(additional_data) if additional_data else None
+        ))
+        if len(self.rows) >= self.max_rows and self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush())
+            self.flush_task.add_done_callback(self.flush_done)
+
+    def flush_done(self, task):
+        self.flush_task = None
+
+    async def flush(self):
+        async with self.lock:
+            if not self.rows:
+                return
+            rows, self.rows = self.rows, []
+            try:
+                await asyncio.to_thread(self.write, rows)
+            except Exception as e:
+                # Keep the rows so the next flush retries them
+                self.rows[:0] = rows
+                print(f"Error writing log events: {e}")
+
+    def write(self, rows):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT INTO logs (guild_id, log_type, timestamp, user_id, channel_id, content, additional_data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            conn.close()
+
+    async def search(self, guild_id, query=None, user_id=None, since=None, before_id=None, after_id=None, limit=SEARCH_PAGE_SIZE):
+        """Return one page of matching events, newest first, and whether more exist past it.
+
+        Pages are keyed on the event id: ``before_id`` walks to older events,
+        ``after_id`` back to newer ones.
+        """
+        await self.flush()
+        return await asyncio.to_thread(self.read_page, guild_id, query, user_id, since, before_id, after_id, limit)
+
+    def read_page(self, guild_id, query, user_id, since, before_id, after_id, limit):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return self.query_page(conn, guild_id, query, user_id, since, before_id, after_id, limit)
+        finally:
+            conn.close()
+
+    def query_page(self, conn, guild_id, query, user_id, since, before_id, after_id, limit):
+        cursor = conn.cursor()
+        
+        clauses = ['l.guild_id = ?']
+        params = [guild_id]
+        if since:
+            # Ids grow with time, so turn the time bound into an id bound
+            cursor.execute(
+                'SELECT id FROM logs WHERE guild_id = ? AND timestamp >= ? ORDER BY timestamp LIMIT 1',
+                (guild_id, since.isoformat())
+            )
+            row = cursor.fetchone()
+            if not row:
+                return [], False
+            clauses.append('l.id >= ?')
+            params.append(row[0])
+        if user_id:
+            clauses.append('l.user_id = ?')
+            params.append(user_id)
+        if before_id:
+            clauses.append('l.id < ?')
+            params.append(before_id)
+        if after_id:
+            clauses.append('l.id > ?')
+            params.append(after_id)
+        
+        source = 'logs l'
+        terms = re.findall(r'\w+', query or '')
+        if terms and self.fts:
+            source = 'logs l JOIN logs_fts ON logs_fts.rowid = l.id'
+            clauses.insert(0, 'logs_fts MATCH ?')
+            params.insert(0, ' '.join(f'"{term}"' for term in terms))
+        elif terms:
+            for term in terms:
+                clauses.append('l.content LIKE ?')
+                params.append(f'%{term}%')
+        
+        order = 'ASC' if after_id else 'DESC'
+        cursor.execute(f'''
+            SELECT l.id, l.log_type, l.timestamp, l.user_id, l.channel_id, l.content
+            FROM {source} WHERE {' AND '.join(clauses)}
+            ORDER BY l.id {order} LIMIT ?
+        ''', (*params, limit + 1))
+        rows = cursor.fetchall()
+        
+        more = len(rows) > limit
+        rows = rows[:limit]
+        if after_id:
+            rows.reverse()
+        return rows, more
+
+
+def parse_duration(value):
+    """Parse a span like ``30m``, ``12h`` or ``7d`` into a timedelta"""
+    match = re.fullmatch(r'(\d+)([smhdw])', value.lower())
+    if not match:
+        return None
+    return datetime.timedelta(seconds=int(match.group(1)) * DURATION_UNITS[match.group(2)])
+
+def summarize_voice_path(path, label):
+    """Describe a member's voice hops, e.g. "joined A → B → C, left after 42s"
+    
+    path holds (channel_id or None, time entered) pairs, oldest first; the
+    first entry is the state before the window, so its time is unknown.
+    """
+    pieces = []
+    hops = []
+    joined_at = None
+    for index, (channel_id, entered) in enumerate(path):
+        if channel_id is None:
+            if hops:
+                pieces.append(" → ".join(hops))
+                hops = []
+                pieces.append(f"left after {int(entered - joined_at)}s" if joined_at is not None else "left")
+        elif not hops:
+            joined_at = entered if index else None
+            hops.append(f"{'joined' if index else 'from'} {label(channel_id)}")
+        else:
+            hops.append(label(channel_id))
+    if hops:
+        pieces.append(" → ".join(hops))
+    return ", ".join(pieces)
+
 
 class Logging(commands.Cog):
     def __init__(self, client):
         self.client = client
+        # guild_id -> {feature: {'enabled': bool, 'channel_id': int}}, only for guilds with config rows
+        self.configs = {}
+        self.dispatcher = LogDispatcher(client)
+        # Ids already logged as part of a bulk delete, oldest first
+        self.bulk_deleted_ids = OrderedDict()
+        self.events = EventStore()
+        # Contents of recent messages in guilds with message logging, for raw edit/delete events
+        self.messages = MessageStore()
+        self.provision_limiter = asyncio.Semaphore(PROVISION_CONCURRENCY)
+        self.provision_locks = {}
+        # (guild_id, member_id) -> voice transitions waiting to be logged together
+        self.voice_sessions = {}
+        # guild_id -> recent join counter, and guild_id -> pending digest while a join burst lasts
+        self.join_rates = {}
+        self.member_digests = {}
         self.setup_database()
+        self.load_logging_configs()
+
+    async def cog_load(self):
+        self.flush_events.start()
+        self.flush_voice_activity.start()
+        self.flush_member_digests.start()
+        self.client.pipeline.provide('message_logging', self.has_message_logging)
+        self.client.pipeline.register(
+            'message_store', self.store_message,
+            check=lambda msg: msg.fact('message_logging'), priority=5
+        )
+
+    async def cog_unload(self):
+        self.client.pipeline.unregister('message_store')
+        self.client.pipeline.remove_provider('message_logging')
+        self.flush_events.cancel()
+        self.flush_voice_activity.cancel()
+        self.flush_member_digests.cancel()
+        self.log_voice_sessions(force=True)
+        self.log_member_digests(force=True)
+        await self.events.flush()
+        await self.dispatcher.close()
+
+    @tasks.loop(seconds=5)
+    async def flush_events(self):
+        await self.events.flush()
+
+    @tasks.loop(seconds=5)
+    async def flush_voice_activity(self):
+        self.log_voice_sessions()
+
+    @tasks.loop(seconds=JOIN_BURST_WINDOW)
+    async def flush_member_digests(self):
+        self.log_member_digests()
 
     def setup_database(self):
         """Initialize the database tables for logging configuration"""
@@ -37,37 +281,100 @@ class Logging(commands.Cog):
                 additional_data TEXT
             )
         ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_guild_id ON logs (guild_id, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_guild_user ON logs (guild_id, user_id, id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_guild_time ON logs (guild_id, timestamp)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS log_retention (
+                guild_id INTEGER PRIMARY KEY,
+                days INTEGER
+            )
+        ''')
+        
+        # Full-text index over log content, kept in step by triggers
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts
+                USING fts5(content, content='logs', content_rowid='id')
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN
+                    INSERT INTO logs_fts (rowid, content) VALUES (new.id, new.content);
+                END
+            ''')
+            cursor.execute('''
+                CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN
+                    INSERT INTO logs_fts (logs_fts, rowid, content) VALUES ('delete', old.id, old.content);
+                END
+            ''')
+            self.events.fts = True
+        except sqlite3.OperationalError as e:
+            print(f"FTS5 unavailable, log search will use LIKE: {e}")
         
         conn.commit()
         conn.close()
 
-    def get_logging_config(self, guild_id):
-        """Get logging configuration for a guild"""
+    def load_logging_configs(self):
+        """Load every guild's logging configuration into memory"""
         conn = sqlite3.connect('logging.db')
         cursor = conn.cursor()
         
-        cursor.execute('SELECT feature, enabled, channel_id FROM logging_config WHERE guild_id = ?', (guild_id,))
-        results = cursor.fetchall()
-        
-        config = {}
-        for feature, enabled, channel_id in results:
-            config[feature] = {'enabled': bool(enabled), 'channel_id': channel_id}
+        cursor.execute('SELECT guild_id, feature, enabled, channel_id FROM logging_config')
+        self.configs = {}
+        for guild_id, feature, enabled, channel_id in cursor.fetchall():
+            self.configs.setdefault(guild_id, {})[feature] = {'enabled': bool(enabled), 'channel_id': channel_id}
         
         conn.close()
-        return config
+
+    def has_message_logging(self, msg):
+        feature = self.configs.get(msg.guild_id, {}).get('message_logs')
+        return bool(feature and feature['enabled'])
+
+    async def store_message(self, msg):
+        self.messages.add(msg.message)
+
+    def recall_message(self, message_id, cached_message=None):
+        """Return what is known about a message from discord.py's cache or the content store
+
+        Other cogs (snipe) read the store through this. It only holds messages
+        from guilds with message logging enabled.
+        """
+        if cached_message is not None:
+            return StoredMessage(cached_message, 0)
+        return self.messages.get(message_id)
+
+    def get_log_retention(self):
+        """Return the default retention in days and {guild_id: days} overrides (0 keeps forever)"""
+        conn = sqlite3.connect('logging.db')
+        cursor = conn.cursor()
+        cursor.execute('SELECT guild_id, days FROM log_retention')
+        overrides = dict(cursor.fetchall())
+        conn.close()
+        return DEFAULT_LOG_RETENTION_DAYS, overrides
+
+    def get_logging_config(self, guild_id):
+        """Get logging configuration for a guild (cached, do not modify)"""
+        return self.configs.get(guild_id, {})
 
     def update_logging_config(self, guild_id, feature, enabled, channel_id=None):
         """Update logging configuration for a guild"""
+        self.save_logging_configs(guild_id, [(feature, enabled, channel_id)])
+
+    def save_logging_configs(self, guild_id, rows):
+        """Write (feature, enabled, channel_id) rows for a guild in one transaction"""
         conn = sqlite3.connect('logging.db')
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.executemany('''
             INSERT OR REPLACE INTO logging_config (guild_id, feature, enabled, channel_id)
             VALUES (?, ?, ?, ?)
-        ''', (guild_id, feature, enabled, channel_id))
+        ''', [(guild_id, feature, enabled, channel_id) for feature, enabled, channel_id in rows])
         
         conn.commit()
         conn.close()
+        config = self.configs.setdefault(guild_id, {})
+        for feature, enabled, channel_id in rows:
+            config[feature] = {'enabled': bool(enabled), 'channel_id': channel_id}
 
     async def create_logging_category(self, guild):
         """Create the Flingo Logs category if it doesn't exist"""
@@ -101,51 +408,85 @@ class Logging(commands.Cog):
         channel = discord.utils.get(guild.text_channels, name=channel_name, category=category)
         if not channel:
             try:
-                channel = await guild.create_text_channel(
-                    channel_name,
-                    category=category,
-                    topic=f"Automated logging channel for {channel_name.replace('-', ' ').title()}"
-                )
+                async with self.provision_limiter:
+                    channel = await guild.create_text_channel(
+                        channel_name,
+                        category=category,
+                        topic=f"Automated logging channel for {channel_name.replace('-', ' ').title()}"
+                    )
             except discord.Forbidden:
                 raise discord.Forbidden("Bot lacks permissions to create channels")
             except Exception as e:
                 raise e
         return channel
 
-    async def setup_logging_channels(self, guild, features):
-        """Setup logging channels for specified features"""
+    async def delete_logging_channel(self, channel):
+        """Delete a logging channel or category, ignoring failures"""
         try:
-            category = await self.create_logging_category(guild)
-        except Exception as e:
-            raise e
-        
-        channel_mapping = {
-            'message_logs': 'message-logs',
-            'member_join_leave': 'member-logs', 
-            'channel_changes': 'channel-logs',
-            'role_changes': 'role-logs',
-            'voice_state': 'voice-logs',
-            'emoji_changes': 'emoji-logs',
-            'member_update': 'member-updates',
-            'guild_updates': 'guild-updates',
-            'moderation_actions': 'moderation-logs'
-        }
-        
-        created_channels = {}
-        
+            async with self.provision_limiter:
+                await channel.delete()
+        except discord.Forbidden:
+            pass
+        except Exception:
+            pass
+
+    def plan_logging_channels(self, guild, features, category):
+        """Split features into those with a usable log channel and those that still need one"""
+        config = self.get_logging_config(guild.id)
+        existing = {}
+        missing = []
         for feature in features:
-            if feature in channel_mapping:
-                channel_name = channel_mapping[feature]
-                try:
-                    channel = await self.create_logging_channel(guild, channel_name, category)
-                    created_channels[feature] = channel
-                    self.update_logging_config(guild.id, feature, True, channel.id)
-                except Exception as e:
-                    print(f"Failed to create channel {channel_name}: {e}")
-                    continue
+            if feature not in LOG_CHANNELS or feature in existing or feature in missing:
+                continue
+            channel_id = config.get(feature, {}).get('channel_id')
+            channel = guild.get_channel(channel_id) if channel_id else None
+            if channel is None:
+                channel = discord.utils.get(guild.text_channels, name=LOG_CHANNELS[feature], category=category)
+            if channel is None:
+                missing.append(feature)
+            else:
+                existing[feature] = channel
+        return existing, missing
+
+    async def setup_logging_channels(self, guild, features):
+        """Setup logging channels for specified features
+        
+        Channels that already exist are reused and only the missing ones are
+        created, concurrently. Running it again after an interruption picks up
+        where it stopped.
+        """
+        lock = self.provision_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            category = await self.create_logging_category(guild)
+            channels, missing = self.plan_logging_channels(guild, features, category)
+            
+            results = await asyncio.gather(
+                *(self.create_logging_channel(guild, LOG_CHANNELS[feature], category) for feature in missing),
+                return_exceptions=True
+            )
+            for feature, result in zip(missing, results):
+                if isinstance(result, Exception):
+                    print(f"Failed to create channel {LOG_CHANNELS[feature]}: {result}")
+                else:
+                    channels[feature] = result
+            
+            created_channels = {feature: channels[feature] for feature in features if feature in channels}
+            if created_channels:
+                self.save_logging_configs(
+                    guild.id, [(feature, True, channel.id) for feature, channel in created_channels.items()]
+                )
         
         return created_channels
 
+    async def find_executor(self, guild, action, target_id, event, max_age=None):
+        """Who performed an action, from the audit log entries shared with Antinuke"""
+        try:
+            entry = await self.client.audit_context.find(guild, action, target_id, event=event, max_age=max_age)
+        except Exception as e:
+            print(f"Error looking up audit log: {e}")
+            return None
+        return entry.user if entry else None
+
     def create_log_embed(self, title, description, color=0x010505):
         """Create a standard log embed"""
         embed = discord.Embed(
@@ -182,6 +523,16 @@ class Logging(commands.Cog):
                 value="Show logging status of this guild",
                 inline=False
             )
+            embed.add_field(
+                name="<:Notepad:1384842987330211850> `logging search <query> [user] [since]`",
+                value="Search logged events. Use `*` to match everything and `7d`, `12h` etc. for since.",
+                inline=False
+            )
+            embed.add_field(
+                name="<:system:1384849012993032273> `logging retention <days>`",
+                value=f"How long searchable events are kept (default {DEFAULT_LOG_RETENTION_DAYS} days, `0` keeps them forever).",
+                inline=False
+            )
             embed.set_footer(text=f"Flingo - Ultimate Multipurpose Discord bot • Today at {datetime.datetime.now().strftime('%H:%M')}")
             await ctx.send(embed=embed)
 
@@ -206,24 +557,14 @@ class Logging(commands.Cog):
         try:
             category = discord.utils.get(ctx.guild.categories, name="Flingo Logs")
             if category:
-                for channel in category.channels:
-                    try:
-                        await channel.delete()
-                    except discord.Forbidden:
-                        pass
-                    except Exception:
-                        pass
-                try:
-                    await category.delete()
-                except discord.Forbidden:
-                    pass
-                except Exception:
-                    pass
+                await asyncio.gather(*(self.delete_logging_channel(channel) for channel in category.channels))
+                await self.delete_logging_channel(category)
             conn = sqlite3.connect('logging.db')
             cursor = conn.cursor()
             cursor.execute('DELETE FROM logging_config WHERE guild_id = ?', (ctx.guild.id,))
             conn.commit()
             conn.close()
+            self.configs.pop(ctx.guild.id, None)
             
             embed = discord.Embed(
                 title="<:reset:1384852357002825798> Logging Reset",
@@ -301,16 +642,66 @@ class Logging(commands.Cog):
         
         embed.set_footer(text=f"Today at {datetime.datetime.now().strftime('%H:%M')}")
         await ctx.send(embed=embed)
+    @logging.command(name='search')
+    @commands.has_permissions(administrator=True)
+    async def logging_search(self, ctx, query: str, user: Optional[discord.User] = None, since: Optional[str] = None):
+        """Search the stored event log"""
+        since_time = None
+        if since:
+            span = parse_duration(since)
+            if not span:
+                embed = discord.Embed(
+                    title="<a:flingo_cross:1385161874437312594> Error",
+                    description="Invalid time span. Use a number followed by `s`, `m`, `h`, `d` or `w`, like `7d`.",
+                    color=0x010505
+                )
+                return await ctx.send(embed=embed)
+            since_time = datetime.datetime.utcnow() - span
+        
+        view = LogSearchView(self, ctx.author, ctx.guild.id, None if query == '*' else query, user.id if user else None, since_time)
+        embed = await view.load_page()
+        view.message = await ctx.send(embed=embed, view=view)
+
+    @logging.command(name='retention')
+    @commands.has_permissions(administrator=True)
+    async def logging_retention(self, ctx, days: int):
+        """Set how many days stored events are kept"""
+        if days < 0 or days > 365:
+            embed = discord.Embed(
+                title="<a:flingo_cross:1385161874437312594> Error",
+                description="Retention must be between `1` and `365` days, or `0` to keep events forever.",
+                color=0x010505
+            )
+            return await ctx.send(embed=embed)
+        
+        conn = sqlite3.connect('logging.db')
+        cursor = conn.cursor()
+        cursor.execute('INSERT OR REPLACE INTO log_retention (guild_id, days) VALUES (?, ?)', (ctx.guild.id, days))
+        conn.commit()
+        conn.close()
+        
+        embed = discord.Embed(
+            title="<a:flingo_tick:1385161850668449843> Retention Updated",
+            description=f"Stored events will be kept **{f'for {days} days' if days else 'forever'}**.",
+            color=0x00ff00,
+            timestamp=datetime.datetime.utcnow()
+        )
+        await ctx.send(embed=embed)
+
     @commands.Cog.listener()
-    async def on_message_edit(self, before, after):
+    async def on_raw_message_edit(self, payload):
         """Log message edits"""
-        if before.author.bot or before.content == after.content:
+        content = payload.data.get('content')
+        author = payload.data.get('author') or {}
+        if not payload.guild_id or content is None or author.get('bot'):
             return
         
-        if not before.guild:
+        before = self.recall_message(payload.message_id, payload.cached_message)
+        self.messages.update(payload.message_id, content)
+        if before is None or before.content == content:
             return
-            
-        config = self.get_logging_config(before.guild.id)
+        
+        config = self.get_logging_config(payload.guild_id)
         if 'message_logs' not in config or not config['message_logs']['enabled']:
             return
         
@@ -321,29 +712,31 @@ class Logging(commands.Cog):
                 try:
                     embed = self.create_log_embed(
                         "<:Notepad:1384842987330211850> Message Edited",
-                        f"**Author:** {before.author.mention}\n**Channel:** {before.channel.mention}\n**Before:** {before.content[:1000]}{'...' if len(before.content) > 1000 else ''}\n**After:** {after.content[:1000]}{'...' if len(after.content) > 1000 else ''}",
+                        f"**Author:** <@{before.author_id}>\n**Channel:** <#{payload.channel_id}>\n**Before:** {before.content[:1000]}{'...' if len(before.content) > 1000 else ''}\n**After:** {content[:1000]}{'...' if len(content) > 1000 else ''}",
                         0x010505
                     )
-                    embed.set_author(
-                        name=str(before.author), 
-                        icon_url=before.author.display_avatar.url
+                    self.set_log_author(embed, channel.guild, before)
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(
+                        payload.guild_id, 'message_edit', before.author_id, payload.channel_id,
+                        f"{before.content} -> {content}", {'message_id': payload.message_id}
                     )
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
                 except Exception:
                     pass
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
+    async def on_raw_message_delete(self, payload):
         """Log message deletions"""
-        if message.author.bot:
+        if not payload.guild_id or payload.message_id in self.bulk_deleted_ids:
             return
-            
-        if not message.guild:
+        
+        if payload.cached_message and payload.cached_message.author.bot:
+            return
+        message = self.recall_message(payload.message_id, payload.cached_message)
+        if message is None:
             return
         
-        config = self.get_logging_config(message.guild.id)
+        config = self.get_logging_config(payload.guild_id)
         if 'message_logs' not in config or not config['message_logs']['enabled']:
             return
         
@@ -354,19 +747,93 @@ class Logging(commands.Cog):
                 try:
                     embed = self.create_log_embed(
                         "<:lvb_Trash:1384844060618919936> Message Deleted",
-                        f"**Author:** {message.author.mention}\n**Channel:** {message.channel.mention}\n**Content:** {message.content[:1000]}{'...' if len(message.content) > 1000 else ''}",
+                        f"**Author:** <@{message.author_id}>\n**Channel:** <#{payload.channel_id}>\n**Content:** {message.content[:1000]}{'...' if len(message.content) > 1000 else ''}",
                         0x010505
                     )
-                    embed.set_author(
-                        name=str(message.author), 
-                        icon_url=message.author.display_avatar.url
+                    self.set_log_author(embed, channel.guild, message)
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(
+                        payload.guild_id, 'message_delete', message.author_id, payload.channel_id,
+                        message.content, {'message_id': payload.message_id}
                     )
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
                 except Exception:
                     pass
 
+    def set_log_author(self, embed, guild, message):
+        member = guild.get_member(message.author_id)
+        embed.set_author(
+            name=message.author_name,
+            icon_url=member.display_avatar.url if member else None
+        )
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Log a bulk delete as one entry with the cached messages attached"""
+        if not payload.guild_id:
+            return
+        
+        for message_id in payload.message_ids:
+            self.bulk_deleted_ids[message_id] = None
+        while len(self.bulk_deleted_ids) > BULK_DELETE_MEMORY:
+            self.bulk_deleted_ids.popitem(last=False)
+        
+        config = self.get_logging_config(payload.guild_id)
+        if 'message_logs' not in config or not config['message_logs']['enabled']:
+            return
+        
+        channel_id = config['message_logs']['channel_id']
+        channel = self.client.get_channel(channel_id) if channel_id else None
+        if not channel:
+            return
+        
+        # Bot messages are left out, as in the single delete log
+        bot_ids = {message.id for message in payload.cached_messages if message.author.bot}
+        message_ids = payload.message_ids - bot_ids
+        if not message_ids:
+            return
+        
+        try:
+            cached = {message.id: message for message in payload.cached_messages}
+            known = []
+            for message_id in sorted(message_ids):
+                message = self.recall_message(message_id, cached.get(message_id))
+                if message is not None:
+                    known.append(message)
+            cached = known
+            total = len(message_ids)
+            
+            lines = io.StringIO()
+            for message in cached:
+                content = message.content.replace("\n", " ")
+                created = discord.utils.snowflake_time(message.id)
+                lines.write(
+                    f"[{created.strftime('%Y-%m-%d %H:%M:%S')}] "
+                    f"{message.author_name} ({message.author_id}): {content}\n"
+                )
+            if total > len(cached):
+                lines.write(f"... {total - len(cached)} message(s) were not cached\n")
+            
+            authors = Counter(message.author_id for message in cached)
+            top_authors = ", ".join(f"<@{author_id}> ({count})" for author_id, count in authors.most_common(5))
+            embed = self.create_log_embed(
+                "<:lvb_Trash:1384844060618919936> Messages Bulk Deleted",
+                f"**Channel:** <#{payload.channel_id}>\n**Messages:** {total} ({len(cached)} cached)"
+                + (f"\n**Authors:** {top_authors}" if top_authors else ""),
+                0x010505
+            )
+            file = discord.File(
+                io.BytesIO(lines.getvalue().encode()),
+                filename=f"bulk_delete_{payload.channel_id}.txt"
+            )
+            self.dispatcher.send(channel, embed, file)
+            for message in cached:
+                self.events.add(
+                    payload.guild_id, 'message_bulk_delete', message.author_id, payload.channel_id,
+                    message.content, {'message_id': message.id}
+                )
+        except Exception:
+            pass
+
     @commands.Cog.listener()
     async def on_member_join(self, member):
         """Log member joins"""
@@ -374,6 +841,16 @@ class Logging(commands.Cog):
         if 'member_join_leave' not in config or not config['member_join_leave']['enabled']:
             return
         
+        now = time.monotonic()
+        joins = self.join_rates.get(member.guild.id)
+        if joins is None:
+            joins = self.join_rates[member.guild.id] = SlidingCounter(JOIN_BURST_WINDOW)
+        joins.add(now)
+        if member.guild.id in self.member_digests or joins.rate(now) >= JOIN_BURST_RATE:
+            self.add_to_digest(member, 'join', f"{member.mention} `{member}` created {discord.utils.format_dt(member.created_at, 'R')}")
+            self.events.add(member.guild.id, 'member_join', member.id, None, str(member))
+            return
+        
         channel_id = config['member_join_leave']['channel_id']
         if channel_id:
             channel = self.client.get_channel(channel_id)
@@ -389,9 +866,8 @@ class Logging(commands.Cog):
                         icon_url=member.display_avatar.url
                     )
                     embed.set_thumbnail(url=member.display_avatar.url)
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(member.guild.id, 'member_join', member.id, None, str(member))
                 except Exception:
                     pass
 
@@ -402,15 +878,23 @@ class Logging(commands.Cog):
         if 'member_join_leave' not in config or not config['member_join_leave']['enabled']:
             return
         
+        if member.guild.id in self.member_digests:
+            joined_text = discord.utils.format_dt(member.joined_at, 'R') if member.joined_at else 'unknown'
+            self.add_to_digest(member, 'leave', f"{member.mention} `{member}` joined {joined_text}")
+            self.events.add(member.guild.id, 'member_leave', member.id, None, str(member))
+            return
+        
         channel_id = config['member_join_leave']['channel_id']
         if channel_id:
             channel = self.client.get_channel(channel_id)
             if channel:
                 try:
                     joined_text = discord.utils.format_dt(member.joined_at, 'F') if member.joined_at else 'Unknown'
+                    kicked_by = await self.find_executor(member.guild, discord.AuditLogAction.kick, member.id, 'member_remove', max_age=30)
                     embed = self.create_log_embed(
-                        "👋 Member Left",
-                        f"**Member:** {member.mention}\n**Joined:** {joined_text}\n**Member Count:** {member.guild.member_count}",
+                        "👢 Member Kicked" if kicked_by else "👋 Member Left",
+                        f"**Member:** {member.mention}\n**Joined:** {joined_text}\n**Member Count:** {member.guild.member_count}"
+                        + (f"\n**By:** {kicked_by.mention}" if kicked_by else ""),
                         0x010505
                     )
                     embed.set_author(
@@ -418,12 +902,62 @@ class Logging(commands.Cog):
                         icon_url=member.display_avatar.url
                     )
                     embed.set_thumbnail(url=member.display_avatar.url)
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(member.guild.id, 'member_leave', member.id, None, str(member))
                 except Exception:
                     pass
 
+    def add_to_digest(self, member, kind, line):
+        digest = self.member_digests.get(member.guild.id)
+        if digest is None:
+            digest = self.member_digests[member.guild.id] = {
+                'guild': member.guild,
+                'joins': [], 'leaves': [],
+                'join_count': 0, 'leave_count': 0
+            }
+        digest[kind + '_count'] += 1
+        if len(digest[kind + 's']) < DIGEST_LIST_LIMIT:
+            digest[kind + 's'].append(line)
+
+    def log_member_digests(self, force=False):
+        """Send pending join/leave digests and leave digest mode once joins calm down"""
+        now = time.monotonic()
+        for guild_id, digest in list(self.member_digests.items()):
+            joins = self.join_rates.get(guild_id)
+            if force or joins is None or joins.rate(now) < JOIN_CALM_RATE:
+                del self.member_digests[guild_id]
+            if not digest['join_count'] and not digest['leave_count']:
+                continue
+            try:
+                self.log_member_digest(digest)
+            except Exception as e:
+                print(f"Error logging member digest: {e}")
+            digest['joins'], digest['leaves'] = [], []
+            digest['join_count'] = digest['leave_count'] = 0
+
+    def log_member_digest(self, digest):
+        guild = digest['guild']
+        config = self.get_logging_config(guild.id)
+        if 'member_join_leave' not in config or not config['member_join_leave']['enabled']:
+            return
+        
+        channel_id = config['member_join_leave']['channel_id']
+        channel = self.client.get_channel(channel_id) if channel_id else None
+        if not channel:
+            return
+        
+        for kind, title, color in (('join', "👥 Members Joined", 0x00ff00), ('leave', "👥 Members Left", 0x010505)):
+            count = digest[kind + '_count']
+            if not count:
+                continue
+            lines = digest[kind + 's']
+            description = "\n".join(f"• {line}" for line in lines)
+            if count > len(lines):
+                description += f"\n... and {count - len(lines)} more"
+            embed = self.create_log_embed(f"{title} ({count})", description, color)
+            embed.set_footer(text=f"Join burst in progress - summarizing every {JOIN_BURST_WINDOW}s | Member Count: {guild.member_count}")
+            self.dispatcher.send(channel, embed)
+
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel):
         """Log channel creation"""
@@ -436,20 +970,22 @@ class Logging(commands.Cog):
             log_channel = self.client.get_channel(channel_id)
             if log_channel:
                 try:
+                    executor = await self.find_executor(channel.guild, discord.AuditLogAction.channel_create, channel.id, 'guild_channel_create')
                     embed = self.create_log_embed(
                         "📁 Channel Created",
-                        f"**Channel:** {channel.mention}\n**Type:** {str(channel.type).title()}",
+                        f"**Channel:** {channel.mention}\n**Type:** {str(channel.type).title()}"
+                        + (f"\n**By:** {executor.mention}" if executor else ""),
                         0x00ff00
                     )
-                    await log_channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(log_channel, embed)
+                    self.events.add(channel.guild.id, 'channel_create', executor.id if executor else None, channel.id, channel.name)
                 except Exception:
                     pass
 
     @commands.Cog.listener()
     async def on_guild_channel_delete(self, channel):
         """Log channel deletion"""
+        self.dispatcher.forget_channel(channel.id)
         config = self.get_logging_config(channel.guild.id)
         if 'channel_changes' not in config or not config['channel_changes']['enabled']:
             return
@@ -459,14 +995,15 @@ class Logging(commands.Cog):
             log_channel = self.client.get_channel(channel_id)
             if log_channel:
                 try:
+                    executor = await self.find_executor(channel.guild, discord.AuditLogAction.channel_delete, channel.id, 'guild_channel_delete')
                     embed = self.create_log_embed(
                         "<:lvb_Trash:1384844060618919936> Channel Deleted",
-                        f"**Channel:** {channel.name}\n**Type:** {str(channel.type).title()}",
+                        f"**Channel:** {channel.name}\n**Type:** {str(channel.type).title()}"
+                        + (f"\n**By:** {executor.mention}" if executor else ""),
                         0x010505
                     )
-                    await log_channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(log_channel, embed)
+                    self.events.add(channel.guild.id, 'channel_delete', executor.id if executor else None, channel.id, channel.name)
                 except Exception:
                     pass
 
@@ -483,14 +1020,15 @@ class Logging(commands.Cog):
             if channel:
                 try:
                     perms_count = sum(1 for perm, value in role.permissions if value)
+                    executor = await self.find_executor(role.guild, discord.AuditLogAction.role_create, role.id, 'guild_role_create')
                     embed = self.create_log_embed(
                         "<:Meko_Role:1384854321740513282> Role Created",
-                        f"**Role:** {role.mention}\n**Color:** {str(role.color)}\n**Permissions:** {perms_count} enabled",
+                        f"**Role:** {role.mention}\n**Color:** {str(role.color)}\n**Permissions:** {perms_count} enabled"
+                        + (f"\n**By:** {executor.mention}" if executor else ""),
                         0x00ff00
                     )
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(role.guild.id, 'role_create', executor.id if executor else None, None, role.name, {'role_id': role.id})
                 except Exception:
                     pass
 
@@ -506,58 +1044,105 @@ class Logging(commands.Cog):
             channel = self.client.get_channel(channel_id)
             if channel:
                 try:
+                    executor = await self.find_executor(role.guild, discord.AuditLogAction.role_delete, role.id, 'guild_role_delete')
                     embed = self.create_log_embed(
                         "<:lvb_Trash:1384844060618919936> Role Deleted",
-                        f"**Role:** {role.name}\n**Color:** {str(role.color)}",
+                        f"**Role:** {role.name}\n**Color:** {str(role.color)}"
+                        + (f"\n**By:** {executor.mention}" if executor else ""),
                         0x010505
                     )
-                    await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
+                    self.dispatcher.send(channel, embed)
+                    self.events.add(role.guild.id, 'role_delete', executor.id if executor else None, None, role.name, {'role_id': role.id})
                 except Exception:
                     pass
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member, before, after):
-        """Log voice state changes"""
+        """Collect voice channel changes; they are logged together by flush_voice_activity"""
+        if before.channel == after.channel:
+            return
+        
+        config = self.get_logging_config(member.guild.id)
+        if 'voice_state' not in config or not config['voice_state']['enabled']:
+            return
+        
+        now = time.monotonic()
+        session = self.voice_sessions.get((member.guild.id, member.id))
+        if session is None:
+            session = {
+                'member': member,
+                'path': [(before.channel.id if before.channel else None, None)],
+                'started': now
+            }
+            self.voice_sessions[(member.guild.id, member.id)] = session
+        session['path'].append((after.channel.id if after.channel else None, now))
+        session['last'] = now
+
+    def log_voice_sessions(self, force=False):
+        """Log voice sessions that have gone quiet or reached their maximum length"""
+        now = time.monotonic()
+        for key, session in list(self.voice_sessions.items()):
+            if not force and now - session['last'] < VOICE_QUIET_SECONDS and now - session['started'] < VOICE_MAX_SESSION:
+                continue
+            del self.voice_sessions[key]
+            try:
+                self.log_voice_session(session)
+            except Exception as e:
+                print(f"Error logging voice activity: {e}")
+
+    def log_voice_session(self, session):
+        member = session['member']
+        path = session['path']
         config = self.get_logging_config(member.guild.id)
         if 'voice_state' not in config or not config['voice_state']['enabled']:
             return
         
         channel_id = config['voice_state']['channel_id']
-        if channel_id:
-            channel = self.client.get_channel(channel_id)
-            if channel:
-                try:
-                    if before.channel != after.channel:
-                        if before.channel is None:
-                            embed = self.create_log_embed(
-                                "🔊 Voice Channel Joined",
-                                f"**Member:** {member.mention}\n**Channel:** {after.channel.mention}",
-                                0x00ff00
-                            )
-                        elif after.channel is None:
-                            embed = self.create_log_embed(
-                                "🔇 Voice Channel Left",
-                                f"**Member:** {member.mention}\n**Channel:** {before.channel.mention}",
-                                0x010505
-                            )
-                        else:
-                            embed = self.create_log_embed(
-                                "🔀 Voice Channel Moved",
-                                f"**Member:** {member.mention}\n**From:** {before.channel.mention}\n**To:** {after.channel.mention}",
-                                0x010505
-                            )
-                        
-                        embed.set_author(
-                            name=str(member), 
-                            icon_url=member.display_avatar.url
-                        )
-                        await channel.send(embed=embed)
-                except discord.Forbidden:
-                    pass
-                except Exception:
-                    pass
+        channel = self.client.get_channel(channel_id) if channel_id else None
+        if not channel:
+            return
+        
+        def channel_name(voice_channel_id):
+            voice_channel = member.guild.get_channel(voice_channel_id)
+            return voice_channel.name if voice_channel else str(voice_channel_id)
+        
+        (before, _), (after, _) = path[0], path[-1]
+        if len(path) == 2 and before is None:
+            embed = self.create_log_embed(
+                "🔊 Voice Channel Joined",
+                f"**Member:** {member.mention}\n**Channel:** <#{after}>",
+                0x00ff00
+            )
+        elif len(path) == 2 and after is None:
+            embed = self.create_log_embed(
+                "🔇 Voice Channel Left",
+                f"**Member:** {member.mention}\n**Channel:** <#{before}>",
+                0x010505
+            )
+        elif len(path) == 2:
+            embed = self.create_log_embed(
+                "🔀 Voice Channel Moved",
+                f"**Member:** {member.mention}\n**From:** <#{before}>\n**To:** <#{after}>",
+                0x010505
+            )
+        else:
+            embed = self.create_log_embed(
+                "🔀 Voice Activity",
+                f"**Member:** {member.mention}\n**Activity:** {summarize_voice_path(path, lambda voice_channel_id: f'<#{voice_channel_id}>')}",
+                0x010505
+            )
+            embed.set_footer(text=f"{len(path) - 1} voice changes")
+        
+        embed.set_author(
+            name=str(member), 
+            icon_url=member.display_avatar.url
+        )
+        self.dispatcher.send(channel, embed)
+        self.events.add(
+            member.guild.id, 'voice_state', member.id,
+            after or before,
+            summarize_voice_path(path, channel_name)
+        )
 
     @logging.error
     async def logging_error(self, ctx, error):
@@ -578,6 +1163,80 @@ class Logging(commands.Cog):
             await ctx.send(embed=embed)
 
 
+class LogSearchView(discord.ui.View):
+    def __init__(self, logging_cog, author, guild_id, query, user_id, since):
+        super().__init__(timeout=120)
+        self.logging_cog = logging_cog
+        self.author = author
+        self.guild_id = guild_id
+        self.query = query
+        self.user_id = user_id
+        self.since = since
+        self.rows = []
+        self.message = None
+
+    async def load_page(self, before_id=None, after_id=None):
+        rows, more = await self.logging_cog.events.search(
+            self.guild_id, self.query, self.user_id, self.since, before_id=before_id, after_id=after_id
+        )
+        if not rows and (before_id or after_id):
+            # Nothing further that way; stay on the current page
+            rows, more = self.rows, False
+        self.rows = rows
+        
+        first_page = not before_id and not after_id
+        self.newer.disabled = first_page or (after_id is not None and not more)
+        self.older.disabled = not rows or (after_id is None and not more)
+        
+        embed = discord.Embed(
+            title="<:logging:1381504143272968235> Log Search",
+            color=0x010505,
+            timestamp=datetime.datetime.utcnow()
+        )
+        if not rows:
+            embed.description = "No logged events matched your search."
+            return embed
+        
+        lines = []
+        for log_id, log_type, timestamp, user_id, channel_id, content in rows:
+            when = int(datetime.datetime.fromisoformat(timestamp).replace(tzinfo=datetime.timezone.utc).timestamp())
+            where = f" in <#{channel_id}>" if channel_id else ""
+            who = f"<@{user_id}>" if user_id else "System"
+            text = (content or "").replace("\n", " ")
+            lines.append(
+                f"**#{log_id}** • `{log_type}` • <t:{when}:R>\n"
+                f"{who}{where}: {text[:200]}{'...' if len(text) > 200 else ''}"
+            )
+        embed.description = "\n\n".join(lines)
+        embed.set_footer(text=f"Showing events #{rows[-1][0]} to #{rows[0][0]}")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user != self.author:
+            await interaction.response.send_message("It's not your interaction.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        embed = await self.load_page(after_id=self.rows[0][0] if self.rows else None)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        embed = await self.load_page(before_id=self.rows[-1][0] if self.rows else None)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except Exception:
+                pass
+
+
 class LoggingSetupView(discord.ui.View):
     def __init__(self, logging_cog, guild_id, guild):
         super().__init__(timeout=300)
@@ -0,0 +1,195 @@
+import discord
+from discord.ext import commands, tasks
+import sqlite3
+import asyncio
+import datetime
+import os
+import time
+
+# SQLite files that grow with traffic and get compacted
+DATABASES = ['logging.db', 'tickets.db', 'database/automod.db']
+# Rows deleted and pages freed per transaction, so no single write holds the lock for long
+DELETE_BATCH = 500
+VACUUM_PAGES = 1000
+BATCH_PAUSE = 0.05
+
+
+def delete_batch(db_path, query, params):
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            return conn.execute(query, params).rowcount
+    finally:
+        conn.close()
+
+
+def database_pages(db_path):
+    """Return (auto_vacuum mode, free pages)"""
+    conn = sqlite3.connect(db_path)
+    try:
+        mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        free = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        return mode, free
+    finally:
+        conn.close()
+
+
+def enable_incremental_vacuum(db_path):
+    # Changing auto_vacuum on an existing file only takes effect after a full VACUUM
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+
+
+def incremental_vacuum(db_path, pages):
+    conn = sqlite3.connect(db_path)
+    try:
+        # The pragma frees one page per result row, so it has to be stepped to the end
+        conn.execute(f'PRAGMA incremental_vacuum({int(pages)})').fetchall()
+        return conn.execute('PRAGMA freelist_count').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def optimize(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute('PRAGMA optimize')
+    finally:
+        conn.close()
+
+
+class Maintenance(commands.Cog):
+    """Retention and compaction for the bot's SQLite files
+
+    Every few hours old stored log events are deleted in small batches,
+    free pages are returned to the filesystem with incremental vacuum and
+    `PRAGMA optimize` refreshes the query planner statistics. Archived ticket
+    transcripts are pruned by the Ticket cog's own retention setting.
+
+    Files created before incremental vacuum was enabled need one full
+    VACUUM, which rewrites the whole file and blocks every writer meanwhile.
+    The loop never does that; the owner runs it with `maintenance run --convert`.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.lock = asyncio.Lock()
+        self.last_run = None
+        self.last_duration = 0.0
+        self.last_report = []
+        self.last_error = None
+
+    async def cog_load(self):
+        self.maintenance_loop.start()
+
+    async def cog_unload(self):
+        self.maintenance_loop.cancel()
+
+    @tasks.loop(hours=6)
+    async def maintenance_loop(self):
+        try:
+            await self.run_maintenance()
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Error in database maintenance: {e}")
+
+    @maintenance_loop.before_loop
+    async def before_maintenance(self):
+        await self.client.wait_until_ready()
+        # Stay out of the way of startup work
+        await asyncio.sleep(300)
+
+    async def run_maintenance(self, convert=False):
+        async with self.lock:
+            started = time.perf_counter()
+            deleted = await self.apply_log_retention()
+            report = []
+            for db_path in DATABASES:
+                if not os.path.exists(db_path):
+                    continue
+                entry = await self.compact(db_path, convert)
+                entry['deleted'] = deleted if db_path == 'logging.db' else 0
+                report.append(entry)
+            self.last_report = report
+            self.last_run = discord.utils.utcnow()
+            self.last_duration = time.perf_counter() - started
+            self.last_error = None
+            total = sum(entry['reclaimed'] for entry in report)
+            print(f"Database maintenance: {deleted} log events deleted, {total} bytes reclaimed in {self.last_duration:.1f}s")
+            return report
+
+    async def apply_log_retention(self):
+        """Delete stored log events past each guild's retention window"""
+        logging_cog = self.client.get_cog('Logging')
+        if not logging_cog:
+            return 0
+
+        await logging_cog.events.flush()
+        default_days, overrides = await asyncio.to_thread(logging_cog.get_log_retention)
+        now = datetime.datetime.utcnow()
+        deleted = 0
+
+        # Guilds on the default window; ids grow with time, so the oldest rows are found first
+        if default_days:
+            cutoff = (now - datetime.timedelta(days=default_days)).isoformat()
+            deleted += await self.delete_in_batches('logging.db', '''
+                DELETE FROM logs WHERE id IN (
+                    SELECT id FROM logs
+                    WHERE timestamp < ? AND guild_id NOT IN (SELECT guild_id FROM log_retention)
+                    ORDER BY id LIMIT ?
+                )
+            ''', (cutoff,))
+
+        for guild_id, days in overrides.items():
+            if not days:
+                continue
+            cutoff = (now - datetime.timedelta(days=days)).isoformat()
+            deleted += await self.delete_in_batches('logging.db', '''
+                DELETE FROM logs WHERE id IN (
+                    SELECT id FROM logs WHERE guild_id = ? AND timestamp < ? LIMIT ?
+                )
+            ''', (guild_id, cutoff))
+        return deleted
+
+    async def delete_in_batches(self, db_path, query, params):
+        deleted = 0
+        while True:
+            count = await asyncio.to_thread(delete_batch, db_path, query, params + (DELETE_BATCH,))
+            deleted += count
+            if count < DELETE_BATCH:
+                return deleted
+            await asyncio.sleep(BATCH_PAUSE)
+
+    async def compact(self, db_path, convert=False):
+        started = time.perf_counter()
+        size_before = os.path.getsize(db_path)
+        entry = {'path': db_path, 'reclaimed': 0, 'seconds': 0.0, 'error': None, 'needs_convert': False}
+        try:
+            mode, free = await asyncio.to_thread(database_pages, db_path)
+            if mode != 2:
+                if convert:
+                    await asyncio.to_thread(enable_incremental_vacuum, db_path)
+                else:
+                    entry['needs_convert'] = True
+            else:
+                while free:
+                    remaining = await asyncio.to_thread(incremental_vacuum, db_path, VACUUM_PAGES)
+                    if remaining >= free:
+                        break
+                    free = remaining
+                    await asyncio.sleep(BATCH_PAUSE)
+            await asyncio.to_thread(optimize, db_path)
+        except sqlite3.Error as e:
+            entry['error'] = str(e)
+            print(f"Error compacting {db_path}: {e}")
+        entry['reclaimed'] = size_before - os.path.getsize(db_path)
+        entry['seconds'] = time.perf_counter() - started
+        return entry
+
+
+async def setup(client):
+    await client.add_cog(Maintenance(client))
@@ -97,6 +97,15 @@ class Moderation(commands.Cog):
         self.color = 0x010505
         self.token = flingo.token
 
+    async def cog_load(self):
+        self.bot.pipeline.register('afk', self.afk_message, check=self.has_afk_targets, priority=50)
+
+    def cog_unload(self):
+        self.bot.pipeline.unregister('afk')
+
+    def has_afk_targets(self, msg):
+        return bool(self.afk_users) and (msg.author_id in self.afk_users or msg.has_mentions)
+
     async def cog_check(self, ctx):
         return ctx.author.guild_permissions.administrator or ctx.author.guild_permissions.manage_guild
 
@@ -229,10 +238,9 @@ class Moderation(commands.Cog):
         view = AFKButton(ctx.author.id)
         await ctx.send(embed=embed, view=view)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
-            return
+    async def afk_message(self, msg):
+        """AFK message pipeline stage"""
+        message = msg.message
         if message.author.id in self.afk_users:
             afk_data = self.afk_users[message.author.id]
             if afk_data.get('global', False) or afk_data.get('guild_id') == message.guild.id:
@@ -12,16 +12,44 @@ class Moderation2(commands.Cog):
         self.sniped_messages = {}
         
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
+    async def on_raw_message_delete(self, payload):
         """Listen for deleted messages and store them for snipe command"""
-        if message.author.bot:
+        message = payload.cached_message
+        if message is not None:
+            if message.author.bot:
+                return
+            author, author_id, content = message.author, message.author.id, message.content
+        else:
+            # Not in discord.py's cache; guilds with message logging keep recent contents
+            logging_cog = self.client.get_cog('Logging')
+            stored = logging_cog.recall_message(payload.message_id) if logging_cog else None
+            if stored is None:
+                return
+            author, author_id, content = None, stored.author_id, stored.content
+        
+        self.sniped_messages[payload.channel_id] = {
+            'author': author,
+            'author_id': author_id,
+            'content': content,
+            'deleted_at': datetime.datetime.utcnow(),
+            'message_id': payload.message_id,
+            'count': 1
+        }
+    
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        """Store one snipe entry for a whole bulk delete"""
+        cached = [message for message in payload.cached_messages if not message.author.bot]
+        if not cached:
             return
-        self.sniped_messages[message.channel.id] = {
+        message = max(cached, key=lambda message: message.id)
+        self.sniped_messages[payload.channel_id] = {
             'author': message.author,
             'author_id': message.author.id,
             'content': message.content,
             'deleted_at': datetime.datetime.utcnow(),
-            'message_id': message.id
+            'message_id': message.id,
+            'count': len(payload.message_ids)
         }
     
     @commands.command(name='snipe')
@@ -40,7 +68,13 @@ class Moderation2(commands.Cog):
             return
         
         sniped_data = self.sniped_messages[channel_id]
-        author = sniped_data['author']
+        author = sniped_data['author'] or ctx.guild.get_member(sniped_data['author_id'])
+        if author is None:
+            try:
+                author = await self.client.fetch_user(sniped_data['author_id'])
+            except discord.HTTPException:
+                await ctx.send("The author of the deleted message could not be found.")
+                return
         content = sniped_data['content']
         deleted_at = sniped_data['deleted_at']
         time_diff = datetime.datetime.utcnow() - deleted_at
@@ -77,7 +111,7 @@ class Moderation2(commands.Cog):
         )
         embed.add_field(
             name="Deleted Messages:", 
-            value="1", 
+            value=str(sniped_data.get('count', 1)), 
             inline=False
         )
         embed.add_field(
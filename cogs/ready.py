@@ -7,29 +7,32 @@ class Ready(commands.Cog):
     def __init__(self, client):
         self.client = client
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author == self.client.user or message.author.bot:
-            return
-
-        if self.client.user.mentioned_in(message):
-            mentions = [mention for mention in message.mentions if mention == self.client.user]
-            if mentions and message.content.strip() == mentions[0].mention:
-                if message.guild:
-                    async with self.client.config.execute("SELECT prefix FROM config WHERE guild = ?", (message.guild.id,)) as cursor:
-                        guild_row = await cursor.fetchone()
-                        guild_prefix = guild_row[0] if guild_row and guild_row[0] else '&'  
-                else:
-                    guild_prefix = '&'  
-
-                embed = discord.Embed(
-                    description=f"Hey {message.author.mention}, my prefix in this server is `{guild_prefix}`\n\nWhat would you like to do today?\nUse `{guild_prefix}help` to start your journey.",
-                    color=color
-                )
-
-                view = View()
-
-                await message.channel.send(embed=embed, view=view)
+    async def cog_load(self):
+        self.client.pipeline.register('mention_reply', self.mention_reply, check=lambda msg: msg.mentions_bot, priority=60, guild_only=False)
+
+    def cog_unload(self):
+        self.client.pipeline.unregister('mention_reply')
+
+    async def mention_reply(self, msg):
+        """Reply with the prefix when the bot is pinged on its own"""
+        message = msg.message
+        mentions = [mention for mention in message.mentions if mention == self.client.user]
+        if mentions and message.content.strip() == mentions[0].mention:
+            if message.guild:
+                async with self.client.config.execute("SELECT prefix FROM config WHERE guild = ?", (message.guild.id,)) as cursor:
+                    guild_row = await cursor.fetchone()
+                    guild_prefix = guild_row[0] if guild_row and guild_row[0] else '&'  
+            else:
+                guild_prefix = '&'  
+
+            embed = discord.Embed(
+                description=f"Hey {message.author.mention}, my prefix in this server is `{guild_prefix}`\n\nWhat would you like to do today?\nUse `{guild_prefix}help` to start your journey.",
+                color=color
+            )
+
+            view = View()
+
+            await message.channel.send(embed=embed, view=view)
 
 async def setup(client):
     await client.add_cog(Ready(client))
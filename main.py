@@ -7,6 +7,8 @@ import pymongo
 import aiosqlite
 import flingo
 from tools import context
+from tools.audit_context import AuditLogContext
+from tools.pipeline import MessagePipeline
 from settings.config import *
 
 cache_flags = discord.MemberCacheFlags(voice=True, joined=False)
@@ -29,6 +31,9 @@ class Flingo(commands.AutoShardedBot):
         )
         self.db_ready = False
         self.config = None
+        self.pipeline = MessagePipeline(self)
+        self.pipeline.register("commands", self.run_commands, priority=100, guild_only=False)
+        self.audit_context = AuditLogContext(self)
 
     async def setup_hook(self):
         self.config = await aiosqlite.connect('database/prefix.db')
@@ -74,6 +79,17 @@ class Flingo(commands.AutoShardedBot):
         except Exception as e:
             print(f'Failed to sync command tree: {e}')
 
+    def dispatch(self, event_name, /, *args, **kwargs):
+        # Lets audit log lookups tell which requests started after this event arrived
+        self.audit_context.mark(event_name)
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def on_message(self, message):
+        await self.pipeline.dispatch(message)
+
+    async def run_commands(self, msg):
+        await self.process_commands(msg.message)
+
     async def get_prefix(self, message):
         if not self.db_ready or not self.config:
             return "."
@@ -0,0 +1,88 @@
+"""Benchmark for ticket transcript writes and exports: python tests/bench_transcript_buffer.py"""
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiosqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.Ticket import TicketDatabase, TranscriptBuffer, TranscriptExporter  # noqa: E402
+
+MESSAGES = 50_000
+TICKET_ID = 1
+
+
+async def write_buffered(db):
+    buffer = TranscriptBuffer(db)
+    start = time.perf_counter()
+    for i in range(MESSAGES):
+        await buffer.add(TICKET_ID, i % 5, f"user{i % 5}", f"message {i} with some ordinary chat text in it")
+    await buffer.close()
+    elapsed = time.perf_counter() - start
+    print(f"buffered write   {elapsed * 1000:8.0f} ms  {elapsed / MESSAGES * 1000:.3f} ms/row")
+
+
+async def write_per_row(db, rows=2000):
+    # The previous path: one connect/insert/commit per message; sampled, it is too slow for 50k
+    start = time.perf_counter()
+    for i in range(rows):
+        async with aiosqlite.connect(db.db_path) as conn:
+            await conn.execute(
+                "INSERT INTO ticket_messages (ticket_id, author_id, author_name, content, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (TICKET_ID + 1, 0, "user", "message", datetime.datetime.utcnow().isoformat())
+            )
+            await conn.commit()
+    elapsed = time.perf_counter() - start
+    print(f"per-row write    {elapsed / rows * 1000:8.3f} ms/row ({rows} rows sampled)")
+
+
+async def measure(label, coro):
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = await coro
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<16} {elapsed * 1000:8.0f} ms  peak {peak / 2**20:5.1f} MB  {size / 2**20:6.2f} MB out")
+
+
+async def export_fetchall(db, exporter):
+    # The previous send_transcript: fetchall() and one string built with +=
+    async with aiosqlite.connect(db.db_path) as conn:
+        async with conn.execute(
+            "SELECT author_name, content, timestamp FROM ticket_messages WHERE ticket_id = ? ORDER BY timestamp ASC",
+            (TICKET_ID,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+    transcript = ""
+    for row in rows:
+        transcript += exporter.render_text_row(*row)
+    return len(transcript.encode())
+
+
+async def export_stream(exporter, fmt):
+    spool, size, _ = await exporter.export(TICKET_ID, [("Ticket", TICKET_ID)], fmt)
+    spool.close()
+    return size
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db = TicketDatabase(os.path.join(directory, "tickets.db"))
+        await db.init_db()
+        await write_buffered(db)
+        await write_per_row(db)
+
+        exporter = TranscriptExporter(db)
+        await measure("fetchall + +=", export_fetchall(db, exporter))
+        for fmt in TranscriptExporter.formats:
+            await measure(f"stream {fmt}", export_stream(exporter, fmt))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+"""Benchmark for the automod banned word filter: python tests/bench_word_filter.py"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cogs.automod import WordFilter  # noqa: E402
+
+
+def bench(word_count, message, repeat=2000):
+    rng = random.Random(word_count)
+    words = {"".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(word_count)}
+
+    start = time.perf_counter()
+    word_filter = WordFilter(words)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        word_filter.find(message)
+    scan = (time.perf_counter() - start) / repeat
+    print(f"{word_count:>6} words: build {build * 1000:7.1f} ms, scan {scan * 1e6:7.1f} us per message")
+
+
+if __name__ == "__main__":
+    message = ("Hey everyone, has anybody tried the new update? The patch notes mention "
+               "a lot of balance changes and I am curious what you all think about them. ") * 2
+    for count in (10, 1000, 10000):
+        bench(count, message[:280])
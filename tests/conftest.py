@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Cogs and tools are imported the way main.py imports them, from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+from cogs.automod import ChannelRate, SLOWMODE_STEPS
+
+
+def test_slowmode_applied_by_the_bot_before_a_restart_is_still_owned():
+    state = ChannelRate(0.0, 10, last_applied=10)
+    assert not state.manual
+    assert state.level == SLOWMODE_STEPS.index(10)
+
+
+def test_slowmode_changed_by_a_moderator_is_manual():
+    assert ChannelRate(0.0, 30, last_applied=10).manual
+    assert ChannelRate(0.0, 30).manual
+
+
+def test_channel_without_slowmode_is_not_manual():
+    state = ChannelRate(0.0, 0, last_applied=10)
+    assert not state.manual
+    assert state.level == 0
+
+
+def test_quiet_owned_channel_steps_down():
+    state = ChannelRate(0.0, 10, last_applied=10)
+    max_level = len(SLOWMODE_STEPS) - 1
+    assert state.target_level(max_level) == state.level - 1
@@ -0,0 +1,35 @@
+import json
+import zlib
+
+import pytest
+
+from cogs.Ticket import iter_archived_rows
+
+
+def archive(rows):
+    compressor = zlib.compressobj(9)
+    encoded = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+    return compressor.compress(encoded.encode()) + compressor.flush()
+
+
+ROWS = [[f"user{i % 7}", f"message {i} " + "x" * (i % 50), f"2026-01-01T00:00:{i % 60:02d}"] for i in range(1200)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 4096, 64 * 1024])
+def test_rows_round_trip_for_any_chunk_size(chunk_size):
+    blob = archive(ROWS)
+    batches = list(iter_archived_rows(blob, batch_size=500, chunk_size=chunk_size))
+    assert [len(batch) for batch in batches] == [500, 500, 200]
+    assert [list(row) for batch in batches for row in batch] == ROWS
+
+
+@pytest.mark.parametrize("offset", [0, -1, 1])
+def test_chunk_size_around_the_blob_length(offset):
+    # offset 0 makes the blob length an exact multiple of the chunk size
+    blob = archive(ROWS)
+    rows = [list(row) for batch in iter_archived_rows(blob, chunk_size=len(blob) + offset) for row in batch]
+    assert rows == ROWS
+
+
+def test_empty_archive():
+    assert list(iter_archived_rows(archive([]))) == []
@@ -0,0 +1,94 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import discord
+
+from tools.audit_context import AuditLogContext
+
+ROLE_UPDATE = discord.AuditLogAction.role_update
+
+
+def entry(target_id, user):
+    return SimpleNamespace(target=SimpleNamespace(id=target_id), user=user, created_at=discord.utils.utcnow())
+
+
+class FakeGuild:
+    id = 1
+
+    def __init__(self):
+        self.log = []
+        self.requests = 0
+
+    async def audit_logs(self, limit, action):
+        self.requests += 1
+        snapshot = list(self.log[:limit])
+        await asyncio.sleep(0.01)
+        for item in snapshot:
+            yield item
+
+
+def test_second_executor_on_same_target_is_not_blamed_on_the_first():
+    async def scenario():
+        guild = FakeGuild()
+        audit = AuditLogContext(None)
+
+        guild.log.insert(0, entry(10, "admin"))
+        audit.mark("guild_role_update")
+        first = await audit.find(guild, ROLE_UPDATE, 10, event="guild_role_update")
+
+        # Inside the TTL, someone else edits the same role
+        guild.log.insert(0, entry(10, "attacker"))
+        audit.mark("guild_role_update")
+        second = await audit.find(guild, ROLE_UPDATE, 10, event="guild_role_update")
+        return first.user, second.user, guild.requests
+
+    assert asyncio.run(scenario()) == ("admin", "attacker", 2)
+
+
+def test_lookups_for_the_same_event_share_one_request():
+    async def scenario():
+        guild = FakeGuild()
+        audit = AuditLogContext(None)
+        guild.log = [entry(target, "admin") for target in range(10, 0, -1)]
+        audit.mark("guild_channel_delete")
+        found = await asyncio.gather(*(
+            audit.find(guild, discord.AuditLogAction.channel_delete, target, event="guild_channel_delete")
+            for target in range(1, 11) for _ in range(2)
+        ))
+        return sum(1 for item in found if item is not None), guild.requests
+
+    assert asyncio.run(scenario()) == (20, 1)
+
+
+def test_in_flight_request_from_before_the_event_is_not_joined():
+    async def scenario():
+        guild = FakeGuild()
+        audit = AuditLogContext(None)
+        guild.log = [entry(None, "admin")]
+        audit.mark("guild_update")
+        early = asyncio.create_task(audit.find(guild, discord.AuditLogAction.guild_update, event="guild_update"))
+        while not guild.requests:
+            await asyncio.sleep(0)
+
+        # A second update arrives while the first request is still running
+        guild.log.insert(0, entry(None, "attacker"))
+        audit.mark("guild_update")
+        late = await audit.find(guild, discord.AuditLogAction.guild_update, event="guild_update")
+        return (await early).user, late.user, guild.requests
+
+    assert asyncio.run(scenario()) == ("admin", "attacker", 2)
+
+
+def test_old_ban_on_the_same_member_is_not_blamed_when_the_new_entry_is_missing():
+    async def scenario():
+        guild = FakeGuild()
+        audit = AuditLogContext(None)
+        # Unbanned and banned again; the new ban entry is not visible yet
+        old_ban = entry(10, "moderator")
+        old_ban.created_at = discord.utils.utcnow() - datetime.timedelta(hours=2)
+        guild.log = [old_ban]
+        audit.mark("member_ban")
+        return await audit.find(guild, discord.AuditLogAction.ban, 10, max_age=30, event="member_ban")
+
+    assert asyncio.run(scenario()) is None
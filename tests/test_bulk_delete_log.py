@@ -0,0 +1,39 @@
+import asyncio
+from types import SimpleNamespace
+
+from cogs.logging import Logging
+
+LOG_CHANNEL = SimpleNamespace(id=50)
+
+
+def cached(message_id, bot, content):
+    author = SimpleNamespace(id=100 + message_id, bot=bot)
+    return SimpleNamespace(
+        id=message_id, guild=SimpleNamespace(id=1), channel=SimpleNamespace(id=7),
+        author=author, content=content
+    )
+
+
+def test_bulk_delete_leaves_out_bot_messages(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = SimpleNamespace(get_channel=lambda channel_id: LOG_CHANNEL if channel_id == LOG_CHANNEL.id else None)
+    cog = Logging(client)
+    cog.configs[1] = {'message_logs': {'enabled': True, 'channel_id': LOG_CHANNEL.id}}
+    sent = []
+    cog.dispatcher.send = lambda channel, embed, file=None: sent.append((embed, file))
+
+    payload = SimpleNamespace(
+        guild_id=1, channel_id=7, message_ids={1, 2, 3},
+        cached_messages=[cached(1, False, "human text"), cached(2, True, "bot text"), cached(3, False, "more")]
+    )
+    asyncio.run(cog.on_raw_bulk_message_delete(payload))
+
+    embed, file = sent[0]
+    attachment = file.fp.read().decode()
+    assert "**Messages:** 2 (2 cached)" in embed.description
+    assert "human text" in attachment and "bot text" not in attachment
+
+    # A bulk delete of only bot messages is not logged at all
+    payload = SimpleNamespace(guild_id=1, channel_id=7, message_ids={4}, cached_messages=[cached(4, True, "bot")])
+    asyncio.run(cog.on_raw_bulk_message_delete(payload))
+    assert len(sent) == 1
@@ -0,0 +1,49 @@
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+from cogs.logging import EventStore, Logging
+
+
+def test_failed_write_keeps_rows_for_the_next_flush(tmp_path):
+    db_path = str(tmp_path / "logging.db")
+    store = EventStore(db_path)
+
+    async def scenario():
+        store.add(1, 'member_join', 10, None, "first")
+        # No logs table yet, so the write fails
+        await store.flush()
+        assert len(store.rows) == 1
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE logs (id INTEGER PRIMARY KEY, guild_id INTEGER, log_type TEXT, timestamp TEXT,"
+            " user_id INTEGER, channel_id INTEGER, content TEXT, additional_data TEXT)"
+        )
+        conn.close()
+        store.add(1, 'member_join', 11, None, "second")
+        await store.flush()
+
+    asyncio.run(scenario())
+    assert store.rows == []
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT content FROM logs ORDER BY id").fetchall() == [("first",), ("second",)]
+    conn.close()
+
+
+def test_full_buffer_flushes_in_the_background_and_search_sees_it(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = Logging(SimpleNamespace()).events
+    store.max_rows = 5
+
+    async def scenario():
+        for i in range(12):
+            store.add(1, 'member_join', i, None, f"member {i}")
+        assert store.flush_task is not None
+        await store.flush_task
+        page, more = await store.search(1, limit=20)
+        return page, more
+
+    page, more = asyncio.run(scenario())
+    assert [row[5] for row in page] == [f"member {i}" for i in reversed(range(12))]
+    assert not more
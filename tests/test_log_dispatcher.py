@@ -0,0 +1,66 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from tools.log_dispatcher import LogDispatcher
+
+
+class FakeChannel:
+    id = 5
+
+    def __init__(self, manage_webhooks=False, delay=0.0):
+        self.guild = SimpleNamespace(me=None)
+        self.manage_webhooks = manage_webhooks
+        self.delay = delay
+        self.sent = []
+        self.webhook_lookups = 0
+
+    def permissions_for(self, member):
+        self.webhook_lookups += 1
+        return SimpleNamespace(manage_webhooks=self.manage_webhooks)
+
+    async def send(self, embeds, files):
+        await asyncio.sleep(self.delay)
+        self.sent.extend(embeds)
+
+
+def make_dispatcher(channel, **kwargs):
+    bot = SimpleNamespace(user=None, get_channel=lambda channel_id: channel if channel_id == channel.id else None)
+    return LogDispatcher(bot, **kwargs)
+
+
+def test_close_waits_for_a_batch_already_being_delivered():
+    async def scenario():
+        channel = FakeChannel(delay=0.05)
+        dispatcher = make_dispatcher(channel, max_delay=60)
+        for i in range(25):
+            dispatcher.send(channel, discord.Embed(title=str(i)))
+        # Let the first full batch leave the queue and start sending
+        await asyncio.sleep(0.01)
+        assert dispatcher.depth < 25
+
+        await dispatcher.close()
+        return channel, dispatcher
+
+    channel, dispatcher = asyncio.run(scenario())
+    assert [embed.title for embed in channel.sent] == [str(i) for i in range(25)]
+    assert dispatcher.sent == 25
+    assert dispatcher.dropped == 0
+    assert not dispatcher.tasks
+
+
+def test_missing_webhook_permission_is_rechecked_after_retry():
+    async def scenario():
+        channel = FakeChannel()
+        dispatcher = make_dispatcher(channel, webhook_retry=0.05)
+        assert await dispatcher.get_webhook(channel) is None
+        assert await dispatcher.get_webhook(channel) is None
+        assert channel.webhook_lookups == 1
+
+        await asyncio.sleep(0.06)
+        assert await dispatcher.get_webhook(channel) is None
+        return channel
+
+    channel = asyncio.run(scenario())
+    assert channel.webhook_lookups == 2
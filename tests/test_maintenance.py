@@ -0,0 +1,85 @@
+import asyncio
+import datetime
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from cogs.logging import DEFAULT_LOG_RETENTION_DAYS, Logging
+from cogs.maintenance import Maintenance, database_pages
+
+DEFAULT_GUILD = 1
+SHORT_GUILD = 2
+FOREVER_GUILD = 3
+
+
+@pytest.fixture
+def maintenance(tmp_path, monkeypatch):
+    # Both cogs use paths relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    logging_cog = Logging(SimpleNamespace())
+    client = SimpleNamespace(get_cog=lambda name: logging_cog if name == "Logging" else None)
+    return Maintenance(client)
+
+
+def add_events(rows):
+    now = datetime.datetime.utcnow()
+    conn = sqlite3.connect("logging.db")
+    with conn:
+        conn.executemany(
+            "INSERT INTO logs (guild_id, log_type, timestamp, content) VALUES (?, 'test', ?, ?)",
+            [(guild_id, (now - age).isoformat(), label) for guild_id, age, label in rows]
+        )
+        conn.executemany(
+            "INSERT INTO log_retention (guild_id, days) VALUES (?, ?)",
+            [(SHORT_GUILD, 7), (FOREVER_GUILD, 0)]
+        )
+    conn.close()
+
+
+def remaining():
+    conn = sqlite3.connect("logging.db")
+    rows = conn.execute("SELECT guild_id, content FROM logs ORDER BY guild_id, content").fetchall()
+    conn.close()
+    return rows
+
+
+def around(days):
+    # An hour either side of the cutoff, so the test does not depend on timing
+    return datetime.timedelta(days=days) - datetime.timedelta(hours=1), datetime.timedelta(days=days, hours=1)
+
+
+def test_retention_windows(maintenance):
+    inside_default, outside_default = around(DEFAULT_LOG_RETENTION_DAYS)
+    inside_short, outside_short = around(7)
+    add_events([
+        (DEFAULT_GUILD, inside_default, "kept"),
+        (DEFAULT_GUILD, outside_default, "expired"),
+        (SHORT_GUILD, inside_short, "kept"),
+        (SHORT_GUILD, outside_short, "expired"),
+        (SHORT_GUILD, outside_default, "expired old"),
+        (FOREVER_GUILD, outside_default, "kept"),
+        (FOREVER_GUILD, datetime.timedelta(days=3650), "kept old"),
+    ])
+
+    deleted = asyncio.run(maintenance.apply_log_retention())
+
+    assert deleted == 3
+    assert remaining() == [
+        (DEFAULT_GUILD, "kept"),
+        (SHORT_GUILD, "kept"),
+        (FOREVER_GUILD, "kept"),
+        (FOREVER_GUILD, "kept old"),
+    ]
+
+
+def test_periodic_run_does_not_convert_to_incremental_vacuum(maintenance):
+    assert database_pages("logging.db")[0] != 2
+
+    report = asyncio.run(maintenance.run_maintenance())
+    assert report[0]["needs_convert"]
+    assert database_pages("logging.db")[0] != 2
+
+    report = asyncio.run(maintenance.run_maintenance(convert=True))
+    assert not report[0]["needs_convert"]
+    assert database_pages("logging.db")[0] == 2
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from cogs.automod import Automod
+from tools.pipeline import MessageContext, MessagePipeline
+
+
+def fake_message(content="", mentions=(), raw_mentions=(), guild_id=1):
+    return SimpleNamespace(
+        content=content,
+        guild=SimpleNamespace(id=guild_id, me=object()),
+        channel=SimpleNamespace(id=2),
+        author=SimpleNamespace(id=3, bot=False),
+        mentions=list(mentions),
+        raw_mentions=list(raw_mentions),
+    )
+
+
+def test_reply_ping_counts_as_a_mention():
+    # A reply that pings its target has no mention in the content
+    message = fake_message("see above", mentions=[SimpleNamespace(id=4)])
+    assert MessageContext(message, 99, {}).has_mentions
+
+
+def test_consuming_stage_stops_later_stages():
+    calls = []
+
+    async def first(ctx):
+        calls.append("first")
+        return True
+
+    async def second(ctx):
+        calls.append("second")
+
+    pipeline = MessagePipeline(SimpleNamespace(user=None))
+    pipeline.register("second", second, priority=100)
+    pipeline.register("first", first, priority=10)
+    asyncio.run(pipeline.dispatch(fake_message()))
+    assert calls == ["first"]
+
+
+def test_automod_decides_without_waiting_for_enforcement():
+    deleted = []
+
+    async def slow_delete():
+        await asyncio.sleep(0.2)
+        deleted.append(True)
+
+    async def scenario():
+        automod = Automod(SimpleNamespace())
+        automod.settings[1] = {'antilink': True, 'antispam': False}
+        message = fake_message("visit https://example.com")
+        message.delete = slow_delete
+        message.channel.send = lambda *args, **kwargs: asyncio.sleep(0)
+
+        start = time.monotonic()
+        consumed = await automod.check_message(MessageContext(message, 99, {'automod': automod.automod_flags}))
+        elapsed = time.monotonic() - start
+        pending = len(automod.background_tasks)
+        await asyncio.gather(*automod.background_tasks)
+        automod.regex_executor.shutdown()
+        return consumed, elapsed, pending
+
+    consumed, elapsed, pending = asyncio.run(scenario())
+    assert consumed
+    assert elapsed < 0.1
+    assert pending == 1
+    assert deleted == [True]
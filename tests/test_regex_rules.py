@@ -0,0 +1,39 @@
+import time
+
+from cogs.automod import RegexRule, run_regex_rules
+
+SLOW_CONTENT = "a" * 5000 + "!"
+
+
+def slow_rules(count):
+    # Nested quantifiers backtrack heavily on a long near-match
+    return [RegexRule(rule_id, r"^(a+)+$", True) for rule_id in range(count)]
+
+
+def test_message_budget_caps_total_time_across_rules():
+    start = time.monotonic()
+    matched, results = run_regex_rules(slow_rules(25), SLOW_CONTENT, 0.05, start + 0.1)
+    elapsed = time.monotonic() - start
+
+    assert matched is None
+    assert elapsed < 0.3
+    assert len(results) < 25
+
+
+def test_rules_cut_by_the_budget_are_not_counted_as_timeouts():
+    start = time.monotonic()
+    _, results = run_regex_rules(slow_rules(3), SLOW_CONTENT, 0.05, start + 0.07)
+    timed_out = [flag for _, _, flag in results]
+    assert timed_out[0] is True
+    assert timed_out[-1] is False
+
+
+def test_expired_deadline_runs_nothing():
+    matched, results = run_regex_rules(slow_rules(5), SLOW_CONTENT, 0.05, time.monotonic() - 1)
+    assert matched is None and results == []
+
+
+def test_matching_rule_is_returned():
+    rules = [RegexRule(1, r"free\s+nitro", True)]
+    matched, _ = run_regex_rules(rules, "get free   nitro now", 0.05, time.monotonic() + 0.1)
+    assert matched is rules[0]
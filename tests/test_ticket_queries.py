@@ -0,0 +1,76 @@
+import asyncio
+import datetime
+
+import aiosqlite
+
+from cogs.Ticket import TicketDatabase
+
+
+def test_hot_queries_do_not_scan_large_tables(tmp_path):
+    async def scenario():
+        db = TicketDatabase(str(tmp_path / "tickets.db"))
+        await db.init_db()
+        return await db.audit_query_plans()
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_audit_covers_the_scheduler_close_and_archive_queries():
+    assert {'open_ticket_by_channel', 'open_tickets', 'archive_candidates'} <= set(TicketDatabase.audited_queries)
+
+
+def test_archived_tickets_are_not_selected_again(tmp_path):
+    async def scenario():
+        db = TicketDatabase(str(tmp_path / "tickets.db"))
+        await db.init_db()
+        await db.update_guild_config(1, archive_after_days=3)
+        old = (datetime.datetime.utcnow() - datetime.timedelta(days=5)).isoformat()
+        recent = datetime.datetime.utcnow().isoformat()
+        for guild_id, channel_id in ((1, 10), (1, 11), (2, 20)):
+            ticket_id = await db.create_ticket(guild_id, channel_id, channel_id, "owner")
+            await db.log_messages([(ticket_id, 1, "owner", "hello", recent)])
+            await db.close_ticket(channel_id, 1)
+        async with aiosqlite.connect(db.db_path) as conn:
+            # Guild 1 archives after 3 days, guild 2 after the default 7
+            await conn.execute("UPDATE tickets SET closed_at = ? WHERE channel_id IN (10, 20)", (old,))
+            await conn.commit()
+
+        first = await db.archive_closed_tickets()
+        second = await db.archive_closed_tickets()
+        count = await db.count_ticket_messages(1)
+        return first, second, count
+
+    assert asyncio.run(scenario()) == (1, 0, 1)
+
+
+def test_failed_migration_step_is_rolled_back(tmp_path):
+    db_path = str(tmp_path / "tickets.db")
+
+    class BrokenStep(TicketDatabase):
+        migrations = TicketDatabase.migrations + [[
+            "ALTER TABLE tickets ADD COLUMN priority INTEGER",
+            "ALTER TABLE no_such_table ADD COLUMN x INTEGER",
+        ]]
+
+    class FixedStep(TicketDatabase):
+        migrations = TicketDatabase.migrations + [[
+            "ALTER TABLE tickets ADD COLUMN priority INTEGER",
+        ]]
+
+    async def scenario():
+        try:
+            await BrokenStep(db_path).init_db()
+        except aiosqlite.OperationalError:
+            pass
+        async with aiosqlite.connect(db_path) as conn:
+            async with conn.execute("PRAGMA user_version") as cursor:
+                version = (await cursor.fetchone())[0]
+            async with conn.execute("SELECT name FROM pragma_table_info('tickets')") as cursor:
+                columns = [row[0] for row in await cursor.fetchall()]
+        # The next start applies the corrected step cleanly
+        await FixedStep(db_path).init_db()
+        return version, columns
+
+    version, columns = asyncio.run(scenario())
+    assert version == len(TicketDatabase.migrations)
+    assert "priority" not in columns
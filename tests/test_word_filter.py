@@ -0,0 +1,53 @@
+import random
+import string
+
+import pytest
+
+from cogs.automod import WordFilter, normalize_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("ＢＡＤ", "bad"),
+    ("Fück", "fuck"),
+    ("Ünïcödé", "unicode"),
+    ("sh1t", "shit"),
+    ("$h!t", "shit"),
+    ("a$$ hole", "ass hole"),
+    ("c|ass", "class"),
+    ("b.a.d", "b a d"),
+    ("  lots   of\n\twhitespace ", "lots of whitespace"),
+    ("!bad", "bad"),
+])
+def test_normalize_text(text, expected):
+    assert normalize_text(text) == expected
+
+
+@pytest.mark.parametrize("content, expected", [
+    ("this is BAD", "bad"),
+    ("b@d", "bad"),
+    ("ｂａｄ", "bad"),
+    ("bäd", "bad"),
+    ("badminton", None),
+    ("class act", None),
+    ("a$$", "ass"),
+    ("that is a bad   word", "bad"),
+    ("", None),
+])
+def test_word_filter_matches_whole_words_after_normalizing(content, expected):
+    assert WordFilter(["bad", "ass", "bad word"]).find(content) == expected
+
+
+def test_word_filter_matches_phrases():
+    word_filter = WordFilter(["free nitro"])
+    assert word_filter.find("get FREE   N1TRO here") == "free nitro"
+    assert word_filter.find("free nitrogen") is None
+
+
+def test_word_filter_with_ten_thousand_words():
+    rng = random.Random(26)
+    words = {"".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(10000)}
+    word_filter = WordFilter(words)
+    banned = sorted(words)[5000]
+    assert word_filter.find(f"some harmless text then {banned.upper()} at the end") == banned
+    clean = " ".join(word for word in "nothing to see here at all".split() if word not in words)
+    assert word_filter.find(clean) is None
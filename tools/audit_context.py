@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+__all__ = ("AuditLogContext",)
+
+Key = Tuple[int, discord.AuditLogAction]
+
+
+class AuditLogContext:
+    """Short-lived, shared view of recent audit log entries.
+
+    Antinuke and logging both ask who performed an action, usually for the
+    same gateway event. The bot calls ``mark(event)`` whenever it dispatches
+    an event, and ``find(guild, action, target_id, event=...)`` only answers
+    from a request that started after the latest dispatch of that event:
+    either cached entries fetched in the last ``ttl`` seconds or a request
+    still in flight. A second action on the same target therefore always
+    gets a fresh request instead of the first action's entry. Guilds where
+    the bot cannot view the audit log are skipped for ``ttl`` seconds after
+    the first ``Forbidden``.
+    """
+
+    def __init__(self, bot: discord.Client, *, ttl: float = 5.0, limit: int = 10) -> None:
+        self.bot = bot
+        self.ttl = ttl
+        self.limit = limit
+        # Dispatches and requests share one counter, so "started after" never depends on clock resolution
+        self.sequence = 0
+        self.dispatched: Dict[str, int] = {}
+        self.entries: Dict[Key, Tuple[int, float, List[discord.AuditLogEntry]]] = {}
+        self.pending: Dict[Key, Tuple[int, asyncio.Task]] = {}
+        self.forbidden: Dict[int, float] = {}
+        self.requests = 0
+        self.hits = 0
+
+    def mark(self, event: str) -> None:
+        self.sequence += 1
+        self.dispatched[event] = self.sequence
+
+    async def find(
+        self,
+        guild: discord.Guild,
+        action: discord.AuditLogAction,
+        target_id: Optional[int] = None,
+        *,
+        event: Optional[str] = None,
+        max_age: Optional[float] = None,
+    ) -> Optional[discord.AuditLogEntry]:
+        """Return the newest entry for ``action`` on ``target_id`` (or any target)
+
+        ``event`` is the gateway event being handled; without it only a new
+        request is trusted. ``max_age`` ignores entries created more than
+        that many seconds ago, for targets such as members that can be acted
+        on repeatedly.
+        """
+        now = time.monotonic()
+        if self.forbidden.get(guild.id, 0) > now:
+            return None
+
+        received = self.dispatched.get(event, self.sequence) if event else self.sequence
+        cached = self.entries.get((guild.id, action))
+        if cached and cached[0] > received and now - cached[1] < self.ttl:
+            self.hits += 1
+            return self.match(cached[2], target_id, max_age)
+
+        return self.match(await self.fetch(guild, action, received), target_id, max_age)
+
+    async def fetch(self, guild: discord.Guild, action: discord.AuditLogAction, received: int) -> List[discord.AuditLogEntry]:
+        key = (guild.id, action)
+        pending = self.pending.get(key)
+        if pending is not None and pending[0] > received:
+            self.hits += 1
+            task = pending[1]
+        else:
+            self.sequence += 1
+            started = self.sequence
+            task = asyncio.create_task(self.request(guild, action, started))
+            self.pending[key] = (started, task)
+            task.add_done_callback(lambda done: self.forget_pending(key, done))
+        # One caller being cancelled must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    def forget_pending(self, key: Key, task: asyncio.Task) -> None:
+        pending = self.pending.get(key)
+        if pending is not None and pending[1] is task:
+            del self.pending[key]
+
+    async def request(self, guild: discord.Guild, action: discord.AuditLogAction, started: int) -> List[discord.AuditLogEntry]:
+        self.requests += 1
+        try:
+            entries = [entry async for entry in guild.audit_logs(limit=self.limit, action=action)]
+        except discord.Forbidden:
+            self.forbidden[guild.id] = time.monotonic() + self.ttl
+            entries = []
+        except discord.HTTPException as e:
+            print(f"Error fetching audit logs for {guild.id}: {e}")
+            entries = []
+
+        now = time.monotonic()
+        cached = self.entries.get((guild.id, action))
+        # An older request finishing late must not replace newer entries
+        if cached is None or cached[0] < started:
+            self.entries[(guild.id, action)] = (started, now, entries)
+        self.prune(now)
+        return entries
+
+    def prune(self, now: float) -> None:
+        for key, (_, fetched, _) in list(self.entries.items()):
+            if now - fetched >= self.ttl:
+                del self.entries[key]
+        for guild_id, until in list(self.forbidden.items()):
+            if until <= now:
+                del self.forbidden[guild_id]
+
+    @staticmethod
+    def match(
+        entries: List[discord.AuditLogEntry], target_id: Optional[int], max_age: Optional[float]
+    ) -> Optional[discord.AuditLogEntry]:
+        now = discord.utils.utcnow()
+        # Entries come newest first
+        for entry in entries:
+            if max_age is not None and (now - entry.created_at).total_seconds() > max_age:
+                break
+            if target_id is None or (entry.target is not None and getattr(entry.target, "id", None) == target_id):
+                return entry
+        return None
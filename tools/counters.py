@@ -0,0 +1,38 @@
+__all__ = ("SlidingCounter",)
+
+
+class SlidingCounter:
+    """Event counter over a sliding time window.
+
+    The window is split into fixed ring buckets, so adding an event and
+    reading the total are both constant time and memory never grows with
+    traffic. Stale buckets are recycled lazily when their slot comes round.
+    """
+
+    __slots__ = ("_resolution", "_size", "_counts", "_ticks")
+
+    def __init__(self, window: float = 10.0, resolution: float = 1.0) -> None:
+        self._resolution = resolution
+        self._size = max(1, int(window / resolution))
+        self._counts = [0] * self._size
+        self._ticks = [-1] * self._size
+
+    def add(self, now: float, amount: int = 1) -> None:
+        tick = int(now / self._resolution)
+        slot = tick % self._size
+        if self._ticks[slot] != tick:
+            self._ticks[slot] = tick
+            self._counts[slot] = 0
+        self._counts[slot] += amount
+
+    def total(self, now: float) -> int:
+        tick = int(now / self._resolution)
+        size = self._size
+        return sum(
+            count for count, stamp in zip(self._counts, self._ticks)
+            if 0 <= tick - stamp < size
+        )
+
+    def rate(self, now: float) -> float:
+        """Average events per second over the window"""
+        return self.total(now) / (self._size * self._resolution)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import discord
+
+__all__ = ("LogDispatcher",)
+
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+Entry = Tuple[discord.Embed, Optional[discord.File]]
+
+
+class LogDispatcher:
+    """Batches log embeds per destination channel.
+
+    Entries wait at most ``max_delay`` seconds; a full batch (10 embeds or
+    6000 embed characters) is sent at once. Batches go out through a
+    webhook owned by the bot in each log channel, which has its own rate
+    limit, so heavy logging does not compete with the bot's own messages.
+    Channels where the bot cannot manage webhooks fall back to
+    ``channel.send`` and are checked again after ``webhook_retry`` seconds.
+    Each channel queue holds at most ``max_queue`` entries; beyond that the
+    oldest are dropped and counted.
+    """
+
+    def __init__(self, bot: discord.Client, *, max_delay: float = 2.0, max_queue: int = 500,
+                 webhook_name: str = "Flingo Logs", webhook_retry: float = 300.0) -> None:
+        self.bot = bot
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.webhook_name = webhook_name
+        self.webhook_retry = webhook_retry
+        self.queues: Dict[int, Deque[Entry]] = {}
+        self.wakeups: Dict[int, asyncio.Event] = {}
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.webhooks: Dict[int, discord.Webhook] = {}
+        # channel_id -> monotonic time until which channel.send is used instead
+        self.no_webhook: Dict[int, float] = {}
+        self.closing = False
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def send(self, channel: discord.abc.GuildChannel, embed: discord.Embed, file: Optional[discord.File] = None) -> None:
+        queue = self.queues.setdefault(channel.id, deque())
+        if len(queue) >= self.max_queue:
+            queue.popleft()
+            self.dropped += 1
+        queue.append((embed, file))
+
+        if channel.id not in self.tasks:
+            self.wakeups[channel.id] = asyncio.Event()
+            self.tasks[channel.id] = asyncio.create_task(self.drain(channel))
+        elif len(queue) >= MAX_EMBEDS:
+            self.wakeups[channel.id].set()
+
+    async def drain(self, channel: discord.abc.GuildChannel) -> None:
+        queue = self.queues[channel.id]
+        wakeup = self.wakeups[channel.id]
+        try:
+            while queue:
+                if len(queue) < MAX_EMBEDS and not self.closing:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), self.max_delay)
+                    except asyncio.TimeoutError:
+                        pass
+                wakeup.clear()
+                await self.deliver(channel, self.take_batch(queue))
+        finally:
+            self.tasks.pop(channel.id, None)
+            self.wakeups.pop(channel.id, None)
+            if not queue:
+                self.queues.pop(channel.id, None)
+
+    @staticmethod
+    def take_batch(queue: Deque[Entry]) -> List[Entry]:
+        batch: List[Entry] = []
+        chars = 0
+        while queue and len(batch) < MAX_EMBEDS:
+            size = len(queue[0][0])
+            if batch and chars + size > MAX_EMBED_CHARS:
+                break
+            batch.append(queue.popleft())
+            chars += size
+        return batch
+
+    async def get_webhook(self, channel: discord.abc.GuildChannel) -> Optional[discord.Webhook]:
+        if channel.id in self.webhooks:
+            return self.webhooks[channel.id]
+        if self.no_webhook.get(channel.id, 0) > time.monotonic():
+            return None
+
+        webhook = None
+        if channel.permissions_for(channel.guild.me).manage_webhooks:
+            try:
+                for existing in await channel.webhooks():
+                    if existing.user == self.bot.user and existing.name == self.webhook_name:
+                        webhook = existing
+                        break
+                else:
+                    webhook = await channel.create_webhook(name=self.webhook_name)
+            except discord.HTTPException:
+                webhook = None
+        if webhook:
+            self.webhooks[channel.id] = webhook
+            self.no_webhook.pop(channel.id, None)
+        else:
+            # Manage Webhooks may be granted later
+            self.no_webhook[channel.id] = time.monotonic() + self.webhook_retry
+        return webhook
+
+    async def deliver(self, channel: discord.abc.GuildChannel, batch: List[Entry]) -> None:
+        embeds = [embed for embed, _ in batch]
+        files = [file for _, file in batch if file is not None]
+        try:
+            webhook = await self.get_webhook(channel)
+            if webhook:
+                try:
+                    await webhook.send(
+                        embeds=embeds,
+                        files=files,
+                        username=self.webhook_name,
+                        avatar_url=self.bot.user.display_avatar.url
+                    )
+                except discord.NotFound:
+                    # Webhook was deleted; look it up again next time
+                    self.webhooks.pop(channel.id, None)
+                    raise
+            else:
+                await channel.send(embeds=embeds, files=files)
+            self.sent += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.dropped += len(batch)
+            print(f"Error delivering logs to {channel.id}: {e}")
+
+    def forget_channel(self, channel_id: int) -> None:
+        self.webhooks.pop(channel_id, None)
+        self.no_webhook.pop(channel_id, None)
+
+    async def close(self) -> None:
+        """Deliver everything still queued
+
+        Running drain tasks are woken and awaited rather than cancelled, so a
+        batch already taken off its queue is not lost mid-delivery.
+        """
+        self.closing = True
+        for wakeup in list(self.wakeups.values()):
+            wakeup.set()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        for channel_id, queue in list(self.queues.items()):
+            channel = self.bot.get_channel(channel_id)
+            while queue and channel:
+                await self.deliver(channel, self.take_batch(queue))
+        self.queues.clear()
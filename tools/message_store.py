@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import discord
+
+__all__ = ("StoredMessage", "MessageStore")
+
+
+class StoredMessage:
+    __slots__ = ("id", "guild_id", "channel_id", "author_id", "author_name", "content", "created")
+
+    def __init__(self, message: discord.Message, now: float) -> None:
+        self.id = message.id
+        self.guild_id = message.guild.id if message.guild else None
+        self.channel_id = message.channel.id
+        self.author_id = message.author.id
+        self.author_name = str(message.author)
+        self.content = message.content
+        self.created = now
+
+
+class MessageStore:
+    """Bounded store of message contents for raw edit/delete logging.
+
+    discord.py only hands full messages to ``on_message_edit`` and
+    ``on_message_delete`` while they sit in its small message cache. This
+    keeps just the fields the log embeds need, evicting the least recently
+    used entry past ``capacity`` and dropping entries older than ``ttl``
+    seconds.
+    """
+
+    def __init__(self, capacity: int = 20000, ttl: float = 6 * 3600) -> None:
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries: "OrderedDict[int, StoredMessage]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, message: discord.Message) -> None:
+        now = time.monotonic()
+        self.entries[message.id] = StoredMessage(message, now)
+        self.entries.move_to_end(message.id)
+
+        # Entries at the front are the least recently used
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        while self.entries:
+            oldest = next(iter(self.entries.values()))
+            if now - oldest.created <= self.ttl:
+                break
+            self.entries.popitem(last=False)
+
+    def get(self, message_id: int) -> Optional[StoredMessage]:
+        entry = self.entries.get(message_id)
+        if entry is None or time.monotonic() - entry.created > self.ttl:
+            if entry is not None:
+                del self.entries[message_id]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(message_id)
+        self.hits += 1
+        return entry
+
+    def pop(self, message_id: int) -> Optional[StoredMessage]:
+        entry = self.get(message_id)
+        if entry is not None:
+            del self.entries[message_id]
+        return entry
+
+    def update(self, message_id: int, content: str) -> None:
+        entry = self.entries.get(message_id)
+        if entry is not None:
+            entry.content = content
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+__all__ = ("MessageContext", "MessagePipeline")
+
+
+class MessageContext:
+    """Facts about a message, computed once and shared by every stage.
+
+    Cheap facts are filled in up front. Cog-specific facts (such as
+    ``is_ticket_channel``) come from providers registered on the pipeline
+    and are computed at most once per message, on first use.
+    """
+
+    __slots__ = (
+        "message", "guild_id", "channel_id", "author_id", "is_bot",
+        "has_mentions", "mentions_bot", "_providers", "_facts",
+    )
+
+    def __init__(self, message: discord.Message, bot_id: int, providers: Dict[str, Callable]) -> None:
+        self.message = message
+        self.guild_id = message.guild.id if message.guild else None
+        self.channel_id = message.channel.id
+        self.author_id = message.author.id
+        self.is_bot = message.author.bot
+        # message.mentions also holds the author of a pinged reply; raw_mentions is parsed from the content
+        self.has_mentions = bool(message.mentions)
+        self.mentions_bot = bot_id in message.raw_mentions
+        self._providers = providers
+        self._facts: Dict[str, Any] = {}
+
+    def fact(self, name: str) -> Any:
+        try:
+            return self._facts[name]
+        except KeyError:
+            provider = self._providers.get(name)
+            value = provider(self) if provider else None
+            self._facts[name] = value
+            return value
+
+
+class Stage:
+    __slots__ = (
+        "name", "callback", "check", "priority", "guild_only", "include_bots",
+        "calls", "skipped", "errors", "total_time", "max_time",
+    )
+
+    def __init__(self, name, callback, check, priority, guild_only, include_bots) -> None:
+        self.name = name
+        self.callback = callback
+        self.check = check
+        self.priority = priority
+        self.guild_only = guild_only
+        self.include_bots = include_bots
+        self.calls = 0
+        self.skipped = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+
+class MessagePipeline:
+    """Single ``on_message`` entry point that fans out to registered stages.
+
+    Stages run in priority order inside one task. A stage is skipped when
+    the message is from a bot (unless ``include_bots``), from a DM (when
+    ``guild_only``), or when its ``check(ctx)`` returns False; checks must
+    be cheap and synchronous. A stage returning True consumes the message
+    and later stages are not run.
+
+    The ordering guarantee is only that a stage has *decided* before later
+    stages start: commands (priority 100) never run for a message Automod
+    (priority 10) consumes. Every stage delays the ones after it, so a stage
+    must return as soon as it knows whether it consumes the message and
+    leave slow work (REST calls, timeouts, warnings) to background tasks.
+    """
+
+    def __init__(self, bot: discord.Client) -> None:
+        self.bot = bot
+        self.stages: List[Stage] = []
+        self.providers: Dict[str, Callable[[MessageContext], Any]] = {}
+        self.messages = 0
+
+    def register(
+        self,
+        name: str,
+        callback: Callable[[MessageContext], Awaitable[Optional[bool]]],
+        *,
+        check: Optional[Callable[[MessageContext], bool]] = None,
+        priority: int = 50,
+        guild_only: bool = True,
+        include_bots: bool = False,
+    ) -> None:
+        self.unregister(name)
+        self.stages.append(Stage(name, callback, check, priority, guild_only, include_bots))
+        self.stages.sort(key=lambda stage: stage.priority)
+
+    def unregister(self, name: str) -> None:
+        self.stages = [stage for stage in self.stages if stage.name != name]
+
+    def provide(self, name: str, provider: Callable[[MessageContext], Any]) -> None:
+        self.providers[name] = provider
+
+    def remove_provider(self, name: str) -> None:
+        self.providers.pop(name, None)
+
+    async def dispatch(self, message: discord.Message) -> None:
+        self.messages += 1
+        ctx = MessageContext(message, self.bot.user.id if self.bot.user else 0, self.providers)
+
+        for stage in self.stages:
+            if (ctx.is_bot and not stage.include_bots) or (stage.guild_only and ctx.guild_id is None):
+                continue
+            try:
+                if stage.check is not None and not stage.check(ctx):
+                    stage.skipped += 1
+                    continue
+            except Exception as e:
+                stage.errors += 1
+                print(f"Error in message stage check {stage.name}: {e}")
+                continue
+
+            start = time.perf_counter()
+            try:
+                consumed = await stage.callback(ctx)
+            except Exception as e:
+                consumed = False
+                stage.errors += 1
+                print(f"Error in message stage {stage.name}: {e}")
+            elapsed = time.perf_counter() - start
+
+            stage.calls += 1
+            stage.total_time += elapsed
+            if elapsed > stage.max_time:
+                stage.max_time = elapsed
+            if consumed:
+                break
+
+    def reset_stats(self) -> None:
+        self.messages = 0
+        for stage in self.stages:
+            stage.calls = stage.skipped = stage.errors = 0
+            stage.total_time = stage.max_time = 0.0